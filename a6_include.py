@@ -23,6 +23,8 @@ class DynamicArray:
     append, pop, swap, get_at_index, set_at_index, length
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
@@ -82,6 +84,13 @@ class DynamicArray:
         return len(self._data)
 
 
+def as_list(items) -> list:
+    """Return the elements of a DynamicArray (which can't be iterated) or of any other iterable as a list."""
+    if isinstance(items, DynamicArray):
+        return list(items._data)
+    return list(items)
+
+
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
     hash = 0
@@ -107,11 +116,14 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'key_hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, key_hash: int = None) -> None:
+        """Initialize node given a key and value (and optionally the key's full hash)."""
         self.key = key
         self.value = value
         self.next = next
+        self.key_hash = key_hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -123,6 +135,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -145,9 +159,11 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, insert_node, remove, contains, find, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -172,9 +188,15 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, key_hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, key_hash)
+        self._size += 1
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list (no allocation)."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
     def remove(self, key: str) -> bool:
@@ -205,6 +227,22 @@ class LinkedList:
             node = node.next
         return node
 
+    def find(self, key: str, move_to_front: bool = False) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        Optionally moves the node to the front of the list in the same walk.
+        """
+        previous, node = None, self._head
+        while node:
+            if node.key == key:
+                if move_to_front and previous:
+                    previous.next = node.next
+                    node.next = self._head
+                    self._head = node
+                return node
+            previous, node = node, node.next
+        return None
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
@@ -214,10 +252,13 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'key_hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, key_hash: int = None) -> None:
+        """Initialize an entry for use in a hash map (optionally caching the key's full hash)."""
         self.key = key
         self.value = value
+        self.key_hash = key_hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -0,0 +1,706 @@
+# Description:  Performance benchmarks for the SC and OA hash maps. Run from the directory that contains the
+#               HashMap package, e.g. "python -m HashMap.benchmarks" for the comparison tables, or
+#               "python -m HashMap.benchmarks --suite --json results.json" for the regression suite, which runs
+#               seeded workloads against both maps, each hash function, find_mode and the builtin dict and
+#               records throughput, latency percentiles and peak memory for comparing releases.
+
+
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from HashMap.a6_include import DynamicArray, HashEntry, LinkedList, SLNode, hash_function_1, hash_function_2
+from HashMap.capacity import CAPACITY_MODES
+from HashMap.public_hash_map_oa import PROBING_STRATEGIES, HashMap as OAHashMap
+from HashMap.public_hash_map_oa_compact import HashMap as CompactOAHashMap
+from HashMap.public_hash_map_sc import HashMap as SCHashMap, find_mode, find_mode_parallel
+
+
+class _UnslottedSLNode:
+    """SLNode without __slots__ (the pre-slots layout), kept for the memory comparison."""
+
+    def __init__(self, key: str, value: object, next=None, key_hash: int = None) -> None:
+        self.key = key
+        self.value = value
+        self.next = next
+        self.key_hash = key_hash
+
+
+class _UnslottedHashEntry:
+    """HashEntry without __slots__ (the pre-slots layout), kept for the memory comparison."""
+
+    def __init__(self, key: str, value: object, key_hash: int = None) -> None:
+        self.key = key
+        self.value = value
+        self.key_hash = key_hash
+        self.is_tombstone = False
+
+
+class _UnslottedLinkedList:
+    """LinkedList without __slots__ (the pre-slots layout), kept for the memory comparison."""
+
+    def __init__(self) -> None:
+        self._head = None
+        self._size = 0
+
+
+def _traced_bytes(build) -> int:
+    """
+    Measures the memory still held by whatever a callable builds.
+
+    Parameter "build" refers to a no-argument callable returning the objects to measure.
+
+    Returns the number of traced bytes held while the result is alive.
+    """
+
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def _time_per_op(operation, keys) -> float:
+    """
+    Times a single-key operation over a sequence of keys.
+
+    Parameter "operation" refers to the callable being timed (it receives one key per call).
+    Parameter "keys" refers to the keys passed to the operation.
+
+    Returns the average cost of one call in nanoseconds.
+    """
+
+    start = time.perf_counter()
+    for key in keys:
+        operation(key)
+    return (time.perf_counter() - start) * 1e9 / len(keys)
+
+
+def bench_oa_read_scaling(sizes=(1_000, 10_000, 100_000), lookups: int = 5_000) -> list:
+    """
+    Regression benchmark for OA reads. Builds maps of increasing size and times a fixed number of hits and
+    misses against each; with probe-sequence lookups the per-read cost should stay flat as the table grows.
+
+    Parameter "sizes" refers to the entry counts of the maps being built.
+    Parameter "lookups" refers to the number of get/contains_key calls timed per map.
+
+    Returns a list of (size, capacity, get hit ns, get miss ns, contains_key ns) tuples.
+    """
+
+    # The builtin hash spreads keys over the whole table; the sample functions cluster on large tables and
+    # would measure their own collisions rather than the probe engine
+    results = []
+    for size in sizes:
+        hash_map = OAHashMap(size, hash)
+        for num in range(size):
+            hash_map.put('key' + str(num), num)
+
+        # Spread the hits across the whole table and use keys that were never inserted for the misses
+        hits = ['key' + str(num * size // lookups) for num in range(lookups)]
+        misses = ['miss' + str(num) for num in range(lookups)]
+        results.append((size, hash_map.get_capacity(),
+                        _time_per_op(hash_map.get, hits),
+                        _time_per_op(hash_map.get, misses),
+                        _time_per_op(hash_map.contains_key, hits)))
+    return results
+
+
+def bench_oa_put_latency(size: int = 200_000, rehash_step: int = None) -> tuple:
+    """
+    Measures per-put latency while building an OA map, to compare blocking resizes against incremental ones.
+
+    Parameter "size" refers to the number of keys inserted.
+    Parameter "rehash_step" refers to the map's incremental resize step (None for blocking resizes).
+
+    Returns a (median ns, p99 ns, max ns) tuple of single-put latencies.
+    """
+
+    # Garbage collection is paused (as timeit does) so its sweeps don't show up as resize pauses
+    hash_map = OAHashMap(11, hash, rehash_step=rehash_step)
+    latencies = []
+    clock = time.perf_counter_ns
+    gc.disable()
+    try:
+        for num in range(size):
+            key = 'key' + str(num)
+            start = clock()
+            hash_map.put(key, num)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+
+    latencies.sort()
+    return latencies[size // 2], latencies[size * 99 // 100], latencies[-1]
+
+
+def bench_oa_backends(size: int = 100_000) -> list:
+    """
+    Compares the HashEntry-based OA map with the compact struct-of-arrays backend on the same workload.
+
+    Parameter "size" refers to the number of keys inserted (then overwritten and read back).
+
+    Returns a list of (backend, put ns, overwrite ns, get ns, bytes per entry) tuples.
+    """
+
+    keys = ['key' + str(num) for num in range(size)]
+    results = []
+    for label, map_class in (("HashEntry", OAHashMap), ("compact", CompactOAHashMap)):
+
+        # Measure the memory held by a finished map (tracing slows allocation, so the timed build is separate)
+        tracemalloc.start()
+        hash_map = map_class(11, hash)
+        for num in range(size):
+            hash_map.put(keys[num], num)
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        hash_map = map_class(11, hash)
+        start = time.perf_counter()
+        for num in range(size):
+            hash_map.put(keys[num], num)
+        put_ns = (time.perf_counter() - start) * 1e9 / size
+
+        start = time.perf_counter()
+        for num in range(size):
+            hash_map.put(keys[num], -num)
+        overwrite_ns = (time.perf_counter() - start) * 1e9 / size
+        results.append((label, put_ns, overwrite_ns, _time_per_op(hash_map.get, keys), held / size))
+    return results
+
+
+def bench_memory_per_entry(size: int = 100_000) -> tuple:
+    """
+    Compares bytes per object before (per-instance __dict__, one LinkedList per bucket) and after (__slots__,
+    unallocated SC buckets), and reports the resulting bytes per entry of full SC and OA maps.
+
+    Parameter "size" refers to the number of objects/entries built for each measurement.
+
+    Returns a pair: a list of (object, bytes before, bytes after) tuples and a list of (map, bytes per entry)
+    tuples.
+    """
+
+    objects = [
+        ("SLNode", _UnslottedSLNode, SLNode, lambda cls: [cls(num, num) for num in range(size)]),
+        ("HashEntry", _UnslottedHashEntry, HashEntry, lambda cls: [cls(num, num) for num in range(size)]),
+        ("LinkedList", _UnslottedLinkedList, LinkedList, lambda cls: [cls() for _ in range(size)]),
+    ]
+    per_object = []
+    for label, before_class, after_class, build in objects:
+        per_object.append((label, _traced_bytes(lambda: build(before_class)) / size,
+                           _traced_bytes(lambda: build(after_class)) / size))
+
+    # The SC map is sized like find_mode sizes its counting map, leaving roughly half the buckets empty
+    def build_map(map_class, capacity):
+        hash_map = map_class(capacity, hash)
+        for num in range(size):
+            hash_map.put(num, num)
+        return hash_map
+
+    per_map = [("SC", _traced_bytes(lambda: build_map(SCHashMap, 2 * size)) / size),
+               ("OA", _traced_bytes(lambda: build_map(OAHashMap, 11)) / size),
+               ("OA compact", _traced_bytes(lambda: build_map(CompactOAHashMap, 11)) / size)]
+    return per_object, per_map
+
+
+def bench_bulk_operations(size: int = 20_000) -> list:
+    """
+    Compares loading and querying both maps one key at a time against put_many/get_many. Uses hash_function_2
+    so the batch hashing path applies.
+
+    Parameter "size" refers to the number of pairs loaded and keys looked up.
+
+    Returns a list of (map, scalar load s, put_many s, scalar lookup s, get_many s) tuples.
+    """
+
+    # Long keys give hash_function_2 enough range to spread over the table (short keys all collide)
+    pairs = [('user-' + str(num * 7919) + '-session-' + str(num), num) for num in range(size)]
+    keys = [pair[0] for pair in pairs]
+    results = []
+    for label, map_class in (("SC", SCHashMap), ("OA", OAHashMap)):
+        timings = []
+
+        # Scalar load and lookups
+        hash_map = map_class(11, hash_function_2)
+        start = time.perf_counter()
+        for key, value in pairs:
+            hash_map.put(key, value)
+        timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for key in keys:
+            hash_map.get(key)
+        scalar_lookup = time.perf_counter() - start
+
+        # Batched load and lookups
+        hash_map = map_class(11, hash_function_2)
+        start = time.perf_counter()
+        hash_map.put_many(pairs)
+        timings.append(time.perf_counter() - start)
+        timings.append(scalar_lookup)
+        start = time.perf_counter()
+        hash_map.get_many(keys)
+        timings.append(time.perf_counter() - start)
+        results.append((label, *timings))
+    return results
+
+
+def bench_capacity_modes(size: int = 100_000) -> list:
+    """
+    Compares the capacity modes of both maps: the cost of choosing a capacity, and of putting and getting
+    string keys and integer keys that are all multiples of 1024 (whose low bits are all zero, the worst case
+    for power-of-two masking without a finalizer). OA maps grow from 11 buckets; SC maps are sized up front.
+
+    Parameter "size" refers to the number of keys inserted and looked up.
+
+    Returns a list of (map, mode, keys, capacity choice ns, put ns, get ns, final capacity) tuples.
+    """
+
+    key_sets = (("str", ['key' + str(num) for num in range(size)]), ("int<<10", [num << 10 for num in range(size)]))
+    results = []
+    for label, map_class in (("SC", SCHashMap), ("OA", OAHashMap)):
+        for mode in CAPACITY_MODES:
+            for key_label, keys in key_sets:
+                hash_map = map_class(size if map_class is SCHashMap else 11, hash, capacity_mode=mode)
+                fit_ns = _time_per_op(hash_map._fit_capacity, range(1_000_000, 1_001_000))
+                put_ns = _time_per_op(lambda key: hash_map.put(key, key), keys)
+                results.append((label, mode, key_label, fit_ns, put_ns, _time_per_op(hash_map.get, keys),
+                                hash_map.get_capacity()))
+    return results
+
+
+def bench_probing_strategies(size: int = 90_000, loads=(0.5, 0.75, 0.9)) -> list:
+    """
+    Compares the OA probing strategies at several maximum load factors: building a map from 11 buckets,
+    looking up present and missing keys, and churning (removing then re-adding keys, which leaves tombstones
+    for every strategy but Robin Hood).
+
+    Parameter "size" refers to the number of keys inserted.
+    Parameter "loads" refers to the max_load values compared (quadratic probing only runs at those up to 0.5).
+
+    Returns a list of (probing, max load, put ns, hit ns, miss ns, churn ns, final capacity) tuples.
+    """
+
+    keys = ['key' + str(num) for num in range(size)]
+    missing = ['missing' + str(num) for num in range(size // 10)]
+    churn = keys[::10]
+    results = []
+    for probing in PROBING_STRATEGIES:
+        for max_load in loads:
+            if probing == "quadratic" and max_load > 0.5:             # Not allowed on prime capacities
+                continue
+            hash_map = OAHashMap(11, hash, probing=probing, max_load=max_load)
+            put_ns = _time_per_op(lambda key: hash_map.put(key, 0), keys)
+            hit_ns = _time_per_op(hash_map.get, keys)
+            miss_ns = _time_per_op(hash_map.get, missing)
+            start = time.perf_counter()
+            for key in churn:
+                hash_map.remove(key)
+            for key in churn:
+                hash_map.put(key, 1)
+            churn_ns = (time.perf_counter() - start) * 1e9 / (2 * len(churn))
+            results.append((probing, max_load, put_ns, hit_ns, miss_ns, churn_ns, hash_map.get_capacity()))
+    return results
+
+
+def bench_find_mode_scaling(size: int = 400_000, worker_counts=None) -> list:
+    """
+    Times find_mode against find_mode_parallel across worker counts on a skewed (Zipf-like) input.
+
+    Parameter "size" refers to the number of elements in the analyzed array.
+    Parameter "worker_counts" refers to the pool sizes tried (defaults to powers of two up to twice the CPU
+    count, so the oversubscribed case is visible too).
+
+    Returns a list of (workers, seconds, speedup over serial find_mode) tuples; workers 0 is find_mode itself.
+    """
+
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] < 2 * (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+
+    rng = random.Random(261)
+    da = DynamicArray(['item' + str(int(rng.paretovariate(1.1))) for _ in range(size)])
+
+    start = time.perf_counter()
+    find_mode(da)
+    serial = time.perf_counter() - start
+    results = [(0, serial, 1.0)]
+
+    # One worker falls back to find_mode, so only rows with two or more workers pay for the pool
+    for workers in worker_counts:
+        start = time.perf_counter()
+        find_mode_parallel(da, workers=workers)
+        elapsed = time.perf_counter() - start
+        results.append((workers, elapsed, serial / elapsed))
+    return results
+
+
+# --------- Regression suite (machine-readable output) --------- #
+
+WORKLOADS = ("insert", "read", "churn", "zipf", "anagram", "large_value")
+_OPERATIONS = ("put", "get", "remove")                              # Order of the methods a suite target returns
+
+# Fields of every suite record, in CSV column order. "unit" says what one timed operation is: a map call ("op"),
+# one hash ("hash") or one whole find_mode call over the workload's keys ("call")
+SUITE_FIELDS = ("suite", "workload", "target", "unit", "ops", "seconds", "ops_per_sec",
+                "p50_ns", "p90_ns", "p99_ns", "max_ns", "peak_bytes", "collisions")
+
+
+def _random_key(rng: random.Random, length: int = 12) -> str:
+    """Returns a random lowercase key (realistic spread under hash_function_1/2, unlike 'key' + number)."""
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(length))
+
+
+def _workload(name: str, size: int, rng: random.Random) -> tuple:
+    """
+    Builds one of the suite's workloads as data, so every target replays exactly the same operations.
+
+    Parameter "name" refers to the workload (one of WORKLOADS).
+    Parameter "size" refers to the number of timed operations (and of keys loaded beforehand, where any are).
+    Parameter "rng" refers to the random source, seeded by the caller for repeatable runs.
+
+    Returns a (prefill pairs, operations, distinct keys) tuple; each operation is a ("put", (key, value)),
+    ("get", (key,)) or ("remove", (key,)) pair.
+    """
+
+    keys = list(dict.fromkeys(_random_key(rng) for _ in range(size)))
+    if name == "insert":                                            # Fresh keys into an empty map
+        return [], [("put", (key, num)) for num, key in enumerate(keys)], keys
+
+    if name == "read":                                              # 90% hits, 10% misses on a loaded map
+        ops = [("get", (rng.choice(keys) if rng.random() < 0.9 else _random_key(rng),)) for _ in range(size)]
+        return [(key, 0) for key in keys], ops, keys
+
+    if name == "churn":                                             # Alternate removing a live key and adding one
+        live, ops, new_keys = list(keys), [], []
+        for _ in range(size // 2):
+            index = rng.randrange(len(live))
+            live[index], live[-1] = live[-1], live[index]
+            key = _random_key(rng)
+            ops += [("remove", (live.pop(),)), ("put", (key, 0))]
+            live.append(key)
+            new_keys.append(key)
+        return [(key, 0) for key in keys], ops, list(dict.fromkeys(keys + new_keys))
+
+    if name == "zipf":                                              # Read-then-write counting on Zipf-like keys
+        ops = []
+        for num in range(size // 2):
+            key = keys[min(int(rng.paretovariate(1.1)) - 1, len(keys) - 1)]
+            ops += [("get", (key,)), ("put", (key, num))]
+        return [], ops, keys
+
+    if name == "anagram":                                           # Groups of 50 anagrams (hash_function_1 ties)
+        keys = []
+        for _ in range(max(size // 100, 1)):
+            letters = list(_random_key(rng, 8))
+            for _ in range(50):
+                rng.shuffle(letters)
+                keys.append(''.join(letters))
+        keys = list(dict.fromkeys(keys))
+        return [], [("put", (key, 0)) for key in keys] + [("get", (key,)) for key in keys], keys
+
+    if name == "large_value":                                       # 1 KiB values: put, overwrite, then read back
+        half, quarter = keys[:size // 2], keys[:size // 4]
+        ops = ([("put", (key, bytes(1024))) for key in half] + [("put", (key, bytes(1024))) for key in quarter] +
+               [("get", (key,)) for key in quarter])
+        return [], ops, half
+
+    raise ValueError(f"Unknown workload: {name!r}")
+
+
+def _suite_targets() -> list:
+    """
+    Returns the (label, factory) pairs the map workloads run against. Each factory receives the number of
+    distinct keys and returns the (put, get, remove) bound methods of a new container. SC maps don't grow on
+    put, so they are sized to the key count up front; OA maps grow from 11 buckets.
+    """
+
+    def builtin_dict(key_count):
+        table = {}
+        return table.__setitem__, table.get, lambda key: table.pop(key, None)
+
+    def hash_map(map_class, function):
+        def factory(key_count):
+            target = map_class(key_count if map_class is SCHashMap else 11, function)
+            return target.put, target.get, target.remove
+        return factory
+
+    targets = [("dict", builtin_dict)]
+    for map_label, map_class in (("SC", SCHashMap), ("OA", OAHashMap)):
+        for function in (hash, hash_function_1, hash_function_2):
+            targets.append((map_label + "/" + function.__name__, hash_map(map_class, function)))
+    return targets
+
+
+def _suite_record(suite: str, workload: str, target: str, unit: str, seconds: float, latencies: list,
+                  peak_bytes: int = None, collisions: int = None) -> dict:
+    """
+    Builds one suite record (see SUITE_FIELDS).
+
+    Parameter "seconds" refers to the best untimed-pass duration of the whole workload.
+    Parameter "latencies" refers to the per-operation durations in nanoseconds from the timed pass.
+
+    Returns the record as a dictionary.
+    """
+
+    latencies = sorted(latencies)
+    ops = len(latencies)
+    return {
+        "suite": suite, "workload": workload, "target": target, "unit": unit, "ops": ops,
+        "seconds": seconds,
+        "ops_per_sec": ops / seconds if seconds else None,
+        "p50_ns": latencies[ops // 2],
+        "p90_ns": latencies[ops * 90 // 100],
+        "p99_ns": latencies[ops * 99 // 100],
+        "max_ns": latencies[-1],
+        "peak_bytes": peak_bytes,
+        "collisions": collisions,
+    }
+
+
+def _measure(run, repeat: int) -> tuple:
+    """
+    Measures a benchmark body three ways: best wall-clock time of plain runs, per-operation latencies of one
+    run, and the traced peak memory of another (tracing slows allocation, so each gets its own run). Garbage
+    collection is paused during timing, as in bench_oa_put_latency.
+
+    Parameter "run" refers to a callable run(clock) that performs the whole benchmark, building its own
+    containers, and times each operation with clock when clock is not None, returning the latencies.
+    Parameter "repeat" refers to the number of plain runs (the fastest counts).
+
+    Returns a (seconds, latencies, peak bytes) tuple.
+    """
+
+    gc.collect()
+    gc.disable()
+    try:
+        seconds = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(None)
+            seconds = min(seconds, time.perf_counter() - start)
+        latencies = run(time.perf_counter_ns)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    run(None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, latencies, peak
+
+
+def _replay(factory, key_count: int, prefill: list, ops: list):
+    """
+    Returns a benchmark body (for _measure) that builds a container, loads the prefill pairs untimed, and
+    replays the operations. Per-operation timings include about one clock call of overhead each.
+    """
+
+    # Resolve operation names to method positions once, outside the measured runs
+    ops = [(_OPERATIONS.index(name), args) for name, args in ops]
+
+    def run(clock):
+        methods = factory(key_count)
+        put = methods[0]
+        for key, value in prefill:
+            put(key, value)
+        if clock is None:
+            for index, args in ops:
+                methods[index](*args)
+            return None
+        latencies = []
+        for index, args in ops:
+            start = clock()
+            methods[index](*args)
+            latencies.append(clock() - start)
+        return latencies
+    return run
+
+
+def run_suite(size: int = 5_000, repeat: int = 3, seed: int = 261, workloads=WORKLOADS) -> list:
+    """
+    Runs the regression suite: every workload against the builtin dict and both maps under each hash function
+    ("maps"), the hash functions alone on each workload's keys ("hash"), and find_mode against
+    collections.Counter on each workload's key stream ("find_mode"). Runs are seeded, so results from
+    different releases can be compared row by row.
+
+    Parameter "size" refers to the number of operations per workload.
+    Parameter "repeat" refers to the number of runs timed for throughput (the fastest counts).
+    Parameter "seed" refers to the random seed of the workloads.
+    Parameter "workloads" refers to the workloads run (a subset of WORKLOADS).
+
+    Returns a list of records (dictionaries with the SUITE_FIELDS keys).
+    """
+
+    records = []
+    for workload in workloads:
+        prefill, ops, keys = _workload(workload, size, random.Random(seed))
+
+        for label, factory in _suite_targets():
+            seconds, latencies, peak = _measure(_replay(factory, len(keys), prefill, ops), repeat)
+            records.append(_suite_record("maps", workload, label, "op", seconds, latencies, peak))
+
+        for function in (hash, hash_function_1, hash_function_2):
+            def hash_run(clock, function=function):
+                if clock is None:
+                    for key in keys:
+                        function(key)
+                    return None
+                latencies = []
+                for key in keys:
+                    start = clock()
+                    function(key)
+                    latencies.append(clock() - start)
+                return latencies
+            seconds, latencies, _ = _measure(hash_run, repeat)
+            collisions = len(keys) - len(set(map(function, keys)))
+            records.append(_suite_record("hash", workload, function.__name__, "hash", seconds, latencies,
+                                         collisions=collisions))
+
+        # find_mode and Counter each count the workload's key stream once per timed call
+        stream = [args[0] for _, args in ops] or keys
+        da = DynamicArray(stream)
+        for label, count in (("find_mode", lambda: find_mode(da)),
+                             ("Counter", lambda: Counter(stream).most_common(1))):
+            def call_run(clock, count=count):
+                if clock is None:
+                    count()
+                    return None
+                latencies = []
+                for _ in range(repeat):
+                    start = clock()
+                    count()
+                    latencies.append(clock() - start)
+                return latencies
+            seconds, latencies, peak = _measure(call_run, repeat)
+            record = _suite_record("find_mode", workload, label, "call", seconds, latencies, peak)
+            record["ops_per_sec"] = len(stream) / seconds                # Elements counted per second
+            records.append(record)
+    return records
+
+
+def write_json(records: list, path: str, **meta) -> None:
+    """
+    Writes suite records to a JSON file, with the interpreter and platform (and any extra metadata, such as
+    the suite parameters) alongside so that runs from different machines aren't compared by mistake.
+
+    Parameter "records" refers to the records returned by run_suite.
+    Parameter "path" refers to the output file ("-" for standard output).
+    """
+
+    document = {
+        "meta": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                 "platform": platform.platform(), "timestamp": time.time(), **meta},
+        "results": records,
+    }
+    if path == "-":
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    else:
+        with open(path, "w") as output:
+            json.dump(document, output, indent=2)
+
+
+def write_csv(records: list, path: str) -> None:
+    """
+    Writes suite records to a CSV file with one row per record and the SUITE_FIELDS columns (empty cells
+    where a field doesn't apply).
+
+    Parameter "records" refers to the records returned by run_suite.
+    Parameter "path" refers to the output file ("-" for standard output).
+    """
+
+    output = sys.stdout if path == "-" else open(path, "w", newline="")
+    try:
+        writer = csv.DictWriter(output, fieldnames=SUITE_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hash map benchmarks. Without --suite, prints the comparison "
+                                                 "tables; with it, runs the regression suite.")
+    parser.add_argument("--suite", action="store_true", help="run the regression suite (see run_suite)")
+    parser.add_argument("--json", metavar="PATH", help="write suite results as JSON ('-' for stdout)")
+    parser.add_argument("--csv", metavar="PATH", help="write suite results as CSV ('-' for stdout)")
+    parser.add_argument("--size", type=int, default=5_000, help="operations per workload")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=261, help="random seed of the workloads")
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    arguments = parser.parse_args()
+
+    if arguments.suite:
+        records = run_suite(arguments.size, arguments.repeat, arguments.seed, arguments.workloads)
+        if arguments.json:
+            write_json(records, arguments.json, size=arguments.size, repeat=arguments.repeat, seed=arguments.seed)
+        if arguments.csv:
+            write_csv(records, arguments.csv)
+        if not arguments.json and not arguments.csv:
+            print(f"{'suite':>10} {'workload':>12} {'target':>22} {'ops/s':>12} {'p50':>8} {'p99':>8} {'peak B':>12}")
+            for record in records:
+                print(f"{record['suite']:>10} {record['workload']:>12} {record['target']:>22} "
+                      f"{record['ops_per_sec']:>12.0f} {record['p50_ns']:>8} {record['p99_ns']:>8} "
+                      f"{record['peak_bytes'] if record['peak_bytes'] is not None else '':>12}")
+    else:
+        print("OA read scaling (ns per operation)")
+        print(f"{'size':>10} {'capacity':>10} {'get hit':>10} {'get miss':>10} {'contains':>10}")
+        for row in bench_oa_read_scaling():
+            print(f"{row[0]:>10} {row[1]:>10} {row[2]:>10.0f} {row[3]:>10.0f} {row[4]:>10.0f}")
+
+        print()
+        print("OA put latency while growing from 11 buckets (ns)")
+        print(f"{'mode':>12} {'median':>10} {'p99':>10} {'max':>12}")
+        for label, step in (("blocking", None), ("incremental", 64)):
+            row = bench_oa_put_latency(rehash_step=step)
+            print(f"{label:>12} {row[0]:>10} {row[1]:>10} {row[2]:>12}")
+
+        print()
+        print("OA storage backends")
+        print(f"{'backend':>12} {'put ns':>10} {'overwrite':>10} {'get ns':>10} {'B/entry':>10}")
+        for row in bench_oa_backends():
+            print(f"{row[0]:>12} {row[1]:>10.0f} {row[2]:>10.0f} {row[3]:>10.0f} {row[4]:>10.1f}")
+
+        print()
+        per_object, per_map = bench_memory_per_entry()
+        print("Bytes per object")
+        print(f"{'object':>12} {'before':>10} {'after':>10}")
+        for row in per_object:
+            print(f"{row[0]:>12} {row[1]:>10.1f} {row[2]:>10.1f}")
+        print("Bytes per map entry (integer keys and values)")
+        for row in per_map:
+            print(f"{row[0]:>12} {row[1]:>10.1f}")
+
+        print()
+        print("Bulk vs scalar operations with hash_function_2 (seconds)")
+        print(f"{'map':>12} {'put loop':>10} {'put_many':>10} {'get loop':>10} {'get_many':>10}")
+        for row in bench_bulk_operations():
+            print(f"{row[0]:>12} {row[1]:>10.3f} {row[2]:>10.3f} {row[3]:>10.3f} {row[4]:>10.3f}")
+
+        print()
+        print("Capacity modes (ns per operation)")
+        print(f"{'map':>6} {'mode':>10} {'keys':>8} {'capacity':>10} {'put':>10} {'get':>10} {'buckets':>10}")
+        for row in bench_capacity_modes():
+            print(f"{row[0]:>6} {row[1]:>10} {row[2]:>8} {row[3]:>10.0f} {row[4]:>10.0f} {row[5]:>10.0f} {row[6]:>10}")
+
+        print()
+        print("OA probing strategies (ns per operation)")
+        print(f"{'probing':>12} {'max load':>8} {'put':>8} {'hit':>8} {'miss':>8} {'churn':>8} {'buckets':>10}")
+        for row in bench_probing_strategies():
+            print(f"{row[0]:>12} {row[1]:>8} {row[2]:>8.0f} {row[3]:>8.0f} {row[4]:>8.0f} {row[5]:>8.0f} {row[6]:>10}")
+
+        print()
+        print("find_mode scaling across worker processes (workers 0 = serial find_mode)")
+        print(f"{'workers':>12} {'seconds':>10} {'speedup':>10}")
+        for row in bench_find_mode_scaling():
+            print(f"{row[0]:>12} {row[1]:>10.3f} {row[2]:>10.2f}")
@@ -0,0 +1,83 @@
+# Description:  Capacity selection for the SC and OA hash maps. Besides the exact next prime found by trial
+#               division ("prime", the original behavior), a map can pick its capacities from a precomputed
+#               schedule of primes ("schedule", about eight per doubling, found by binary search) or use powers
+#               of two ("pow2"), where the bucket index is the low bits of the hash. Power-of-two maps pass their
+#               hashes through a finalizer (see hash_functions.with_finalizer), since the low bits of weak
+#               hashes such as hash_function_1 or small integers are poorly distributed on their own.
+
+
+from bisect import bisect_left
+
+
+CAPACITY_MODES = ("prime", "schedule", "pow2")
+
+# Smallest prime at or above 2**k * (1 + j/8) for every k up to 31 and j in 0..7, in increasing order
+PRIME_SCHEDULE = (
+    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 47, 53, 59, 61, 67, 73, 83, 89, 97, 107, 113, 127, 131, 149,
+    163, 179, 193, 211, 227, 241, 257, 293, 331, 353, 389, 419, 449, 487, 521, 577, 641, 709, 769, 839, 907, 967,
+    1031, 1153, 1283, 1409, 1543, 1667, 1801, 1931, 2053, 2309, 2579, 2819, 3079, 3329, 3593, 3847, 4099, 4621,
+    5147, 5639, 6151, 6659, 7177, 7681, 8209, 9221, 10243, 11273, 12289, 13313, 14341, 15361, 16411, 18433, 20483,
+    22531, 24593, 26627, 28687, 30727, 32771, 36871, 40961, 45061, 49157, 53267, 57347, 61441, 65537, 73751, 81929,
+    90121, 98317, 106501, 114689, 122887, 131101, 147457, 163841, 180233, 196613, 212999, 229393, 245771, 262147,
+    294919, 327689, 360457, 393241, 425987, 458789, 491527, 524309, 589829, 655373, 720899, 786433, 851971, 917513,
+    983063, 1048583, 1179649, 1310723, 1441807, 1572869, 1703941, 1835017, 1966123, 2097169, 2359303, 2621447,
+    2883593, 3145739, 3407881, 3670027, 3932167, 4194319, 4718617, 5242883, 5767169, 6291469, 6815749, 7340033,
+    7864331, 8388617, 9437189, 10485767, 11534351, 12582917, 13631489, 14680067, 15728681, 16777259, 18874379,
+    20971529, 23068673, 25165843, 27262997, 29360147, 31457287, 33554467, 37748743, 41943049, 46137359, 50331653,
+    54525979, 58720267, 62914619, 67108879, 75497479, 83886091, 92274737, 100663319, 109051907, 117440551,
+    125829139, 134217757, 150994979, 167772161, 184549429, 201326611, 218103811, 234881033, 251658263, 268435459,
+    301989917, 335544323, 369098771, 402653189, 436207619, 469762049, 503316511, 536870923, 603979799, 671088667,
+    738197549, 805306457, 872415239, 939524129, 1006632983, 1073741827, 1207959559, 1342177283, 1476395029,
+    1610612741, 1744830469, 1879048201, 2013265921, 2147483659, 2415919109, 2684354591, 2952790033, 3221225473,
+    3489660929, 3758096411, 4026531853,
+)
+
+
+def scheduled_prime(capacity: int) -> int:
+    """
+    Returns the smallest prime in the schedule that is at least the requested capacity (within about 1/8 of
+    it, apart from small capacities). Requests past the end of the schedule fall back to searching upward
+    by trial division.
+
+    Parameter "capacity" refers to the requested capacity.
+    """
+
+    index = bisect_left(PRIME_SCHEDULE, capacity)
+    if index < len(PRIME_SCHEDULE):
+        return PRIME_SCHEDULE[index]
+
+    # Beyond the schedule: the next odd number with no odd divisor up to its square root
+    capacity |= 1
+    while any(capacity % divisor == 0 for divisor in range(3, int(capacity ** 0.5) + 1, 2)):
+        capacity += 2
+    return capacity
+
+
+def power_of_two(capacity: int) -> int:
+    """
+    Returns the smallest power of two that is at least the requested capacity (and at least 1).
+
+    Parameter "capacity" refers to the requested capacity.
+    """
+    return 1 << max(capacity - 1, 0).bit_length()
+
+
+def fit_capacity(capacity: int, mode: str) -> int:
+    """
+    Returns the capacity a map in the "schedule" or "pow2" mode uses for a requested capacity (the "prime"
+    mode keeps the maps' own _next_prime).
+
+    Parameter "capacity" refers to the requested capacity.
+    Parameter "mode" refers to the capacity mode.
+    """
+    return scheduled_prime(capacity) if mode == "schedule" else power_of_two(capacity)
+
+
+def check_capacity_mode(mode: str) -> None:
+    """
+    Raises ValueError if a capacity mode is not one of CAPACITY_MODES.
+
+    Parameter "mode" refers to the capacity mode being checked.
+    """
+    if mode not in CAPACITY_MODES:
+        raise ValueError(f"Unknown capacity mode: {mode!r}")
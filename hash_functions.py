@@ -0,0 +1,253 @@
+# Description:  Additional hash functions for use with the SC and OA hash maps, as better distributed
+#               alternatives to hash_function_1/hash_function_2 (hash_function_1 sends every anagram to the same
+#               bucket). The gain is in distribution and collision behavior, not per-key cost: fnv1a_hash loops
+#               over every character in Python and is slower than the samples, and only the functions built on
+#               the builtin hash() are cheaper. Any of them can be passed as the "function" argument of either
+#               HashMap. Also provides batch hashing for bulk operations, where the real speedup over a loop of
+#               single calls comes from hash_many's NumPy path. Run as a module for a distribution/speed report.
+
+
+import time
+from functools import lru_cache
+from itertools import accumulate
+
+from HashMap.a6_include import hash_function_1, hash_function_2
+
+try:
+    import numpy
+except ImportError:                                                 # Optional: batches fall back to C-level iterators
+    numpy = None
+
+
+_MASK_64 = (1 << 64) - 1
+_FNV_OFFSET_64 = 0xcbf29ce484222325
+_FNV_PRIME_64 = 0x100000001b3
+_MULTIPLIER_64 = 0x9e3779b97f4a7c15                                 # Odd constant from the golden ratio
+_FMIX_1 = 0xff51afd7ed558ccd                                        # MurmurHash3 fmix64 multipliers
+_FMIX_2 = 0xc4ceb9fe1a85ec53
+_builtin_hash = hash
+_MAX_VECTOR_KEY_LENGTH = 1 << 20                                    # Longer keys could overflow int64 weighted sums
+
+
+def seeded_hash(seed: int = 0) -> callable:
+    """
+    Builds a hash function on top of Python's builtin hash, mixed with a seed so that different maps can use
+    independent functions. Builtin string hashes are randomized per process (PYTHONHASHSEED), so these
+    values should not be persisted.
+
+    Parameter "seed" refers to the integer mixed into every hash.
+
+    Returns a function taking a key and returning its hash.
+    """
+
+    def hash_function(key: str) -> int:
+        """Seeded builtin hash"""
+        return hash((seed, key))
+
+    hash_function.__name__ = f"seeded_hash_{seed}"
+    return hash_function
+
+
+def fnv1a_hash(key: str) -> int:
+    """
+    64-bit FNV-1a hash over the key's UTF-8 bytes. Well distributed and stable across processes.
+
+    Parameter "key" refers to the string being hashed.
+
+    Returns the key's 64-bit hash.
+    """
+
+    hash = _FNV_OFFSET_64
+    for byte in key.encode('utf-8'):
+        hash = ((hash ^ byte) * _FNV_PRIME_64) & _MASK_64
+    return hash
+
+
+def multiply_shift_hash(key: str) -> int:
+    """
+    Multiply-shift mixer applied to the builtin hash: multiplies by an odd 64-bit constant and folds the high
+    bits (where the multiplication concentrates its mixing) back into the low bits that pick the bucket.
+
+    Parameter "key" refers to the key being hashed.
+
+    Returns the key's 64-bit hash.
+    """
+
+    hash = ((_builtin_hash(key) & _MASK_64) * _MULTIPLIER_64) & _MASK_64
+    return hash ^ (hash >> 32)
+
+
+def memoize_hash(function: callable, maxsize: int = 1 << 16) -> callable:
+    """
+    Wraps a hash function with a bounded least-recently-used cache, so repeated keys are only hashed once.
+    Worth it for the character-loop functions on long, frequently repeated keys; the builtin-based functions
+    are already cheaper than a cache lookup.
+
+    Parameter "function" refers to the hash function being wrapped.
+    Parameter "maxsize" refers to the number of distinct keys remembered (None for unbounded).
+
+    Returns the memoized hash function (with lru_cache's cache_info/cache_clear methods).
+    """
+
+    memoized = lru_cache(maxsize=maxsize)(function)
+    memoized.__name__ = f"memoized_{function.__name__}"
+    return memoized
+
+
+def finalize_hash(key_hash: int) -> int:
+    """
+    MurmurHash3's 64-bit finalizer: alternating xor-shifts and multiplications that make every input bit
+    affect every output bit. Power-of-two capacities index with the low bits of a hash, which it fills with
+    well mixed bits even when the input hash varies only in its high bits (or barely at all).
+
+    Parameter "key_hash" refers to the hash being mixed (negative hashes are taken modulo 2**64).
+
+    Returns the mixed 64-bit hash.
+    """
+
+    hash = key_hash & _MASK_64
+    hash = ((hash ^ (hash >> 33)) * _FMIX_1) & _MASK_64
+    hash = ((hash ^ (hash >> 33)) * _FMIX_2) & _MASK_64
+    return hash ^ (hash >> 33)
+
+
+def with_finalizer(function: callable) -> callable:
+    """
+    Composes a hash function with finalize_hash (as power-of-two maps do). The composition keeps the original
+    as its "base_function" attribute, so hash_many can still batch the original before finalizing.
+
+    Parameter "function" refers to the hash function being wrapped.
+
+    Returns the finalized hash function.
+    """
+
+    def finalized(key: str) -> int:
+        """Hash function followed by the fmix64 finalizer"""
+        hash = function(key) & _MASK_64
+        hash = ((hash ^ (hash >> 33)) * _FMIX_1) & _MASK_64
+        hash = ((hash ^ (hash >> 33)) * _FMIX_2) & _MASK_64
+        return hash ^ (hash >> 33)
+
+    finalized.__name__ = f"finalized_{getattr(function, '__name__', 'hash')}"
+    finalized.base_function = function
+    return finalized
+
+
+def hash_many(function: callable, keys) -> list:
+    """
+    Hashes a whole sequence of keys in one call. hash_function_1 and hash_function_2 on string keys are
+    vectorized over a single UTF-32 buffer with NumPy when it is installed, and otherwise summed with C-level
+    iterators instead of per-character Python loops; any other function is applied key by key. Results are
+    identical to the scalar functions.
+
+    Parameter "function" refers to the hash function being applied.
+    Parameter "keys" refers to a sequence (e.g. a list) of keys.
+
+    Returns a list with the full hash of each key, in order.
+    """
+
+    # Batch a finalized function's original, then mix each result
+    base_function = getattr(function, 'base_function', None)
+    if base_function is not None:
+        return [finalize_hash(key_hash) for key_hash in hash_many(base_function, keys)]
+
+    # Only the two sample functions have a known arithmetic form that can be batched
+    if function is not hash_function_1 and function is not hash_function_2:
+        return [function(key) for key in keys]
+    for key in keys:
+        if type(key) is not str:
+            return [function(key) for key in keys]
+
+    weighted = function is hash_function_2
+    if numpy is not None and keys and max(map(len, keys)) <= _MAX_VECTOR_KEY_LENGTH:
+        return _hash_many_vectorized(keys, weighted)
+
+    # hash_function_2 weights code points 1..n, which equals the sum of the running totals of the reversed key
+    if weighted:
+        return [sum(accumulate(map(ord, reversed(key)))) for key in keys]
+    return [sum(map(ord, key)) for key in keys]
+
+
+def _hash_many_vectorized(keys, weighted: bool) -> list:
+    """
+    NumPy implementation of hash_function_1 (weighted False) and hash_function_2 (weighted True) over a batch
+    of string keys.
+
+    Parameter "keys" refers to a non-empty sequence of strings.
+    Parameter "weighted" refers to whether each code point is weighted by its 1-based position in its key.
+
+    Returns a list with the hash of each key, in order.
+    """
+
+    # Encode every key into one buffer of code points and note where each key starts
+    # (surrogatepass keeps lone surrogates, which the scalar functions accept, as their own code points)
+    codes = numpy.frombuffer(''.join(keys).encode('utf-32-le', 'surrogatepass'), dtype='<u4').astype(numpy.int64)
+    lengths = numpy.fromiter(map(len, keys), dtype=numpy.int64, count=len(keys))
+    starts = numpy.cumsum(lengths) - lengths
+    if weighted:
+        codes = codes * (numpy.arange(codes.size, dtype=numpy.int64) - numpy.repeat(starts, lengths) + 1)
+
+    # Sum the segments of the non-empty keys only (reduceat can't express empty segments, and an empty key's
+    # start would cut the segment before it short), leaving every empty key's hash at 0
+    sums = numpy.zeros(len(keys), dtype=numpy.int64)
+    non_empty = lengths > 0
+    if codes.size:
+        sums[non_empty] = numpy.add.reduceat(codes, starts[non_empty])
+    return sums.tolist()
+
+
+def bucket_indices(function: callable, keys, capacity: int) -> list:
+    """
+    Maps a whole sequence of keys to their bucket indices in one call, using hash_many.
+
+    Parameter "function" refers to the hash function being applied.
+    Parameter "keys" refers to a sequence (e.g. a list) of keys.
+    Parameter "capacity" refers to the number of buckets.
+
+    Returns a list with the bucket index of each key, in order.
+    """
+
+    return [key_hash % capacity for key_hash in hash_many(function, keys)]
+
+
+def distribution_report(functions=None, keys=None, capacity: int = 10007) -> list:
+    """
+    Measures how evenly and how quickly each hash function spreads a key set over a table.
+
+    Parameter "functions" refers to the hash functions to compare (defaults to every function here plus the two
+    sample functions).
+    Parameter "keys" refers to the keys to hash (defaults to 50,000 numbered keys, which form many anagram
+    groups).
+    Parameter "capacity" refers to the number of buckets the keys are spread over.
+
+    Returns a list of (name, ns per hash, longest chain, empty bucket ratio, chi-squared / buckets) tuples. A
+    uniform function scores a longest chain of a few keys and a chi-squared ratio close to 1.
+    """
+
+    if functions is None:
+        functions = (hash_function_1, hash_function_2, seeded_hash(), fnv1a_hash, multiply_shift_hash)
+    if keys is None:
+        keys = ['key' + str(num) for num in range(50_000)]
+
+    report = []
+    expected = len(keys) / capacity
+    for function in functions:
+
+        # Time the hashing on its own, then tally how many keys land in each bucket
+        start = time.perf_counter()
+        hashes = [function(key) for key in keys]
+        ns_per_hash = (time.perf_counter() - start) * 1e9 / len(keys)
+
+        counts = [0] * capacity
+        for key_hash in hashes:
+            counts[key_hash % capacity] += 1
+        chi_squared = sum((count - expected) ** 2 / expected for count in counts)
+        report.append((function.__name__, ns_per_hash, max(counts), counts.count(0) / capacity,
+                       chi_squared / capacity))
+    return report
+
+
+if __name__ == "__main__":
+    print(f"{'function':>22} {'ns/hash':>10} {'longest':>8} {'empty':>8} {'chi2/m':>8}")
+    for row in distribution_report():
+        print(f"{row[0]:>22} {row[1]:>10.0f} {row[2]:>8} {row[3]:>8.3f} {row[4]:>8.2f}")
@@ -0,0 +1,190 @@
+# Description:  Append-only journal (write-ahead log) for the SC and OA hash maps. A map constructed with
+#               journal=Journal(path) first replays the journal to rebuild its contents, then records every
+#               mutating call (put, remove, clear, resize_table and the bulk/upsert variants). Records are buffered
+#               and written in batches, each pickled as one length/CRC framed block and fsynced, which keeps the
+#               per-call cost to a list append; compaction rewrites the journal as a checkpoint holding only the
+#               map's current capacity and live pairs.
+
+
+import os
+import pickle
+import struct
+import time
+import zlib
+
+
+_BATCH_HEADER = struct.Struct('<II')        # payload length, CRC-32 of the payload
+_PICKLE_PROTOCOL = 4
+_CHECKPOINT_CHUNK = 1024                    # Pairs per put_many record in a checkpoint
+
+# Map methods a journal may record and replay (their arguments are stored as recorded)
+OPERATIONS = frozenset(('put', 'remove', 'clear', 'resize_table', 'put_many', 'remove_many'))
+
+
+class Journal:
+    """
+    Append-only journal of map mutations. Each batch of records is framed by its length and CRC, so a batch
+    torn by a crash is detected on replay and cut off, keeping every batch before it. Records still waiting in
+    the current batch are not durable (and their values are captured when the batch is written).
+    """
+
+    def __init__(self, path: str, sync_every: int = 1000, sync_interval: float = 1.0,
+                 compact_every: int = None) -> None:
+        """
+        Opens (or creates) a journal file.
+
+        Parameter "path" refers to the journal file.
+        Parameter "sync_every" refers to the number of records per batch (1 writes and fsyncs every record).
+        Parameter "sync_interval" refers to the longest time in seconds a record may wait for an fsync (checked
+        as records are written; None disables the time limit).
+        Parameter "compact_every" refers to the number of records after which the journal is automatically
+        rewritten as a checkpoint of the map it replayed into (None disables automatic compaction).
+        """
+
+        self._path = path
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._compact_every = compact_every
+        self._map = None
+        self._file = open(path, 'ab')
+        self._records = 0                                           # Records appended since the last checkpoint
+        self._pending = []                                          # Current batch of (operation, args) records
+        self._last_sync = time.monotonic()
+
+    def __enter__(self) -> "Journal":
+        """Support use as a context manager that closes the journal on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the journal on leaving a with block."""
+        self.close()
+
+    def replay(self, map) -> int:
+        """
+        Applies every intact record in the journal to a map, then binds the map for compaction. A torn or
+        corrupt batch (from a crash mid-write) ends the replay and is truncated away with anything after it.
+        Called by the map constructors before they start recording, so the replayed calls aren't journaled again.
+
+        Parameter "map" refers to a map that is not journaling (yet).
+
+        Returns the number of records applied.
+        """
+
+        self.sync()
+        applied = 0
+        with open(self._path, 'rb') as file:
+            good_offset = 0
+            while True:
+                header = file.read(_BATCH_HEADER.size)
+                if len(header) < _BATCH_HEADER.size:
+                    break
+                length, checksum = _BATCH_HEADER.unpack(header)
+                payload = file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                for operation, args in pickle.loads(payload):
+                    if operation not in OPERATIONS:
+                        raise ValueError(f"Unknown journal operation {operation!r}")
+                    getattr(map, operation)(*args)
+                    applied += 1
+                good_offset = file.tell()
+
+        # Cut off a torn tail so new records follow the last intact one
+        if good_offset != os.path.getsize(self._path):
+            self._file.close()
+            os.truncate(self._path, good_offset)
+            self._file = open(self._path, 'ab')
+        self._map = map
+        self._records = applied
+        return applied
+
+    def record(self, operation: str, *args) -> None:
+        """
+        Adds one mutation to the current batch, writing and fsyncing the batch once it is full or the sync
+        interval has passed, and compacting when the journal has grown past compact_every records.
+
+        Parameter "operation" refers to the name of the map method called.
+        Parameter "args" refers to its positional arguments.
+
+        No return - appends to the journal file.
+        """
+
+        self._pending.append((operation, args))
+        self._records += 1
+
+        # One write and fsync per sync_every records, or sooner once a batch has waited sync_interval
+        if len(self._pending) >= self._sync_every or (
+                self._sync_interval is not None and time.monotonic() - self._last_sync >= self._sync_interval):
+            self.sync()
+        if self._compact_every is not None and self._map is not None and self._records >= self._compact_every:
+            self.compact()
+
+    def sync(self) -> None:
+        """
+        Writes the current batch and fsyncs the journal, making every recorded mutation durable.
+
+        No parameters.
+        """
+
+        if self._pending:
+            self._write_batch(self._file, self._pending)
+            self._pending = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def compact(self, map=None) -> None:
+        """
+        Rewrites the journal as a checkpoint: put_many records holding every live pair, between resize_table
+        records restoring the capacity (the first avoids growth while replaying, the second undoes any presizing
+        by put_many). The checkpoint supersedes the current batch. It is written next to the journal and swapped
+        in once it has been fsynced, so a crash mid-compaction leaves the old journal intact.
+
+        Parameter "map" refers to the map being checkpointed (defaults to the map the journal replayed into).
+
+        No return - replaces the journal file.
+        """
+
+        if map is None:
+            map = self._map
+        temp_path = self._path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            self._write_batch(file, [('resize_table', (map.get_capacity(),))])
+            chunk = []
+            for pair in map.items():
+                chunk.append(pair)
+                if len(chunk) == _CHECKPOINT_CHUNK:
+                    self._write_batch(file, [('put_many', (chunk,))])
+                    chunk = []
+            if chunk:
+                self._write_batch(file, [('put_many', (chunk,))])
+            self._write_batch(file, [('resize_table', (map.get_capacity(),))])
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Swap the checkpoint in and continue appending after it
+        self._file.close()
+        os.replace(temp_path, self._path)
+        self._file = open(self._path, 'ab')
+        self._records = 0
+        self._pending = []
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def _write_batch(file, records: list) -> None:
+        """
+        Writes a list of (operation, args) records to a file as one framed batch.
+        """
+        payload = pickle.dumps(records, _PICKLE_PROTOCOL)
+        file.write(_BATCH_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+    def close(self) -> None:
+        """
+        Syncs and closes the journal.
+
+        No parameters.
+        """
+
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
@@ -0,0 +1,142 @@
+# Description:  Opt-in metrics for the SC and OA hash maps. map.enable_metrics() attaches a MapMetrics object that
+#               counts get/contains_key/get_many hits and misses and records every resize (before/after capacity
+#               and how long it took), and reports them together with the map's tombstone count and its
+#               chain-length (SC) or probe-length (OA) histogram. Registered hooks receive each resize event and
+#               every published report, for export. A map without metrics only pays an "is None" check per lookup.
+
+
+import time
+from collections import deque, namedtuple
+
+
+# One resize_table call: capacities before and after, live entries, wall-clock duration and when it finished
+ResizeEvent = namedtuple('ResizeEvent', ('old_capacity', 'new_capacity', 'size', 'seconds', 'timestamp'))
+
+
+class MapMetrics:
+    """
+    Metrics of one map. Counters are updated by the map as it runs; histograms are computed from the table
+    when a report is built, so keeping them costs nothing between reports.
+    """
+
+    def __init__(self, map, histogram_name: str, histogram: callable, max_events: int = 1000) -> None:
+        """
+        Initialize empty metrics for a map (use map.enable_metrics rather than calling this directly).
+
+        Parameter "map" refers to the map being measured.
+        Parameter "histogram_name" refers to the report key of the map's length histogram.
+        Parameter "histogram" refers to the map method computing that histogram.
+        Parameter "max_events" refers to the number of most recent resize events kept.
+        """
+
+        self._map = map
+        self._histogram_name = histogram_name
+        self._histogram = histogram
+        self._hooks = []
+        self.hits = 0
+        self.misses = 0
+        self.resize_events = deque(maxlen=max_events)
+
+    def add_hook(self, hook: callable) -> None:
+        """
+        Registers a callback receiving hook(event, data): ("resize", ResizeEvent) after every resize, and
+        ("report", report dictionary) whenever a report is published.
+
+        Parameter "hook" refers to the callback.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: callable) -> None:
+        """
+        Unregisters a callback added with add_hook.
+
+        Parameter "hook" refers to the callback.
+        """
+        self._hooks.remove(hook)
+
+    def _emit(self, event: str, data: object) -> None:
+        """
+        Passes an event to every registered hook.
+        """
+        for hook in self._hooks:
+            hook(event, data)
+
+    def record_lookup(self, hit: bool) -> None:
+        """
+        Counts one get/contains_key call, or one key of a get_many call.
+
+        Parameter "hit" refers to whether the key was found.
+        """
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def timed_resize(self, resize: callable, new_capacity: int) -> None:
+        """
+        Runs a resize and records it as a ResizeEvent. In incremental mode the duration only covers starting
+        the resize (the migration is spread over later operations).
+
+        Parameter "resize" refers to the map's resize body.
+        Parameter "new_capacity" refers to the capacity passed to resize_table.
+
+        No return - modifies the map.
+        """
+
+        old_capacity = self._map.get_capacity()
+        start = time.perf_counter()
+        resize(new_capacity)
+        seconds = time.perf_counter() - start
+        event = ResizeEvent(old_capacity, self._map.get_capacity(), self._map.get_size(), seconds, time.time())
+        self.resize_events.append(event)
+        self._emit("resize", event)
+
+    def report(self) -> dict:
+        """
+        Builds a report of the map's current metrics.
+
+        No parameters.
+
+        Returns a dictionary with the hit/miss counts and ratio, size, capacity, load factor, tombstone count,
+        the chain_lengths (SC) or probe_lengths (OA) histogram as a {length: count} dictionary, and the
+        recorded resize events.
+        """
+
+        # OA tombstones still occupy slots and lengthen probes, so they count towards the load (as in table_load)
+        lookups = self.hits + self.misses
+        tombstones = getattr(self._map, '_tombstones', 0)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": self._map.get_size(),
+            "capacity": self._map.get_capacity(),
+            "load": (self._map.get_size() + tombstones) / self._map.get_capacity(),
+            "tombstones": tombstones,
+            self._histogram_name: self._histogram(),
+            "resizes": [event._asdict() for event in self.resize_events],
+        }
+
+    def publish(self) -> dict:
+        """
+        Builds a report and passes it to every hook as a "report" event.
+
+        No parameters.
+
+        Returns the report.
+        """
+
+        report = self.report()
+        self._emit("report", report)
+        return report
+
+    def reset(self) -> None:
+        """
+        Clears the counters and resize events (hooks stay registered).
+
+        No parameters.
+        """
+
+        self.hits = 0
+        self.misses = 0
+        self.resize_events.clear()
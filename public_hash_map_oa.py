@@ -3,36 +3,113 @@
 # Description:  Implements an open address hash map using quadratic probing based on provided dynamic arrays.
 #               Uses skeleton code provided by Oregon State University's CS-261 Data Structures course.
 
-# MAKE SURE TO ADD QUADRATIC PROBING  IN GET AND CONTAINS KEY METHODS
 
-
-from HashMap.a6_include import (DynamicArray, HashEntry,
+from HashMap.a6_include import (DynamicArray, HashEntry, as_list,
                                 hash_function_1, hash_function_2)
+from HashMap.capacity import check_capacity_mode, fit_capacity
+from HashMap.hash_functions import hash_many, with_finalizer
+from HashMap.journal import Journal
+from HashMap.metrics import MapMetrics
+from HashMap.snapshot import KIND_OA, LIVE, TOMBSTONE, SnapshotView, write_snapshot
+
+
+# Left in an old bucket once its entry has been migrated by an incremental resize. It behaves as a tombstone,
+# so probe chains through the old array stay intact while it is being drained.
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
+
+PROBING_STRATEGIES = ("linear", "quadratic", "double", "robin_hood")
 
 
 # OSU-provided code starts here.
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, tombstone_ratio: float = 0.25, rehash_step: int = None,
+                 journal: Journal = None, shrink_load: float = None, capacity_mode: str = "prime",
+                 probing: str = "quadratic", max_load: float = 0.5) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        Parameter "tombstone_ratio" refers to the fraction of buckets that may hold tombstones before
+        remove compacts the table in place (None disables compaction).
+        Parameter "rehash_step" opts into incremental resizing: a resize only allocates the new bucket array,
+        and each put/get/contains_key/remove then migrates this many old buckets into it. A step of at least 2
+        finishes each migration before the next growth is due.
+        Parameter "journal" refers to an optional Journal (see journal.py): its records are replayed into the
+        new map, after which every put/remove/clear/resize_table (and bulk/upsert variant) is recorded to it.
+        Parameter "shrink_load" refers to the low-water load factor (below half of max_load, so a shrunk table
+        stays clear of the growth threshold) under which remove shrinks the table to twice that load, never
+        below the initial capacity; clear then also drops back to the initial capacity (None never shrinks).
+        Parameter "capacity_mode" refers to how capacities are chosen (see capacity.py): "prime" (the next
+        prime, by trial division), "schedule" (the next prime in a precomputed schedule) or "pow2" (powers of
+        two, with the hash function wrapped in a finalizer and triangular probing, which unlike quadratic
+        probing visits every bucket of a power-of-two table).
+        Parameter "probing" refers to the collision resolution strategy: "linear" (neighbouring buckets),
+        "quadratic" (og_index + i**2), "double" (a second, hash-derived step size) or "robin_hood" (linear
+        probing that keeps every run ordered by displacement, so misses stop early and removals shift
+        entries back instead of leaving tombstones).
+        Parameter "max_load" refers to the load factor (live entries plus tombstones) above which puts double
+        the table. Every strategy but quadratic reaches every bucket, so it can go up to 0.8-0.9; quadratic
+        probing over a prime capacity only reaches half of the buckets, so there it is limited to 0.5 (a fuller
+        table could leave a rehashed entry with no reachable bucket).
         """
+        if probing not in PROBING_STRATEGIES:
+            raise ValueError(f"Unknown probing strategy: {probing!r}")
+        if not 0 < max_load < 1:
+            raise ValueError(f"max_load must be between 0 and 1, not {max_load}")
+        if probing == "quadratic" and capacity_mode != "pow2" and max_load > 0.5:
+            raise ValueError(f"max_load must be at most 0.5 for quadratic probing on prime capacities, not {max_load}")
+        if shrink_load is not None and not 0 < shrink_load < max_load / 2:
+            raise ValueError(f"shrink_load must be between 0 and {max_load / 2}, not {shrink_load}")
+        check_capacity_mode(capacity_mode)
+        self._capacity_mode = capacity_mode
+        self._max_load = max_load
+        self._probing = probing
+        self._robin_hood = probing == "robin_hood"
+        self._double_hashing = probing == "double"
+
+        # Growth of the probe offset per step: i**2 grows by 3, 5, 7, ... (i*(i+1)/2 by 2, 3, 4, ... in pow2 mode)
+        if probing == "quadratic":
+            self._probe_stride = 1 if capacity_mode == "pow2" else 2
+        else:
+            self._probe_stride = 0
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number (or a power of two in pow2 mode)
+        if capacity_mode == "prime":
+            self._capacity = self._next_prime(capacity)
+        else:
+            self._capacity = fit_capacity(capacity, capacity_mode)
         for _ in range(self._capacity):
             self._buckets.append(None)
+        self._min_capacity = self._capacity                         # Floor for automatic shrinking
+        self._shrink_load = shrink_load
 
-        self._hash_function = function
+        self._hash_function = with_finalizer(function) if capacity_mode == "pow2" else function
         self._size = 0
+        self._tombstones = 0                                        # Slot counts: live = size, empty = the rest
+        self._tombstone_ratio = tombstone_ratio
+        self._mod_count = 0                                         # Bumped by changes that move entries (see keys)
+
+        # Incremental resize state: the old bucket array being drained and the next old bucket to migrate
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        self._metrics = None                                        # Opt-in MapMetrics (see enable_metrics)
+
+        # Rebuild the contents from the journal before recording anything new to it
+        self._journal = None
+        if journal is not None:
+            journal.replay(self)
+            self._journal = journal
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_resize()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -89,6 +166,18 @@ class HashMap:
     # ------------------------------------------------------------------ #
     # Implementation Coding Starts Here:
 
+    def _fit_capacity(self, capacity: int) -> int:
+        """
+        Returns the capacity the map's capacity mode uses for a requested capacity: the capacity itself if it
+        is prime, otherwise the next prime (prime mode), or the schedule/power-of-two choice (see capacity.py).
+
+        Parameter "capacity" refers to the requested capacity.
+        """
+
+        if self._capacity_mode != "prime":
+            return fit_capacity(capacity, self._capacity_mode)
+        return capacity if self._is_prime(capacity) else self._next_prime(capacity)
+
     def put(self, key: str, value: object) -> None:
         """
         Updates a key/value pair in the hash map. Adds the pair if it doesn't exist.
@@ -100,28 +189,219 @@ class HashMap:
         No return value - modifies the underlying hash table.
         """
 
-        # Resize the array if load factor is >= 0.5 (double -> prime)
-        if self.table_load() > 0.5:
-            self.resize_table(2 * self._capacity)                   # Resize makes it next prime of doubled, if needed
+        self._put_hashed(key, self._hash_function(key), value)
+        if self._journal is not None:
+            self._journal.record('put', key, value)
+
+    def _put_hashed(self, key: str, key_hash: int, value: object) -> None:
+        """
+        Body of put for callers that already hold the key's full hash (e.g. from a batch hash).
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "value" refers to the value paired with the input key.
+
+        No return value - modifies the underlying hash table.
+        """
+
+        # Move an in-progress incremental resize along
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Resize the array if load factor is > max_load (double -> prime), unless the put only overwrites an
+        # existing key (which adds no entry, so it must not move entries under a running iteration)
+        if self.table_load() > self._max_load and self._find_entry(key, key_hash) is None:
+            self._rebuild(2 * self._capacity)                       # Resize makes it next prime of doubled, if needed
+
+        # Mid-resize, retire any copy of the key still waiting in the old array
+        if self._old_buckets is not None:
+            self._retire_old_entry(key, key_hash)
+
+        self._store(key, key_hash, value)
+
+    def _store(self, key: str, key_hash: int, value: object) -> None:
+        """
+        Writes a key/value pair into the current bucket array without any load or resize bookkeeping. Callers
+        make sure there is room and that no copy of the key is waiting in an old array.
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "value" refers to the value paired with the input key.
 
-        # Generate the hashed key's index and start quadratic probing until empty space found
-        og_hash_index = self._hash_function(key) % self._capacity
-        cur_hash_index = og_hash_index
-        quad_factor = 1
-        while self._buckets[cur_hash_index] and self._buckets[cur_hash_index].is_tombstone is False:
+        No return value - modifies the underlying hash table.
+        """
 
-            # Over-write key data and end method if matching key found
-            if self._buckets[cur_hash_index].key == key:
-                self._buckets[cur_hash_index] = HashEntry(key, value)
+        # Robin Hood tables are updated in place or displace their way to a free bucket
+        if self._robin_hood:
+            index = self._robin_hood_find(key, key_hash)
+            if index is not None:
+                self._buckets[index] = HashEntry(key, value, key_hash)
                 return
+            self._robin_hood_add(HashEntry(key, value, key_hash))
+            return
 
-            # Continue iteration otherwise
-            cur_hash_index = (og_hash_index + quad_factor**2) % self._capacity
-            quad_factor += 1
+        # Follow the key's probe sequence to either its live entry or the first reusable bucket
+        index = self._probe(key, key_hash)
+        if index is None:                                           # Probe sequence exhausted, so grow and retry
+            self._rebuild(2 * self._capacity)
+            self._finish_resize()
+            self._store(key, key_hash, value)
+            return
+
+        # Over-write key data and end method if matching key found
+        if self._buckets[index] and self._buckets[index].is_tombstone is False:
+            self._buckets[index] = HashEntry(key, value, key_hash)
+            return
 
         # If match not found and the space is vacant/tombstone, place value and increase array size
-        self._buckets[cur_hash_index] = HashEntry(key, value)
+        if self._buckets[index]:                                    # Re-using a tombstone slot
+            self._tombstones -= 1
+        self._buckets[index] = HashEntry(key, value, key_hash)
         self._size += 1
+        self._mod_count += 1
+
+    def _probe(self, key: str, key_hash: int = None, buckets: DynamicArray = None, capacity: int = None) -> int:
+        """
+        Probe engine shared by put, get, contains_key and remove. Hashes the key once and walks the key's
+        probe sequence (see the "probing" strategies; Robin Hood tables are walked linearly here and use
+        _robin_hood_find for their own lookups), stepping over tombstones and stopping at the first empty bucket.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash, if the caller already computed it.
+        Parameters "buckets" and "capacity" select another bucket array to probe (defaults to the current one).
+
+        Returns the index of the live entry holding the key if it was found. Otherwise, returns the index
+        of the first reusable bucket (tombstone or empty) on the key's probe sequence, or None if the
+        sequence was exhausted without finding one.
+        """
+
+        # Generate the hashed key's index once, then probe until the key or an empty bucket is found
+        if key_hash is None:
+            key_hash = self._hash_function(key)
+        if buckets is None:
+            buckets, capacity = self._buckets, self._capacity
+        cur_index = key_hash % capacity
+        reuse_index = None
+        step, stride = 1, self._probe_stride
+        if self._double_hashing:
+            step = self._double_step(key_hash, capacity)
+        for _ in range(capacity):
+            entry = buckets[cur_index]
+            if entry is None:
+                return cur_index if reuse_index is None else reuse_index
+
+            # Remember the first tombstone for re-use, but keep going in case the key lives further along
+            if entry.is_tombstone:
+                if reuse_index is None:
+                    reuse_index = cur_index
+            elif entry.key_hash == key_hash and entry.key == key:     # Cheap hash check before comparing keys
+                return cur_index
+
+            # Continue iteration otherwise (quadratic offsets grow by 1, 3, 5, ... or by 1, 2, 3, ...)
+            cur_index = (cur_index + step) % capacity
+            step += stride
+
+        # No empty bucket was reached; fall back to the first tombstone seen (if any)
+        return reuse_index
+
+    @staticmethod
+    def _double_step(key_hash: int, capacity: int) -> int:
+        """
+        Returns the probe step of a key under double hashing, taken from the hash bits above the bucket index.
+        Any step from 1 to capacity - 1 visits every bucket of a prime table; a power-of-two table needs an
+        odd step.
+
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "capacity" refers to the capacity of the array being probed.
+        """
+
+        if capacity & (capacity - 1) == 0:
+            return ((key_hash // capacity) | 1) % capacity
+        return (key_hash // capacity) % (capacity - 1) + 1
+
+    def _robin_hood_find(self, key: str, key_hash: int) -> int:
+        """
+        Looks a key up in a Robin Hood table. Each run of entries is ordered by how far the entries sit from
+        their home buckets, so the search stops at the first entry closer to home than the key would be.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns the index of the key's entry, or None if it is not in the current bucket array.
+        """
+
+        buckets, capacity = self._buckets, self._capacity
+        index = key_hash % capacity
+        for distance in range(capacity):
+            entry = buckets[index]
+            if entry is None or (index - entry.key_hash % capacity) % capacity < distance:
+                return None
+            if entry.key_hash == key_hash and entry.key == key:
+                return index
+            index = (index + 1) % capacity
+        return None
+
+    def _robin_hood_insert(self, entry: HashEntry) -> None:
+        """
+        Places an entry whose key is not in the current array into a Robin Hood table: walking from its home
+        bucket, it takes the place of the first entry closer to its own home, which then continues the walk
+        in its stead, until an empty bucket is reached. The array must have an empty bucket.
+
+        Parameter "entry" refers to the entry being placed.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        buckets, capacity = self._buckets, self._capacity
+        index = entry.key_hash % capacity
+        distance = 0
+        while True:
+            resident = buckets[index]
+            if resident is None:
+                buckets[index] = entry
+                return
+            resident_distance = (index - resident.key_hash % capacity) % capacity
+            if resident_distance < distance:                        # Take from the rich: swap and carry on
+                buckets[index] = entry
+                entry, distance = resident, resident_distance
+            index = (index + 1) % capacity
+            distance += 1
+
+    def _robin_hood_add(self, entry: HashEntry) -> None:
+        """
+        Adds an entry for a new key to a Robin Hood table, growing first if it would leave no empty bucket.
+
+        Parameter "entry" refers to the entry being added.
+
+        No return - modifies the underlying hash table.
+        """
+
+        if self._size + 1 >= self._capacity:
+            self._rebuild(2 * self._capacity)
+            self._finish_resize()
+        self._robin_hood_insert(entry)
+        self._size += 1
+        self._mod_count += 1
+
+    def _backward_shift(self, index: int) -> None:
+        """
+        Deletes the entry at an index of a Robin Hood table without a tombstone: the entries after it are
+        shifted back one bucket each until an empty bucket or an entry already in its home bucket.
+
+        Parameter "index" refers to the index of the entry being deleted.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        buckets, capacity = self._buckets, self._capacity
+        next_index = (index + 1) % capacity
+        entry = buckets[next_index]
+        while entry is not None and entry.key_hash % capacity != next_index:
+            buckets[index] = entry
+            index = next_index
+            next_index = (index + 1) % capacity
+            entry = buckets[next_index]
+        buckets[index] = None
 
     def table_load(self) -> float:
         """
@@ -133,14 +413,9 @@ class HashMap:
         in the map's array by the number of buckets in it.
         """
 
-        # Count all array entries, ignoring empty spaces and tombstones
-        key_count = 0
-        for elem in range(self._capacity):
-            if self._buckets[elem]:
-                key_count += 1
-
-        # Calculate the load factor and return it
-        return key_count / self._capacity
+        # Occupied buckets (live entries and tombstones) are tracked incrementally, so no scan is needed.
+        # Mid-resize, entries still waiting in the old array are counted as if they had already moved.
+        return (self._size + self._tombstones) / self._capacity
 
     def empty_buckets(self) -> int:
         """
@@ -151,12 +426,95 @@ class HashMap:
         Returns an integers representing the empty bucket count.
         """
 
-        # Tally the empty buckets in the array
-        empty_buckets = 0
-        for elem in range(self._capacity):
-            if self._buckets[elem] is None:
-                empty_buckets += 1
-        return empty_buckets
+        # Every bucket that holds neither a live entry nor a tombstone is empty
+        return self._capacity - self._size - self._tombstones
+
+    def stats(self) -> dict:
+        """
+        Returns the occupancy statistics of the hash table. All counts are maintained incrementally
+        by put, remove, clear and resize_table, so this costs constant time.
+
+        No parameters.
+
+        Returns a dictionary with the capacity, the live/tombstone/empty bucket counts, the load factor
+        and whether an incremental resize is in progress.
+        """
+
+        return {
+            "capacity": self._capacity,
+            "live": self._size,
+            "tombstones": self._tombstones,
+            "empty": self.empty_buckets(),
+            "load": self.table_load(),
+            "resizing": self._old_buckets is not None,
+        }
+
+    def probe_histogram(self) -> dict:
+        """
+        Counts how many buckets a successful lookup of each live entry visits (1 for an entry in its home
+        bucket). Walks the whole table.
+
+        No parameters.
+
+        Returns a {probe length: entry count} dictionary, in increasing order of length.
+        """
+
+        self._finish_resize()
+        histogram = {}
+        for index in range(self._capacity):
+            entry = self._buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                length = self._probe_length(entry.key_hash, index)
+                histogram[length] = histogram.get(length, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def _probe_length(self, key_hash: int, index: int) -> int:
+        """
+        Returns the number of buckets visited along a hash's probe sequence up to and including an index.
+
+        Parameter "key_hash" refers to the full hash whose probe sequence is followed.
+        Parameter "index" refers to the bucket index being reached.
+        """
+
+        capacity = self._capacity
+        cur_index = key_hash % capacity
+        step, stride = 1, self._probe_stride
+        if self._double_hashing:
+            step = self._double_step(key_hash, capacity)
+        for length in range(1, capacity + 1):
+            if cur_index == index:
+                return length
+            cur_index = (cur_index + step) % capacity
+            step += stride
+        return capacity
+
+    def enable_metrics(self, max_events: int = 1000) -> MapMetrics:
+        """
+        Turns on the map's metrics (see metrics.py): hit/miss counts for get and contains_key, resize events
+        with their durations, and reports with the tombstone count and probe-length histogram.
+
+        Parameter "max_events" refers to the number of most recent resize events kept.
+
+        Returns the map's MapMetrics (the existing one if metrics are already on), for reports and hooks.
+        """
+
+        if self._metrics is None:
+            self._metrics = MapMetrics(self, "probe_lengths", self.probe_histogram, max_events)
+        return self._metrics
+
+    def disable_metrics(self) -> None:
+        """
+        Turns the map's metrics off again, dropping what they collected.
+
+        No parameters.
+        """
+        self._metrics = None
+
+    def get_metrics(self) -> MapMetrics:
+        """
+        Returns the map's MapMetrics, or None if metrics are off.
+        """
+        return self._metrics
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -169,31 +527,169 @@ class HashMap:
         No return - modifies the underlying bucket array (aka the hash map).
         """
 
-        # Track the new capacity, in case it needs to change and mark original map / capacity
-        update_capacity = new_capacity
+        if self._metrics is not None:
+            self._metrics.timed_resize(self._resize_table, new_capacity)
+        else:
+            self._resize_table(new_capacity)
+
+    def _resize_table(self, new_capacity: int) -> None:
+        """
+        Body of resize_table (timed by the metrics when they are enabled).
+
+        Parameter "new_capacity" refers to the new intended capacity for the bucket array.
+
+        No return - modifies the underlying bucket array (aka the hash map).
+        """
+
+        # Finish any incremental resize first so every entry lives in one array
+        self._finish_resize()
+
+        # Mark original map / capacity
         old_map = self._buckets
         old_capacity = self._capacity
 
-        # Filter out impossible capacities
-        if new_capacity < self._capacity - self.empty_buckets():
+        # Filter out impossible capacities (tombstones are not carried over, so only live entries need room)
+        if new_capacity < self._size:
             return
 
-        # Make sure the new capacity is prime; and update it to next prime if not
-        if self._is_prime(new_capacity) is False:
-            update_capacity = self._next_prime(new_capacity)
+        # Make sure the new capacity is prime (or fits the capacity mode); and update it if not
+        update_capacity = self._fit_capacity(new_capacity)
+
+        # Keep doubling (like put would while re-adding the entries) until the live entries fit under max_load
+        size = self._size
+        while size - 1 > self._max_load * update_capacity:
+            update_capacity = self._fit_capacity(2 * update_capacity)
 
         # Create new, empty hash map based on updated capacity and bind it to bucket list / update capacity
-        new_map = DynamicArray()
-        for elem in range(update_capacity):
-            new_map.append(None)                                    # Add null data sets to build desired size array
+        self._mod_count += 1
+        new_map = DynamicArray([None] * update_capacity)           # Null data sets in one allocation, not N appends
         self._buckets = new_map
         self._capacity = update_capacity
-        self._size = 0                                              # Resets size, since we'll add things back
+        self._tombstones = 0                                        # Tombstones are not carried over
+
+        # In incremental mode, leave the old array to be drained a few buckets at a time by later operations
+        if self._rehash_step is not None:
+            self._old_buckets = old_map
+            self._old_capacity = old_capacity
+            self._migrate_index = 0
+
+        # Otherwise move every live entry into the new map using its cached hash, so no key is re-hashed
+        else:
+            for bucket in range(old_capacity):
+                if old_map[bucket] and old_map[bucket].is_tombstone is False:
+                    self._rehash_entry(old_map[bucket])
+
+        # Journal the resize only once every entry is in place: the record may trigger a compaction, which
+        # checkpoints whatever the table holds at that moment
+        if self._journal is not None:
+            self._journal.record('resize_table', update_capacity)
+
+    def _rehash_entry(self, entry: HashEntry) -> None:
+        """
+        Places an existing entry into the bucket array using its cached hash. Keys are unique and a freshly
+        built array has no tombstones, so the entry goes in the first empty bucket on its probe sequence.
+
+        Parameter "entry" refers to the live entry being moved.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        if self._robin_hood:
+            self._robin_hood_insert(entry)
+            return
+
+        # Only a modulo is needed per entry; the same entry object is re-used in the new array
+        cur_index = entry.key_hash % self._capacity
+        step, stride = 1, self._probe_stride
+        if self._double_hashing:
+            step = self._double_step(entry.key_hash, self._capacity)
+        while self._buckets[cur_index] is not None:
+            cur_index = (cur_index + step) % self._capacity
+            step += stride
+        self._buckets[cur_index] = entry
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Rebuilds the table for the automatic triggers (growth in put, tombstone compaction in remove). An
+        in-progress incremental resize is finished first, so the new resize starts from a single array.
+
+        Parameter "new_capacity" refers to the new intended capacity for the bucket array.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        self._finish_resize()
+        self.resize_table(new_capacity)
+
+    def _migrate_step(self, bucket_count: int = None) -> None:
+        """
+        Moves the live entries of the next few buckets of an in-progress incremental resize into the current
+        bucket array, using their cached hashes. Drops the old array once it has been fully drained.
+
+        Parameter "bucket_count" refers to the number of old buckets to migrate (defaults to the rehash step).
+
+        No return - modifies the old and current bucket arrays.
+        """
 
-        # Rehash all elements in old hash map and place in new map based on re-hashed index
-        for bucket in range(old_capacity):
-            if old_map[bucket]:
-                self.put(old_map[bucket].key, old_map[bucket].value)
+        # Determine the range of old buckets to drain on this step
+        if bucket_count is None:
+            bucket_count = self._rehash_step
+        end = min(self._migrate_index + bucket_count, self._old_capacity)
+
+        # Re-home live entries, leaving a tombstone marker behind so old probe chains stay intact
+        for bucket in range(self._migrate_index, end):
+            entry = self._old_buckets[bucket]
+            if entry and entry.is_tombstone is False:
+                self._rehash_entry(entry)
+                self._old_buckets[bucket] = _MIGRATED
+        self._migrate_index = end
+
+        # Release the old array once it has been fully migrated
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_resize(self) -> None:
+        """
+        Completes any in-progress incremental resize, for operations that need every entry in one array.
+
+        No parameters.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate_step(self._old_capacity)
+
+    def _find_old_entry(self, key: str, key_hash: int) -> int:
+        """
+        Looks a key up in the old bucket array of an in-progress incremental resize.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns the index of the key's live entry in the old array, or None if it is not waiting there.
+        """
+
+        index = self._probe(key, key_hash, self._old_buckets, self._old_capacity)
+        if index is not None and self._old_buckets[index] and self._old_buckets[index].is_tombstone is False:
+            return index
+        return None
+
+    def _retire_old_entry(self, key: str, key_hash: int) -> None:
+        """
+        Removes a key's entry from the old bucket array of an in-progress incremental resize, if present.
+
+        Parameter "key" refers to the key being removed.
+        Parameter "key_hash" refers to the key's full hash.
+
+        No return - modifies the old bucket array and the map size.
+        """
+
+        index = self._find_old_entry(key, key_hash)
+        if index is not None:
+            self._old_buckets[index] = _MIGRATED
+            self._size -= 1
+            self._mod_count += 1
 
     def get(self, key: str) -> object:
         """
@@ -204,11 +700,12 @@ class HashMap:
         Returns the object searched for if it was found, None if it was not.
         """
 
-        # Check hashmap for targeted key and return its value if found (and not a tombstone)
-        for bucket in range(self._capacity):
-            if self._buckets[bucket]:
-                if self._buckets[bucket].key == key and self._buckets[bucket].is_tombstone is False:
-                    return self._buckets[bucket].value
+        # Follow the key's probe sequence and return its value if a live entry was found
+        entry = self._find_entry(key)
+        if self._metrics is not None:
+            self._metrics.record_lookup(entry is not None)
+        if entry is not None:
+            return entry.value
 
         # Return None if the key was not found
         return None
@@ -222,14 +719,38 @@ class HashMap:
         Returns True or False depending on whether the key was found.
         """
 
-        # Search the hash map for the key and return True if it was found (and not a tombstone)
-        for bucket in range(self._capacity):
-            if self._buckets[bucket]:
-                if self._buckets[bucket].key == key and self._buckets[bucket].is_tombstone is False:
-                    return True
+        # Follow the key's probe sequence and return True if a live entry was found
+        found = self._find_entry(key) is not None
+        if self._metrics is not None:
+            self._metrics.record_lookup(found)
+        return found
 
-        # Return False if the key was not found
-        return False
+    def _find_entry(self, key: str, key_hash: int = None) -> HashEntry:
+        """
+        Hashes the key once and follows its probe sequence. While an incremental resize is in progress,
+        also migrates a step and falls back to the old bucket array.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash, if the caller already computed it.
+
+        Returns the live entry holding the key, or None if it is not in the hash map.
+        """
+
+        # Move the incremental resize along before looking the key up
+        if key_hash is None:
+            key_hash = self._hash_function(key)
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Check the current array first, then the old one
+        index = self._robin_hood_find(key, key_hash) if self._robin_hood else self._probe(key, key_hash)
+        if index is not None and self._buckets[index] and self._buckets[index].is_tombstone is False:
+            return self._buckets[index]
+        if self._old_buckets is not None:
+            index = self._find_old_entry(key, key_hash)
+            if index is not None:
+                return self._old_buckets[index]
+        return None
 
     def remove(self, key: str) -> None:
         """
@@ -241,40 +762,257 @@ class HashMap:
         No return - modifies the hash map.
         """
 
-        # Note the target key's original hash index and start quadratic probing until key or empty space found
-        og_del_index = self._hash_function(key) % self._capacity
-        del_index = og_del_index
+        self._remove_hashed(key, self._hash_function(key))
+        if self._journal is not None:
+            self._journal.record('remove', key)
 
-        quad_factor = 1
-        while self._buckets[del_index]:
+    def _remove_hashed(self, key: str, key_hash: int) -> None:
+        """
+        Body of remove for callers that already hold the key's full hash.
 
-            # If the key is found (and not already a tomb), set the tombstone flag, reduce size and end iteration
-            if self._buckets[del_index].key == key:
-                if self._buckets[del_index].is_tombstone is True:
-                    return
-                else:
-                    self._buckets[del_index].is_tombstone = True
-                    self._size -= 1
-                    return
+        Parameter "key" is the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
 
-            # Continue iteration otherwise
-            del_index = (og_del_index + quad_factor**2) % self._capacity
-            quad_factor += 1
+        No return - modifies the hash map.
+        """
 
-    def clear(self) -> None:
+        # Move an in-progress incremental resize along
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Follow the key's probe sequence; tombstones are stepped over, so only a live match is returned
+        index = self._robin_hood_find(key, key_hash) if self._robin_hood else self._probe(key, key_hash)
+
+        # If the key is found (and not already a tomb), set the tombstone flag (or shift its run back over it
+        # in a Robin Hood table) and reduce size
+        if index is not None and self._buckets[index] and self._buckets[index].is_tombstone is False:
+            if self._robin_hood:
+                self._backward_shift(index)
+            else:
+                self._buckets[index].is_tombstone = True
+                self._tombstones += 1
+            self._size -= 1
+            self._mod_count += 1
+
+            # Give memory back once the table has emptied out past the low-water mark (which also clears the
+            # tombstones); otherwise, under delete-heavy churn, rehash in place once tombstones pass the threshold
+            if self._shrink_load is not None and self._size < self._shrink_load * self._capacity:
+                self._shrink()
+            elif self._tombstone_ratio is not None and self._tombstones > self._tombstone_ratio * self._capacity:
+                self._rebuild(self._capacity)
+
+        # Mid-resize, the key may still be waiting in the old array
+        elif self._old_buckets is not None:
+            self._retire_old_entry(key, key_hash)
+            if self._shrink_load is not None and self._size < self._shrink_load * self._capacity:
+                self._shrink()
+
+    def _shrink(self) -> None:
         """
-        Clears the contents of the hash map without changing capacity.
+        Applies the shrink policy: rebuilds the table so that its load factor is twice the low-water mark, but
+        never below the initial capacity. The gap between that load and the max_load growth threshold is the
+        hysteresis that keeps alternating removes and puts from resizing the table back and forth.
 
         No parameters.
 
+        No return - modifies the underlying bucket array.
+        """
+
+        target = self._fit_capacity(max(int(self._size / (2 * self._shrink_load)) + 1, self._min_capacity))
+        if target < self._capacity:
+            self._rebuild(target)
+        elif self._tombstone_ratio is not None and self._tombstones > self._tombstone_ratio * self._capacity:
+            self._rebuild(self._capacity)                           # Already at the floor, so just compact
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds or updates many key/value pairs at once. All keys are hashed in one batch, the table is grown
+        once up front to fit every pair under the max_load load factor, and the pairs are then written without
+        per-put load checks.
+
+        Parameter "pairs" refers to an iterable or DynamicArray of (key, value) tuples.
+
+        No return - modifies the underlying hash table.
+        """
+
+        # Hash every key in one batch
+        pairs = as_list(pairs)
+        key_hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+
+        # Presize once (as if every key were new) and make sure all entries live in a single array
+        self._finish_resize()
+        if (self._size + self._tombstones + len(pairs)) / self._capacity > self._max_load:
+            self.resize_table(int((self._size + len(pairs)) / self._max_load) + 1)
+            self._finish_resize()
+
+        # Write the pairs without any further load checks
+        for index in range(len(pairs)):
+            self._store(pairs[index][0], key_hashes[index], pairs[index][1])
+        if self._journal is not None:
+            self._journal.record('put_many', pairs)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Looks up many keys at once, hashing them all in one batch.
+
+        Parameter "keys" refers to an iterable or DynamicArray of keys.
+
+        Returns a dynamic array holding each key's value (None for missing keys), in order.
+        """
+
+        keys = as_list(keys)
+        key_hashes = hash_many(self._hash_function, keys)
+        values = DynamicArray()
+        for index in range(len(keys)):
+            entry = self._find_entry(keys[index], key_hashes[index])
+            if self._metrics is not None:
+                self._metrics.record_lookup(entry is not None)
+            values.append(None if entry is None else entry.value)
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes many keys at once, hashing them all in one batch. Missing keys are ignored.
+
+        Parameter "keys" refers to an iterable or DynamicArray of keys.
+
+        No return - modifies the hash map.
+        """
+
+        keys = as_list(keys)
+        key_hashes = hash_many(self._hash_function, keys)
+        for index in range(len(keys)):
+            self._remove_hashed(keys[index], key_hashes[index])
+        if self._journal is not None:
+            self._journal.record('remove_many', keys)
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds to the value stored for a key in a single probe, starting from 0 if the key is new.
+
+        Parameter "key" refers to the key being updated.
+        Parameter "delta" refers to the amount added to the key's value.
+
+        Returns the key's new value.
+        """
+
+        entry = self._upsert_entry(key, self._hash_function(key), 0)
+        entry.value += delta
+        if self._journal is not None:
+            self._journal.record('put', key, entry.value)
+        return entry.value
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value stored for a key, first storing the default if the key is new (single probe).
+
+        Parameter "key" refers to the key being looked up.
+        Parameter "default" refers to the value stored if the key is not in the hash map.
+
+        Returns the key's value.
+        """
+
+        entry = self._upsert_entry(key, self._hash_function(key), default)
+        if self._journal is not None:
+            self._journal.record('put', key, entry.value)
+        return entry.value
+
+    def update_with(self, key: str, function: callable, default: object = None) -> object:
+        """
+        Replaces the value stored for a key with function(value) in a single probe. A new key starts from
+        the default, so it is stored as function(default).
+
+        Parameter "key" refers to the key being updated.
+        Parameter "function" refers to the callable computing the new value from the current one.
+        Parameter "default" refers to the value passed to the function if the key is new.
+
+        Returns the key's new value.
+        """
+
+        entry = self._upsert_entry(key, self._hash_function(key), default)
+        entry.value = function(entry.value)
+        if self._journal is not None:
+            self._journal.record('put', key, entry.value)
+        return entry.value
+
+    def _upsert_entry(self, key: str, key_hash: int, default: object) -> HashEntry:
+        """
+        Single-probe engine behind increment, setdefault and update_with. Finds the key's live entry, or
+        inserts a new entry holding the default in the first reusable bucket of the same probe sequence.
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "default" refers to the value of a newly inserted entry.
+
+        Returns the key's entry, whose value the caller may update in place.
+        """
+
+        # Same bookkeeping as put: move an incremental resize along and grow if the load is too high and the key
+        # is new
+        if self._old_buckets is not None:
+            self._migrate_step()
+        if self.table_load() > self._max_load and self._find_entry(key, key_hash) is None:
+            self._rebuild(2 * self._capacity)
+
+        # Mid-resize, a key still waiting in the old array carries its value over into the current one
+        if self._old_buckets is not None:
+            old_index = self._find_old_entry(key, key_hash)
+            if old_index is not None:
+                default = self._old_buckets[old_index].value
+                self._retire_old_entry(key, key_hash)
+
+        # Robin Hood tables find the key or displace their way to a free bucket
+        if self._robin_hood:
+            index = self._robin_hood_find(key, key_hash)
+            if index is not None:
+                return self._buckets[index]
+            entry = HashEntry(key, default, key_hash)
+            self._robin_hood_add(entry)
+            return entry
+
+        # Follow the key's probe sequence to either its live entry or the first reusable bucket
+        index = self._probe(key, key_hash)
+        if index is None:                                           # Probe sequence exhausted, so grow and retry
+            self._rebuild(2 * self._capacity)
+            self._finish_resize()
+            return self._upsert_entry(key, key_hash, default)
+        if self._buckets[index] and self._buckets[index].is_tombstone is False:
+            return self._buckets[index]
+
+        # Insert a new entry for the key, re-using a tombstone slot if that is where the probe stopped
+        if self._buckets[index]:
+            self._tombstones -= 1
+        entry = HashEntry(key, default, key_hash)
+        self._buckets[index] = entry
+        self._size += 1
+        self._mod_count += 1
+        return entry
+
+    def clear(self, shrink_to: int = None) -> None:
+        """
+        Clears the contents of the hash map without changing capacity, unless asked to shrink it.
+
+        Parameter "shrink_to" refers to the capacity to continue with (made prime like resize_table), so a
+        purged table stops carrying its old bucket array. Defaults to the initial capacity when a shrink policy
+        is set, and to the current capacity otherwise.
+
         No return - modifies the underlying dynamic array.
         """
 
-        # Re-create an empty bucket array with the same capacity and reset size
-        self._buckets = DynamicArray()
-        for elem in range(self._capacity):
-            self._buckets.append(None)
+        # Pick the capacity to continue with
+        if shrink_to is None and self._shrink_load is not None:
+            shrink_to = self._min_capacity
+        if shrink_to is not None and shrink_to >= 1:
+            self._capacity = self._fit_capacity(shrink_to)
+
+        # Re-create an empty bucket array in one allocation and reset size (dropping any in-progress resize)
+        self._old_buckets = None
+        self._buckets = DynamicArray([None] * self._capacity)
         self._size = 0
+        self._tombstones = 0
+        self._mod_count += 1
+        if self._journal is not None:
+            self._journal.record('clear', *(() if shrink_to is None else (shrink_to,)))
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -285,13 +1023,129 @@ class HashMap:
         Returns a dynamic array consisting of key/value tuples.
         """
 
-        # Create the new array to be returned
+        # Create the new array to be returned, then copy every pair into it (see items for a lazy alternative)
         key_val_array = DynamicArray()
-
-        # Rehash all elements in old hash map and place in new map based on re-hashed index
-        for bucket in range(self._capacity):
-            if self._buckets[bucket] and self._buckets[bucket].is_tombstone is False:
-                key_val_array.append((self._buckets[bucket].key, self._buckets[bucket].value))
+        for pair in self.items():
+            key_val_array.append(pair)
 
         # Returns the new array
         return key_val_array
+
+    def __len__(self) -> int:
+        """
+        Return size of map (supports len(map))
+        """
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map (supports for key in map)
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        Lazily yields every key in the hash map, walking the buckets in place instead of copying them.
+
+        No parameters.
+
+        Returns a generator of keys. Raises RuntimeError if the map is modified during iteration.
+        """
+
+        for entry in self._iter_entries():
+            yield entry.key
+
+    def values(self):
+        """
+        Lazily yields every value in the hash map, walking the buckets in place instead of copying them.
+
+        No parameters.
+
+        Returns a generator of values. Raises RuntimeError if the map is modified during iteration.
+        """
+
+        for entry in self._iter_entries():
+            yield entry.value
+
+    def items(self):
+        """
+        Lazily yields every key/value pair in the hash map, walking the buckets in place instead of copying them.
+
+        No parameters.
+
+        Returns a generator of key/value tuples. Raises RuntimeError if the map is modified during iteration.
+        """
+
+        for entry in self._iter_entries():
+            yield entry.key, entry.value
+
+    def _iter_entries(self):
+        """
+        Generator engine behind the iteration views. Finishes any incremental resize, then walks the bucket
+        array, checking the modification count each time the consumer resumes. Any insert, removal, clear or
+        resize since the walk started raises instead of skipping or repeating entries; overwriting the value
+        of an existing key (put, increment, update_with) is allowed.
+
+        No parameters.
+
+        Returns a generator of the map's live entries.
+        """
+
+        # Gather every entry into one array, then note the modification count the walk relies on
+        self._finish_resize()
+        mod_count = self._mod_count
+        buckets = self._buckets
+        for bucket in range(self._capacity):
+            entry = buckets[bucket]
+            if entry and entry.is_tombstone is False:
+                yield entry
+                if self._mod_count != mod_count:
+                    raise RuntimeError("HashMap modified during iteration")
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map to a binary snapshot file (see snapshot.py) that load can bring back without
+        re-inserting every key. Tombstones are kept so that saved probe sequences stay intact.
+
+        Parameter "path" refers to the destination file.
+
+        No return - creates or replaces the file. Raises ValueError if the hash function is not registered
+        as stable across processes (see snapshot.register_hash_function).
+        """
+
+        if self._capacity_mode == "pow2" or self._probing != "quadratic":
+            raise ValueError("Snapshots need quadratic probing over a prime capacity")
+        self._finish_resize()
+        buckets = self._buckets
+        records = ((index, LIVE, buckets[index].key, buckets[index].value, buckets[index].key_hash)
+                   if buckets[index].is_tombstone is False else (index, TOMBSTONE, None, None, 0)
+                   for index in range(self._capacity) if buckets[index] is not None)
+        write_snapshot(path, KIND_OA, self._capacity, self._size, self._hash_function, records)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, function: callable = None):
+        """
+        Loads a snapshot written by save.
+
+        Parameter "path" refers to the snapshot file.
+        Parameter "mmap" refers to whether lookups are served straight from the memory-mapped file (a read-only
+        SnapshotView, ready in constant time) instead of rebuilding an in-memory HashMap.
+        Parameter "function" refers to the hash function to use instead of the registered one saved by name.
+
+        Returns a SnapshotView (mmap True) or a HashMap (mmap False).
+        """
+
+        view = SnapshotView(path, function)
+        if view.get_kind() != KIND_OA:
+            view.close()
+            raise ValueError(f"{path!r} is not an open addressing snapshot")
+        if mmap:
+            return view
+
+        # Rebuild without re-hashing or probing for duplicates: every live entry goes to its first empty bucket
+        with view:
+            map = cls(view.get_capacity(), view.get_hash_function())
+            for key, value, key_hash in view.entries():
+                map._rehash_entry(HashEntry(key, value, key_hash))
+            map._size = view.get_size()
+        return map
@@ -0,0 +1,354 @@
+# Description:  Compact storage backend for the open address hash map. Keeps keys, values, cached hashes and slot
+#               states in parallel preallocated arrays (states in a bytearray) instead of one HashEntry object per
+#               bucket, and updates existing keys in place. Provides the baseline API of public_hash_map_oa.HashMap
+#               (put, get, contains_key, remove, resize_table, clear, the load/slot counts, stats and the iteration
+#               views) with the same probing and resize behavior; the bulk, upsert, journal, snapshot and metrics
+#               extensions are only on the HashEntry-based map.
+
+
+from HashMap.a6_include import DynamicArray
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+
+
+# Slot states held in the bytearray
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, tombstone_ratio: float = 0.25) -> None:
+        """
+        Initialize new compact HashMap that uses
+        quadratic probing for collision resolution
+
+        Parameter "tombstone_ratio" refers to the fraction of buckets that may hold tombstones before
+        remove compacts the table in place (None disables compaction).
+        """
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0                                        # Slot counts: live = size, empty = the rest
+        self._tombstone_ratio = tombstone_ratio
+        self._mod_count = 0                                         # Bumped by changes that move slots (see keys)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the HashEntry-based map (except that tombstones
+        no longer hold the removed key and value)
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                slot = 'None'
+            else:
+                slot = f"K: {self._keys[i]} V: {self._values[i]} TS: {self._states[i] == _TOMBSTONE}"
+            out += str(i) + ': ' + slot + '\n'
+        return out
+
+    # Capacity selection is shared with the HashEntry-based map
+    _next_prime = OAHashMap._next_prime
+    _is_prime = staticmethod(OAHashMap._is_prime)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Binds a fresh set of parallel slot arrays, all in the empty state.
+
+        Parameter "capacity" refers to the number of slots to allocate.
+
+        No return - replaces the underlying slot arrays.
+        """
+
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._states = bytearray(capacity)
+
+    def _probe(self, key: str, key_hash: int) -> int:
+        """
+        Walks the key's quadratic probe sequence (og_index + i**2), stepping over tombstones and stopping at
+        the first empty slot.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns the index of the live slot holding the key if it was found. Otherwise, returns the index
+        of the first reusable slot (tombstone or empty) on the key's probe sequence, or None if the
+        sequence was exhausted without finding one.
+        """
+
+        # Bind the arrays locally; the loop below is the hot path for every operation
+        states, hashes, keys, capacity = self._states, self._hashes, self._keys, self._capacity
+        og_index = key_hash % capacity
+        cur_index = og_index
+        reuse_index = None
+        quad_factor = 1
+        for _ in range(capacity):
+            state = states[cur_index]
+            if state == _EMPTY:
+                return cur_index if reuse_index is None else reuse_index
+
+            # Remember the first tombstone for re-use, but keep going in case the key lives further along
+            if state == _TOMBSTONE:
+                if reuse_index is None:
+                    reuse_index = cur_index
+            elif hashes[cur_index] == key_hash and keys[cur_index] == key:
+                return cur_index
+
+            # Continue iteration otherwise
+            cur_index = (og_index + quad_factor**2) % capacity
+            quad_factor += 1
+
+        # No empty slot was reached; fall back to the first tombstone seen (if any)
+        return reuse_index
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates a key/value pair in the hash map. Adds the pair if it doesn't exist.
+        Replaces the old value for the key in place if it already exists.
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "value" refers to the value paired with the input key.
+
+        No return value - modifies the underlying slot arrays.
+        """
+
+        # Hash the key once and follow its probe sequence to either its live slot or the first reusable one
+        key_hash = self._hash_function(key)
+        index = self._probe(key, key_hash)
+
+        # Over-write the value in place if the key was found (adding no entry, so the table never grows here)
+        if index is not None and self._states[index] == _LIVE:
+            self._values[index] = value
+            return
+
+        # Resize the arrays if load factor is > 0.5 or the probe sequence was exhausted (double -> prime), then retry
+        if index is None or (self._size + self._tombstones) / self._capacity > 0.5:
+            self.resize_table(2 * self._capacity)
+            self.put(key, value)
+            return
+        state = self._states[index]
+
+        # Otherwise fill the vacant/tombstone slot and increase the map size
+        if state == _TOMBSTONE:
+            self._tombstones -= 1
+        self._keys[index] = key
+        self._values[index] = value
+        self._hashes[index] = key_hash
+        self._states[index] = _LIVE
+        self._size += 1
+        self._mod_count += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table's load factor (live slots and tombstones over capacity) as a float.
+
+        No parameters.
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots in the hash table.
+
+        No parameters.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def stats(self) -> dict:
+        """
+        Returns the occupancy statistics of the hash table in constant time.
+
+        No parameters.
+
+        Returns a dictionary with the capacity, the live/tombstone/empty slot counts and the load factor.
+        """
+
+        return {
+            "capacity": self._capacity,
+            "live": self._size,
+            "tombstones": self._tombstones,
+            "empty": self.empty_buckets(),
+            "load": self.table_load(),
+        }
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes the slot arrays. Moves all existing key/value pairs using their cached hashes. If the argument
+        capacity is not prime, sets capacity to the next highest prime number instead.
+
+        Parameter "new_capacity" refers to the new intended capacity for the slot arrays.
+
+        No return - modifies the underlying slot arrays.
+        """
+
+        # Filter out impossible capacities (tombstones are not carried over, so only live entries need room)
+        if new_capacity < self._size:
+            return
+
+        # Make sure the new capacity is prime, then keep doubling until the live entries fit under 0.5 load
+        update_capacity = new_capacity
+        if self._is_prime(new_capacity) is False:
+            update_capacity = self._next_prime(new_capacity)
+        while self._size - 1 > 0.5 * update_capacity:
+            update_capacity = self._next_prime(2 * update_capacity)
+
+        # Swap in fresh arrays, keeping the old ones to move the live slots out of
+        old_keys, old_values, old_hashes, old_states = self._keys, self._values, self._hashes, self._states
+        old_capacity = self._capacity
+        self._mod_count += 1
+        self._allocate(update_capacity)
+        self._capacity = update_capacity
+        self._tombstones = 0                                        # Tombstones are not carried over
+
+        # Place every live slot at the first empty slot on its probe sequence (keys are unique)
+        keys, values, hashes, states = self._keys, self._values, self._hashes, self._states
+        for old_index in range(old_capacity):
+            if old_states[old_index] != _LIVE:
+                continue
+            key_hash = old_hashes[old_index]
+            og_index = key_hash % update_capacity
+            cur_index = og_index
+            quad_factor = 1
+            while states[cur_index] != _EMPTY:
+                cur_index = (og_index + quad_factor**2) % update_capacity
+                quad_factor += 1
+            keys[cur_index] = old_keys[old_index]
+            values[cur_index] = old_values[old_index]
+            hashes[cur_index] = key_hash
+            states[cur_index] = _LIVE
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with a given key, and None if it is not in the hash map.
+
+        Parameter "key" refers to the key being searched for.
+        """
+
+        index = self._probe(key, self._hash_function(key))
+        if index is not None and self._states[index] == _LIVE:
+            return self._values[index]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the hash map contains a key and False if it does not.
+
+        Parameter "key" is the key being searched for.
+        """
+
+        index = self._probe(key, self._hash_function(key))
+        return index is not None and self._states[index] == _LIVE
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the targeted key and its value from the hash map by marking its slot as a tombstone.
+        Does nothing if key doesn't exist.
+
+        Parameter "key" is the key being searched for.
+        """
+
+        index = self._probe(key, self._hash_function(key))
+        if index is not None and self._states[index] == _LIVE:
+            self._states[index] = _TOMBSTONE
+            self._keys[index] = None                                # Don't keep the removed objects alive
+            self._values[index] = None
+            self._size -= 1
+            self._tombstones += 1
+            self._mod_count += 1
+
+            # Under delete-heavy churn, rehash in place once tombstones pass the threshold to keep probes short
+            if self._tombstone_ratio is not None and self._tombstones > self._tombstone_ratio * self._capacity:
+                self.resize_table(self._capacity)
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map without changing capacity.
+
+        No parameters.
+        """
+
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+        self._mod_count += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a key/value pair tuple stored in the hash map.
+
+        No parameter.
+        """
+
+        key_val_array = DynamicArray()
+        for pair in self.items():
+            key_val_array.append(pair)
+        return key_val_array
+
+    def __len__(self) -> int:
+        """
+        Return size of map (supports len(map))
+        """
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map (supports for key in map)
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        Lazily yields every key in the hash map. Raises RuntimeError if the map is modified during iteration.
+        """
+        for index in self._iter_live():
+            yield self._keys[index]
+
+    def values(self):
+        """
+        Lazily yields every value in the hash map. Raises RuntimeError if the map is modified during iteration.
+        """
+        for index in self._iter_live():
+            yield self._values[index]
+
+    def items(self):
+        """
+        Lazily yields every key/value pair in the hash map. Raises RuntimeError if the map is modified during
+        iteration.
+        """
+        for index in self._iter_live():
+            yield self._keys[index], self._values[index]
+
+    def _iter_live(self):
+        """
+        Generator engine behind the iteration views, with the same modification check as the HashEntry-based
+        map (overwriting the value of an existing key is allowed).
+
+        No parameters.
+
+        Returns a generator of the indices of the live slots.
+        """
+
+        mod_count = self._mod_count
+        states = self._states
+        for index in range(self._capacity):
+            if states[index] == _LIVE:
+                yield index
+                if self._mod_count != mod_count:
+                    raise RuntimeError("HashMap modified during iteration")
@@ -0,0 +1,518 @@
+# Description:  Disk-backed variant of the open address hash map for key sets larger than memory. The bucket array
+#               is a file of fixed-size slots (the snapshot slot layout: state, key/value lengths, full hash and a
+#               record offset) that is memory-mapped read/write, and every key/value record is appended to a value
+#               log that the slots point into. Probing, tombstones and the 0.5 load factor match
+#               public_hash_map_oa.HashMap; resizing (and clearing) rewrites both files into a new generation,
+#               which is also how the log drops the dead records left behind by overwrites and removals.
+
+
+import mmap
+import os
+import pickle
+import struct
+
+from HashMap.a6_include import DynamicArray
+from HashMap.hash_functions import fnv1a_hash
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+from HashMap.snapshot import _SLOT, EMPTY, LIVE, TOMBSTONE, _decode_key, _encode_key, stable_hash_name
+
+
+_MAGIC = b'HMDISK\x00\x01'
+_HEADER = struct.Struct('<8sQQQQ64s')       # magic, capacity, size, tombstones, log generation, hash function name
+_MAX_HASH = 1 << 64
+_PICKLE_PROTOCOL = 4
+_MIN_COLLECTED_LOG = 1 << 16                # Smaller logs are never rewritten just to drop dead records
+
+
+class HashMap:
+    def __init__(self, path: str, capacity: int = 11, function: callable = fnv1a_hash,
+                 tombstone_ratio: float = 0.25, garbage_ratio: float = 0.5) -> None:
+        """
+        Open (or create) a disk-backed HashMap that uses
+        quadratic probing for collision resolution
+
+        Parameter "path" refers to the bucket file. Records live next to it in "<path>.<generation>.log".
+        Parameter "capacity" refers to the initial capacity of a new map (an existing map keeps its own).
+        Parameter "function" refers to the hash function, which must be registered as stable across processes
+        (see snapshot.register_hash_function) and match the one an existing map was created with.
+        Parameter "tombstone_ratio" refers to the fraction of buckets that may hold tombstones before
+        remove compacts the files (None disables compaction).
+        Parameter "garbage_ratio" refers to the fraction of the value log that may be dead records (overwritten
+        or removed) before put/remove rewrite the files to reclaim it; logs under 64 KiB are left alone (None
+        only reclaims on resize and clear).
+        """
+
+        self._path = path
+        self._hash_function = function
+        self._function_name = stable_hash_name(function)
+        self._tombstone_ratio = tombstone_ratio
+        self._garbage_ratio = garbage_ratio
+        self._mod_count = 0                                         # Bumped by changes that move slots (see keys)
+
+        # capacity must be a prime number; a new map starts as an all-empty bucket file and an empty log
+        if not os.path.exists(path):
+            self._create(path, self._next_prime(capacity), 0)
+        self._open()
+        if self._stored_name != self._function_name:
+            self.close()
+            raise ValueError(f"{path!r} was created with hash function {self._stored_name!r}")
+
+    def __enter__(self) -> "HashMap":
+        """Support use as a context manager that closes the files on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the files on leaving a with block."""
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the in-memory map
+        """
+        out = ''
+        for i in range(self._capacity):
+            state, key_length, value_length, _, data = self._slot(i)
+            if state == EMPTY:
+                slot = 'None'
+            else:
+                record = self._read_log(data, key_length + value_length)
+                slot = (f"K: {_decode_key(record[:key_length])} V: {pickle.loads(record[key_length:])} "
+                        f"TS: {state == TOMBSTONE}")
+            out += str(i) + ': ' + slot + '\n'
+        return out
+
+    # Capacity selection is shared with the in-memory map
+    _next_prime = OAHashMap._next_prime
+    _is_prime = staticmethod(OAHashMap._is_prime)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def _log_path(self, generation: int) -> str:
+        """
+        Return the path of the value log of a given file generation
+        """
+        return f"{self._path}.{generation}.log"
+
+    def _create(self, path: str, capacity: int, generation: int) -> None:
+        """
+        Creates an all-empty bucket file (slots are zero bytes, i.e. EMPTY) and an empty value log.
+
+        Parameter "path" refers to the bucket file being created.
+        Parameter "capacity" refers to its number of slots.
+        Parameter "generation" refers to the generation of the log it points at.
+
+        No return - creates the files.
+        """
+
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, capacity, 0, 0, generation, self._function_name.encode('utf-8')))
+            file.truncate(_HEADER.size + _SLOT.size * capacity)
+        open(self._log_path(generation), 'wb').close()
+
+    def _open(self) -> None:
+        """
+        Maps the bucket file and opens the value log it points at, reading the counters from the header.
+
+        No parameters.
+
+        No return - binds the open files.
+        """
+
+        self._file = open(self._path, 'r+b')
+        self._buckets = mmap.mmap(self._file.fileno(), 0)
+        magic, self._capacity, self._size, self._tombstones, self._generation, name = \
+            _HEADER.unpack_from(self._buckets, 0)
+        if magic != _MAGIC:
+            self._buckets.close()
+            self._file.close()
+            raise ValueError(f"{self._path!r} is not a disk-backed hash map")
+        self._stored_name = name.rstrip(b'\x00').decode('utf-8')
+        self._log = open(self._log_path(self._generation), 'r+b')
+        self._log_end = self._log.seek(0, os.SEEK_END)
+
+        # Bytes of the log that no live slot points at (records of overwritten or removed keys)
+        live_bytes = 0
+        for index in range(self._capacity):
+            state, key_length, value_length, _, _ = self._slot(index)
+            if state == LIVE:
+                live_bytes += key_length + value_length
+        self._dead_bytes = self._log_end - live_bytes
+
+    def _write_header(self) -> None:
+        """
+        Stores the current counters in the bucket file's header.
+        """
+        _HEADER.pack_into(self._buckets, 0, _MAGIC, self._capacity, self._size, self._tombstones, self._generation,
+                          self._function_name.encode('utf-8'))
+
+    def flush(self) -> None:
+        """
+        Forces every change so far out to disk.
+
+        No parameters.
+        """
+
+        self._buckets.flush()
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def close(self) -> None:
+        """
+        Flushes and closes the bucket file and value log.
+
+        No parameters.
+        """
+
+        if self._buckets.closed:
+            return
+        self.flush()
+        self._buckets.close()
+        self._file.close()
+        self._log.close()
+
+    def _slot(self, index: int) -> tuple:
+        """
+        Return the (state, key length, value length, full hash, record offset) of a slot
+        """
+        return _SLOT.unpack_from(self._buckets, _HEADER.size + _SLOT.size * index)
+
+    def _read_log(self, offset: int, length: int) -> bytes:
+        """
+        Return a byte range of the value log
+        """
+        self._log.seek(offset)
+        return self._log.read(length)
+
+    def _append_log(self, record: bytes) -> int:
+        """
+        Appends a record to the value log.
+
+        Parameter "record" refers to the encoded key followed by the pickled value.
+
+        Returns the record's offset in the log.
+        """
+
+        offset = self._log_end
+        self._log.seek(offset)
+        self._log.write(record)
+        self._log_end += len(record)
+        return offset
+
+    def _probe(self, key: object, key_hash: int) -> int:
+        """
+        Walks the key's quadratic probe sequence (og_index + i**2) over the mapped slots, stepping over
+        tombstones and stopping at the first empty slot. Full hashes are compared first, so the log is only
+        read to confirm a key on a hash match.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns the index of the live slot holding the key if it was found. Otherwise, returns the index
+        of the first reusable slot (tombstone or empty) on the key's probe sequence, or None if the
+        sequence was exhausted without finding one.
+        """
+
+        buckets, capacity = self._buckets, self._capacity
+        key_bytes = None
+        og_index = key_hash % capacity
+        cur_index = og_index
+        reuse_index = None
+        quad_factor = 1
+        for _ in range(capacity):
+            offset = _HEADER.size + _SLOT.size * cur_index
+            state, key_length, _, slot_hash, data = _SLOT.unpack_from(buckets, offset)
+            if state == EMPTY:
+                return cur_index if reuse_index is None else reuse_index
+
+            # Remember the first tombstone for re-use, but keep going in case the key lives further along
+            if state == TOMBSTONE:
+                if reuse_index is None:
+                    reuse_index = cur_index
+            elif slot_hash == key_hash:
+                if key_bytes is None:
+                    key_bytes = _encode_key(key)
+                if key_length == len(key_bytes) and self._read_log(data, key_length) == key_bytes:
+                    return cur_index
+
+            # Continue iteration otherwise
+            cur_index = (og_index + quad_factor**2) % capacity
+            quad_factor += 1
+
+        # No empty slot was reached; fall back to the first tombstone seen (if any)
+        return reuse_index
+
+    def _hash(self, key: object) -> int:
+        """
+        Return the key's full hash, which has to fit in a slot's 64 bits
+        """
+        key_hash = self._hash_function(key)
+        if not 0 <= key_hash < _MAX_HASH:
+            raise ValueError(f"Hash of key {key!r} does not fit in 64 bits")
+        return key_hash
+
+    def put(self, key: object, value: object) -> None:
+        """
+        Updates a key/value pair in the hash map. Adds the pair if it doesn't exist.
+        Appends the new record to the value log and points the key's slot at it; the old record of an
+        existing key is left in the log until the next rewrite (see garbage_ratio).
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "value" refers to the value paired with the input key.
+
+        No return value - modifies the bucket file and value log.
+        """
+
+        # Hash the key once and follow its probe sequence to either its live slot or the first reusable one
+        key_hash = self._hash(key)
+        index = self._probe(key, key_hash)
+
+        # A new key resizes the files if load factor is > 0.5 or the probe sequence was exhausted (double -> prime)
+        if index is None or (self._slot(index)[0] != LIVE and (self._size + self._tombstones) / self._capacity > 0.5):
+            self.resize_table(2 * self._capacity)
+            self.put(key, value)
+            return
+
+        # Append the record, then fill the slot (a new key also updates the counters)
+        key_bytes = _encode_key(key)
+        value_bytes = pickle.dumps(value, _PICKLE_PROTOCOL)
+        data = self._append_log(key_bytes + value_bytes)
+        state, old_key_length, old_value_length, _, _ = self._slot(index)
+        if state == LIVE:
+            self._dead_bytes += old_key_length + old_value_length
+        else:
+            if state == TOMBSTONE:
+                self._tombstones -= 1
+            self._size += 1
+            self._mod_count += 1
+        _SLOT.pack_into(self._buckets, _HEADER.size + _SLOT.size * index, LIVE, len(key_bytes), len(value_bytes),
+                        key_hash, data)
+        self._write_header()
+        self._collect_garbage()
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table's load factor (live slots and tombstones over capacity) as a float.
+
+        No parameters.
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots in the hash table.
+
+        No parameters.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes the bucket file by rewriting the map into a new generation of files, placing every live slot
+        by its cached hash and copying only live records into the new value log (which drops overwritten
+        records). If the argument capacity is not prime, sets capacity to the next highest prime number instead.
+
+        Parameter "new_capacity" refers to the new intended capacity for the bucket file.
+
+        No return - replaces the bucket file and value log.
+        """
+
+        # Filter out impossible capacities (tombstones are not carried over, so only live entries need room)
+        if new_capacity < self._size:
+            return
+
+        # Make sure the new capacity is prime, then keep doubling until the live entries fit under 0.5 load
+        update_capacity = new_capacity
+        if self._is_prime(new_capacity) is False:
+            update_capacity = self._next_prime(new_capacity)
+        while self._size - 1 > 0.5 * update_capacity:
+            update_capacity = self._next_prime(2 * update_capacity)
+
+        self._rewrite(update_capacity, True)
+
+    def _rewrite(self, capacity: int, keep_entries: bool) -> None:
+        """
+        Writes the map into a new generation of files and swaps them in. The new bucket file only replaces
+        the old one once it and its log are complete, so a crash mid-rewrite leaves the old generation intact.
+
+        Parameter "capacity" refers to the capacity of the new bucket file.
+        Parameter "keep_entries" refers to whether live entries are carried over (False clears the map).
+
+        No return - replaces the bucket file and value log.
+        """
+
+        generation = self._generation + 1
+        temp_path = self._path + '.tmp'
+        self._create(temp_path, capacity, generation)
+        size = 0
+        with open(temp_path, 'r+b') as file, open(self._log_path(generation), 'r+b') as log:
+            buckets = mmap.mmap(file.fileno(), 0)
+
+            # Copy each live record into the new log and its slot to the first empty slot on its probe sequence
+            log_end = 0
+            for index in range(self._capacity if keep_entries else 0):
+                state, key_length, value_length, key_hash, data = self._slot(index)
+                if state != LIVE:
+                    continue
+                log.write(self._read_log(data, key_length + value_length))
+                og_index = key_hash % capacity
+                cur_index = og_index
+                quad_factor = 1
+                while buckets[_HEADER.size + _SLOT.size * cur_index] != EMPTY:
+                    cur_index = (og_index + quad_factor**2) % capacity
+                    quad_factor += 1
+                _SLOT.pack_into(buckets, _HEADER.size + _SLOT.size * cur_index, LIVE, key_length, value_length,
+                                key_hash, log_end)
+                log_end += key_length + value_length
+                size += 1
+
+            _HEADER.pack_into(buckets, 0, _MAGIC, capacity, size, 0, generation, self._function_name.encode('utf-8'))
+            buckets.flush()
+            buckets.close()
+            log.flush()
+            os.fsync(log.fileno())
+
+        # Swapping in the bucket file is the commit point: it names the new generation's log
+        old_log = self._log_path(self._generation)
+        self.close()
+        os.replace(temp_path, self._path)
+        os.remove(old_log)
+        self._open()
+        self._mod_count += 1
+
+    def get(self, key: object) -> object:
+        """
+        Returns the value associated with a given key, and None if it is not in the hash map.
+
+        Parameter "key" refers to the key being searched for.
+        """
+
+        index = self._probe(key, self._hash(key))
+        if index is None:
+            return None
+        state, key_length, value_length, _, data = self._slot(index)
+        if state != LIVE:
+            return None
+        return pickle.loads(self._read_log(data + key_length, value_length))
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Returns True if the hash map contains a key and False if it does not.
+
+        Parameter "key" is the key being searched for.
+        """
+
+        index = self._probe(key, self._hash(key))
+        return index is not None and self._slot(index)[0] == LIVE
+
+    def remove(self, key: object) -> None:
+        """
+        Removes the targeted key and its value from the hash map by marking its slot as a tombstone.
+        Does nothing if key doesn't exist.
+
+        Parameter "key" is the key being searched for.
+        """
+
+        index = self._probe(key, self._hash(key))
+        if index is None:
+            return
+        state, key_length, value_length, _, _ = self._slot(index)
+        if state == LIVE:
+            self._buckets[_HEADER.size + _SLOT.size * index] = TOMBSTONE
+            self._size -= 1
+            self._tombstones += 1
+            self._dead_bytes += key_length + value_length
+            self._mod_count += 1
+            self._write_header()
+
+            # Under delete-heavy churn, rewrite at the same capacity once tombstones pass the threshold
+            if self._tombstone_ratio is not None and self._tombstones > self._tombstone_ratio * self._capacity:
+                self.resize_table(self._capacity)
+            else:
+                self._collect_garbage()
+
+    def _collect_garbage(self) -> None:
+        """
+        Rewrites the files at the same capacity once dead records make up more than garbage_ratio of a value
+        log of at least 64 KiB, so repeated overwrites can't grow the log without bound.
+
+        No parameters.
+
+        No return - may replace the bucket file and value log.
+        """
+
+        if (self._garbage_ratio is not None and self._log_end >= _MIN_COLLECTED_LOG and
+                self._dead_bytes > self._garbage_ratio * self._log_end):
+            self.resize_table(self._capacity)
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map without changing capacity (starting a new, empty generation).
+
+        No parameters.
+        """
+
+        self._rewrite(self._capacity, False)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a key/value pair tuple stored in the hash map.
+
+        No parameter.
+        """
+
+        key_val_array = DynamicArray()
+        for pair in self.items():
+            key_val_array.append(pair)
+        return key_val_array
+
+    def __len__(self) -> int:
+        """
+        Return size of map (supports len(map))
+        """
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map (supports for key in map)
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        Lazily yields every key in the hash map. Raises RuntimeError if the map is modified during iteration.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        Lazily yields every value in the hash map. Raises RuntimeError if the map is modified during iteration.
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        """
+        Lazily yields every key/value pair in the hash map, reading one record at a time from the log. Raises
+        RuntimeError if the map is modified during iteration (overwriting an existing key is allowed, unless it
+        triggers a rewrite of the files to reclaim dead records).
+        """
+
+        mod_count = self._mod_count
+        for index in range(self._capacity):
+            state, key_length, value_length, _, data = self._slot(index)
+            if state == LIVE:
+                record = self._read_log(data, key_length + value_length)
+                yield _decode_key(record[:key_length]), pickle.loads(record[key_length:])
+                if self._mod_count != mod_count:
+                    raise RuntimeError("HashMap modified during iteration")
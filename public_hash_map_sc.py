@@ -4,38 +4,94 @@
 #               CS-261 Data Structures course.
 
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 # OSU-provided code starts here.
-from HashMap.a6_include import (DynamicArray, LinkedList,
+from HashMap.a6_include import (DynamicArray, LinkedList, SLNode, as_list,
                                 hash_function_1, hash_function_2)
+from HashMap.capacity import check_capacity_mode, fit_capacity
+from HashMap.hash_functions import hash_many, with_finalizer
+from HashMap.journal import Journal
+from HashMap.metrics import MapMetrics
+from HashMap.snapshot import KIND_SC, LIVE, SnapshotView, write_snapshot
+from HashMap.sorted_bucket import SortedBucket
+
+
+# Buckets stay None until their first insert. This shared, never-modified list stands in for them on reads.
+_EMPTY_BUCKET = LinkedList()
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 rehash_step: int = None,
+                 journal: Journal = None,
+                 shrink_load: float = None,
+                 capacity_mode: str = "prime",
+                 treeify_threshold: int = None) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        Parameter "rehash_step" opts into incremental resizing: resize_table only allocates the new bucket
+        array, and each put/get/contains_key/remove then migrates this many old buckets into it.
+        Parameter "journal" refers to an optional Journal (see journal.py): its records are replayed into the
+        new map, after which every put/remove/clear/resize_table (and bulk/upsert variant) is recorded to it.
+        Parameter "shrink_load" refers to the low-water load factor (below 0.5) under which remove shrinks the
+        table to twice that load, never below the initial capacity; clear then also drops back to the initial
+        capacity (None never shrinks).
+        Parameter "capacity_mode" refers to how capacities are chosen (see capacity.py): "prime" (the next
+        prime, by trial division), "schedule" (the next prime in a precomputed schedule) or "pow2" (powers of
+        two, with the hash function wrapped in a finalizer so the low bits that pick a bucket are well mixed).
+        Parameter "treeify_threshold" refers to the chain length past which a bucket is converted into a
+        SortedBucket (see sorted_bucket.py), binary searched instead of walked; it converts back to a chain
+        once it shrinks below three quarters of the threshold (None keeps every bucket a chain).
         """
-        self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        if shrink_load is not None and not 0 < shrink_load < 0.5:
+            raise ValueError(f"shrink_load must be between 0 and 0.5, not {shrink_load}")
+        check_capacity_mode(capacity_mode)
+        self._capacity_mode = capacity_mode
 
-        self._hash_function = function
+        # capacity must be a prime number (or a power of two in pow2 mode); buckets are allocated on first insert
+        if capacity_mode == "prime":
+            self._capacity = self._next_prime(capacity)
+        else:
+            self._capacity = fit_capacity(capacity, capacity_mode)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._min_capacity = self._capacity                         # Floor for automatic shrinking
+        self._shrink_load = shrink_load
+
+        self._hash_function = with_finalizer(function) if capacity_mode == "pow2" else function
+        self._treeify_threshold = treeify_threshold
+        self._untreeify_threshold = None if treeify_threshold is None else treeify_threshold * 3 // 4
         self._size = 0
+        self._mod_count = 0                                         # Bumped by changes that move nodes (see keys)
+
+        # Incremental resize state: the old bucket array being drained and the next old bucket to migrate
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        self._metrics = None                                        # Opt-in MapMetrics (see enable_metrics)
+
+        # Rebuild the contents from the journal before recording anything new to it
+        self._journal = None
+        if journal is not None:
+            journal.replay(self)
+            self._journal = journal
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_resize()
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            out += str(i) + ': ' + str(self._buckets[i] or _EMPTY_BUCKET) + '\n'
         return out
 
     def _next_prime(self, capacity: int) -> int:
@@ -89,6 +145,18 @@ class HashMap:
     # ------------------------------------------------------------------ #
     # Implementation Coding Starts Here:
 
+    def _fit_capacity(self, capacity: int) -> int:
+        """
+        Returns the capacity the map's capacity mode uses for a requested capacity: the capacity itself if it
+        is prime, otherwise the next prime (prime mode), or the schedule/power-of-two choice (see capacity.py).
+
+        Parameter "capacity" refers to the requested capacity.
+        """
+
+        if self._capacity_mode != "prime":
+            return fit_capacity(capacity, self._capacity_mode)
+        return capacity if self._is_prime(capacity) else self._next_prime(capacity)
+
     def put(self, key: str, value: object) -> None:
         """
         Updates a key/value pair in the hash map. Adds the pair if it doesn't exist.
@@ -100,18 +168,46 @@ class HashMap:
         No return - modifies the underlying hash table.
         """
 
-        # Run key through hash map to find its target index, and match to it's linked list
-        target_index = self._hash_function(key) % self._capacity
-        target_list = self._buckets[target_index]
+        self._put_hashed(key, self._hash_function(key), value)
+        if self._journal is not None:
+            self._journal.record('put', key, value)
 
-        # Check if target key is in bucket already and remove if it is, or increase element count if it is not
-        if target_list.contains(key) is not None:
-            target_list.remove(key)
-        else:
-            self._size += 1
+    def _put_hashed(self, key: str, key_hash: int, value: object) -> None:
+        """
+        Body of put for callers that already hold the key's full hash (e.g. from a batch hash).
 
-        # Insert the new element into the bucket
-        target_list.insert(key, value)
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "value" refers to the value paired with the input key.
+
+        No return - modifies the underlying hash table.
+        """
+
+        # While resizing incrementally, move a few buckets along and retire any copy of the key left behind
+        if self._old_buckets is not None:
+            self._migrate_step()
+            if self._old_buckets is not None and self._remove_old(key, key_hash):
+                self._size -= 1
+
+        # Find the key's target index, and match to it's linked list (allocated on demand)
+        target_index = key_hash % self._capacity
+        target_list = self._buckets[target_index]
+        if target_list is None:
+            target_list = LinkedList()
+            self._buckets[target_index] = target_list
+
+        # Overwrite the value of an existing key in place (no node moves, so a running iteration carries on)
+        node = target_list.contains(key)
+        if node is not None:
+            node.value = value
+            return
+
+        # Insert the new element into the bucket, caching its full hash for later resizes
+        target_list.insert(key, value, key_hash)
+        self._size += 1
+        self._mod_count += 1
+        if self._treeify_threshold is not None:
+            self._adapt_bucket(self._buckets, target_index)
 
     def empty_buckets(self) -> int:
         """
@@ -123,9 +219,10 @@ class HashMap:
         """
 
         # Tally the empty buckets in the array
+        self._finish_resize()
         empty_buckets = 0
         for elem in range(self._capacity):
-            if self._buckets[elem].length() == 0:
+            if self._buckets[elem] is None or self._buckets[elem].length() == 0:
                 empty_buckets += 1
         return empty_buckets
 
@@ -140,26 +237,83 @@ class HashMap:
         """
 
         # Sum up the length of all bucket lists
+        self._finish_resize()
         key_count = 0
         for elem in range(self._capacity):
-            key_count += self._buckets[elem].length()
+            if self._buckets[elem] is not None:
+                key_count += self._buckets[elem].length()
 
         # Calculate the load factor and return it
         return key_count / self._capacity
 
-    def clear(self) -> None:
+    def chain_histogram(self) -> dict:
         """
-        Clears the contents of the hash map without messing with capacity.
+        Counts the buckets holding each number of nodes (0 for empty buckets). Walks the whole table.
 
         No parameters.
 
+        Returns a {chain length: bucket count} dictionary, in increasing order of length.
+        """
+
+        self._finish_resize()
+        histogram = {}
+        for index in range(self._capacity):
+            length = 0 if self._buckets[index] is None else self._buckets[index].length()
+            histogram[length] = histogram.get(length, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def enable_metrics(self, max_events: int = 1000) -> MapMetrics:
+        """
+        Turns on the map's metrics (see metrics.py): hit/miss counts for get and contains_key, resize events
+        with their durations, and reports with the tombstone count and chain-length histogram.
+
+        Parameter "max_events" refers to the number of most recent resize events kept.
+
+        Returns the map's MapMetrics (the existing one if metrics are already on), for reports and hooks.
+        """
+
+        if self._metrics is None:
+            self._metrics = MapMetrics(self, "chain_lengths", self.chain_histogram, max_events)
+        return self._metrics
+
+    def disable_metrics(self) -> None:
+        """
+        Turns the map's metrics off again, dropping what they collected.
+
+        No parameters.
+        """
+        self._metrics = None
+
+    def get_metrics(self) -> MapMetrics:
+        """
+        Returns the map's MapMetrics, or None if metrics are off.
+        """
+        return self._metrics
+
+    def clear(self, shrink_to: int = None) -> None:
+        """
+        Clears the contents of the hash map without messing with capacity, unless asked to shrink it.
+
+        Parameter "shrink_to" refers to the capacity to continue with (made prime like resize_table), so a
+        purged table stops carrying its old bucket array. Defaults to the initial capacity when a shrink policy
+        is set, and to the current capacity otherwise.
+
         No return - modifies the underlying dynamic array.
         """
 
-        # Replaces all array indices with empty linked lists and resets size
-        for elem in range(self._capacity):
-            self._buckets[elem] = LinkedList()
+        # Pick the capacity to continue with
+        if shrink_to is None and self._shrink_load is not None:
+            shrink_to = self._min_capacity
+        if shrink_to is not None and shrink_to >= 1:
+            self._capacity = self._fit_capacity(shrink_to)
+
+        # Replaces the bucket array with unallocated buckets and resets size (dropping any in-progress resize)
+        self._old_buckets = None
+        self._buckets = DynamicArray([None] * self._capacity)
         self._size = 0
+        self._mod_count += 1
+        if self._journal is not None:
+            self._journal.record('clear', *(() if shrink_to is None else (shrink_to,)))
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -172,31 +326,166 @@ class HashMap:
         No return - modifies the underlying bucket array (aka the hash map).
         """
 
-        # Track the new capacity, in case it needs to change and mark original map / capacity
-        update_capacity = new_capacity
-        old_map = self._buckets
-        old_capacity = self._capacity
+        if self._metrics is not None:
+            self._metrics.timed_resize(self._resize_table, new_capacity)
+        else:
+            self._resize_table(new_capacity)
+
+    def _resize_table(self, new_capacity: int) -> None:
+        """
+        Body of resize_table (timed by the metrics when they are enabled).
+
+        Parameter "new_capacity" refers to the new intended capacity for the bucket array.
+
+        No return - modifies the underlying bucket array (aka the hash map).
+        """
 
         # Filter out impossible capacities
         if new_capacity < 1:
             return
 
-        # Make sure the new capacity is prime; and update it to next prime if not
-        if self._is_prime(new_capacity) is False:
-            update_capacity = self._next_prime(new_capacity)
+        # Finish any incremental resize first so every element lives in one array
+        self._finish_resize()
+        self._mod_count += 1
+
+        # Mark original map / capacity
+        old_map = self._buckets
+        old_capacity = self._capacity
+
+        # Make sure the new capacity is prime (or fits the capacity mode); and update it if not
+        update_capacity = self._fit_capacity(new_capacity)
 
         # Create new hash map based on updated capacity and bind it to bucket list / update capacity
-        new_map = DynamicArray()
-        for elem in range(update_capacity):
-            new_map.append(LinkedList())
+        new_map = DynamicArray([None] * update_capacity)
         self._buckets = new_map
         self._capacity = update_capacity
 
-        # Rehash all elements in old hash map and place in new map based on re-hashed index
-        for bucket in range(old_capacity):
-            for old_node in old_map[bucket]:
-                self.put(old_node.key, old_node.value)
-                self._size -= 1                                     # Offsets not actually "adding" a new element
+        # In incremental mode, leave the old array to be drained a few buckets at a time by later operations
+        if self._rehash_step is not None:
+            self._old_buckets = old_map
+            self._old_capacity = old_capacity
+            self._migrate_index = 0
+
+        # Otherwise relink all nodes into the new map using their cached hashes (keys are unique, so no lookups)
+        else:
+            for bucket in range(old_capacity):
+                if old_map[bucket] is not None:
+                    for old_node in old_map[bucket]:
+                        self._link_node(old_node)
+
+        # Journal the resize only once every entry is in place: the record may trigger a compaction, which
+        # checkpoints whatever the table holds at that moment
+        if self._journal is not None:
+            self._journal.record('resize_table', update_capacity)
+
+    def _link_node(self, node) -> None:
+        """
+        Links an existing node into its bucket in the current array using its cached hash, allocating the
+        bucket's list if needed. The node itself is re-used, so moving it costs no allocation.
+
+        Parameter "node" refers to the node being moved.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        index = node.key_hash % self._capacity
+        if self._buckets[index] is None:
+            self._buckets[index] = LinkedList()
+        self._buckets[index].insert_node(node)
+        if self._treeify_threshold is not None:
+            self._adapt_bucket(self._buckets, index)
+
+    def _adapt_bucket(self, buckets: DynamicArray, index: int) -> None:
+        """
+        Converts a bucket between a chain and a SortedBucket: a chain longer than the treeify threshold is
+        sorted (if enough of its keys can be), and a sorted bucket shorter than the untreeify threshold goes
+        back to being a chain. The gap between the two thresholds keeps a bucket from flipping back and forth.
+
+        Parameter "buckets" refers to the bucket array holding the bucket.
+        Parameter "index" refers to the bucket's index.
+
+        No return - may replace the bucket.
+        """
+
+        bucket = buckets[index]
+        if type(bucket) is LinkedList:
+            if bucket.length() > self._treeify_threshold:
+                sorted_bucket = SortedBucket.from_list(bucket, self._untreeify_threshold)
+                if sorted_bucket is not None:
+                    buckets[index] = sorted_bucket
+        elif bucket.length() < self._untreeify_threshold:
+            buckets[index] = bucket.to_list()
+
+    def _remove_from(self, buckets: DynamicArray, index: int, key: str) -> bool:
+        """
+        Removes a key from one bucket of a bucket array, releasing the bucket's list once it is empty (and
+        turning a sorted bucket back into a chain once it is short).
+
+        Parameter "buckets" refers to the bucket array holding the bucket.
+        Parameter "index" refers to the bucket's index.
+        Parameter "key" refers to the key being removed.
+
+        Returns True if the key was found and removed, False otherwise.
+        """
+
+        target_list = buckets[index]
+        if target_list is None or target_list.remove(key) is False:
+            return False
+        if target_list.length() == 0:
+            buckets[index] = None
+        elif self._treeify_threshold is not None and type(target_list) is SortedBucket:
+            self._adapt_bucket(buckets, index)
+        return True
+
+    def _migrate_step(self, bucket_count: int = None) -> None:
+        """
+        Moves the next few buckets of an in-progress incremental resize into the current bucket array,
+        using the cached hashes. Drops the old array once it has been fully drained.
+
+        Parameter "bucket_count" refers to the number of old buckets to migrate (defaults to the rehash step).
+
+        No return - modifies the old and current bucket arrays.
+        """
+
+        # Determine the range of old buckets to drain on this step
+        if bucket_count is None:
+            bucket_count = self._rehash_step
+        end = min(self._migrate_index + bucket_count, self._old_capacity)
+
+        # Relink each node of the drained buckets, leaving the old buckets unallocated for any later lookups
+        for bucket in range(self._migrate_index, end):
+            if self._old_buckets[bucket] is not None:
+                for old_node in self._old_buckets[bucket]:
+                    self._link_node(old_node)
+                self._old_buckets[bucket] = None
+        self._migrate_index = end
+
+        # Release the old array once it has been fully migrated
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _remove_old(self, key: str, key_hash: int) -> bool:
+        """
+        Removes a key from the old bucket array of an in-progress incremental resize, if present.
+
+        Parameter "key" refers to the key being removed.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns True if the key was found and removed, False otherwise.
+        """
+        return self._remove_from(self._old_buckets, key_hash % self._old_capacity, key)
+
+    def _finish_resize(self) -> None:
+        """
+        Completes any in-progress incremental resize, for operations that need every element in one array.
+
+        No parameters.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate_step(self._old_capacity)
 
     def get(self, key: str) -> object:
         """
@@ -207,10 +496,12 @@ class HashMap:
         Returns the object searched for if it was found, None if it was not.
         """
 
-        # Check hashmap for targeted value and return it if found
-        for bucket in range(self._capacity):
-            if self._buckets[bucket].contains(key) is not None:
-                return self._buckets[bucket].contains(key).value
+        # Hash the key once and search only the chain it belongs to, returning the node's value if found
+        node = self._find_node(key)
+        if self._metrics is not None:
+            self._metrics.record_lookup(node is not None)
+        if node is not None:
+            return node.value
 
         # Return None if the key was not found
         return None
@@ -224,13 +515,34 @@ class HashMap:
         Returns True or False depending on whether the key was found.
         """
 
-        # Search the hash map for the key and return True if it was found
-        for bucket in range(self._capacity):
-            if self._buckets[bucket].contains(key) is not None:
-                return True
+        # Hash the key once and search only the chain it belongs to
+        found = self._find_node(key) is not None
+        if self._metrics is not None:
+            self._metrics.record_lookup(found)
+        return found
+
+    def _find_node(self, key: str, key_hash: int = None):
+        """
+        Hashes the key once and searches the one chain it belongs to. While an incremental resize is in
+        progress, also migrates a step and falls back to the key's chain in the old bucket array.
 
-        # Return False if the key was not found
-        return False
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash, if the caller already computed it.
+
+        Returns the node holding the key, or None if it is not in the hash map.
+        """
+
+        # Move the incremental resize along before looking the key up
+        if key_hash is None:
+            key_hash = self._hash_function(key)
+        if self._old_buckets is not None:
+            self._migrate_step()
+
+        # Check the current array first, then the chain the key would occupy in the old one
+        node = (self._buckets[key_hash % self._capacity] or _EMPTY_BUCKET).contains(key)
+        if node is None and self._old_buckets is not None:
+            node = (self._old_buckets[key_hash % self._old_capacity] or _EMPTY_BUCKET).contains(key)
+        return node
 
     def remove(self, key: str) -> None:
         """
@@ -242,14 +554,226 @@ class HashMap:
         No return - modifies the hash map.
         """
 
-        # Run key through hash map to find its target index, and match to it's linked list
-        target_index = self._hash_function(key) % self._capacity
-        target_list = self._buckets[target_index]
+        self._remove_hashed(key, self._hash_function(key))
+        if self._journal is not None:
+            self._journal.record('remove', key)
+
+    def _remove_hashed(self, key: str, key_hash: int) -> None:
+        """
+        Body of remove for callers that already hold the key's full hash.
+
+        Parameter "key" is the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        No return - modifies the hash map.
+        """
+
+        if self._old_buckets is not None:
+            self._migrate_step()
 
-        # Check if target key is in bucket already and remove if it is
-        if target_list.contains(key) is not None:
-            target_list.remove(key)
+        # Remove the target key in a single walk of its bucket (or its old bucket, mid-resize) if present
+        if self._remove_from(self._buckets, key_hash % self._capacity, key):
             self._size -= 1
+            self._mod_count += 1
+        elif self._old_buckets is not None and self._remove_old(key, key_hash):
+            self._size -= 1
+            self._mod_count += 1
+        else:
+            return
+
+        # Give memory back once the table has emptied out past the low-water mark
+        if self._shrink_load is not None and self._size < self._shrink_load * self._capacity:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        """
+        Applies the shrink policy: resizes the table so that its load factor is twice the low-water mark, but
+        never below the initial capacity. The gap between the two loads is the hysteresis that keeps alternating
+        removes and puts from resizing the table back and forth.
+
+        No parameters.
+
+        No return - modifies the underlying bucket array.
+        """
+
+        target = self._fit_capacity(max(int(self._size / (2 * self._shrink_load)) + 1, self._min_capacity))
+        if target < self._capacity:
+            self.resize_table(target)
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds or updates many key/value pairs at once. All keys are hashed in one batch and the table is grown
+        once up front so that every pair fits at a load factor of at most 1.
+
+        Parameter "pairs" refers to an iterable or DynamicArray of (key, value) tuples.
+
+        No return - modifies the underlying hash table.
+        """
+
+        # Hash every key in one batch
+        pairs = as_list(pairs)
+        key_hashes = hash_many(self._hash_function, [pair[0] for pair in pairs])
+
+        # Presize once (as if every key were new) and make sure all elements live in a single array
+        if self._size + len(pairs) > self._capacity:
+            self.resize_table(self._size + len(pairs))
+        self._finish_resize()
+
+        for index in range(len(pairs)):
+            self._put_hashed(pairs[index][0], key_hashes[index], pairs[index][1])
+        if self._journal is not None:
+            self._journal.record('put_many', pairs)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Looks up many keys at once, hashing them all in one batch.
+
+        Parameter "keys" refers to an iterable or DynamicArray of keys.
+
+        Returns a dynamic array holding each key's value (None for missing keys), in order.
+        """
+
+        keys = as_list(keys)
+        key_hashes = hash_many(self._hash_function, keys)
+        values = DynamicArray()
+        for index in range(len(keys)):
+            node = self._find_node(keys[index], key_hashes[index])
+            if self._metrics is not None:
+                self._metrics.record_lookup(node is not None)
+            values.append(None if node is None else node.value)
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes many keys at once, hashing them all in one batch. Missing keys are ignored.
+
+        Parameter "keys" refers to an iterable or DynamicArray of keys.
+
+        No return - modifies the hash map.
+        """
+
+        keys = as_list(keys)
+        key_hashes = hash_many(self._hash_function, keys)
+        for index in range(len(keys)):
+            self._remove_hashed(keys[index], key_hashes[index])
+        if self._journal is not None:
+            self._journal.record('remove_many', keys)
+
+    def increment(self, key: str, delta: int = 1, move_to_front: bool = False) -> int:
+        """
+        Adds to the value stored for a key in a single walk of its chain, starting from 0 if the key is new.
+
+        Parameter "key" refers to the key being updated.
+        Parameter "delta" refers to the amount added to the key's value.
+        Parameter "move_to_front" refers to whether the key's node is moved to the front of its chain, so
+        frequently updated keys are found sooner.
+
+        Returns the key's new value.
+        """
+
+        value = self._increment_hashed(key, self._hash_function(key), delta, move_to_front)
+        if self._journal is not None:
+            self._journal.record('put', key, value)
+        return value
+
+    def setdefault(self, key: str, default: object = None, move_to_front: bool = False) -> object:
+        """
+        Returns the value stored for a key, first storing the default if the key is new (single chain walk).
+
+        Parameter "key" refers to the key being looked up.
+        Parameter "default" refers to the value stored if the key is not in the hash map.
+        Parameter "move_to_front" refers to whether the key's node is moved to the front of its chain.
+
+        Returns the key's value.
+        """
+
+        node = self._upsert_node(key, self._hash_function(key), default, move_to_front)
+        if self._journal is not None:
+            self._journal.record('put', key, node.value)
+        return node.value
+
+    def update_with(self, key: str, function: callable, default: object = None, move_to_front: bool = False) -> object:
+        """
+        Replaces the value stored for a key with function(value) in a single walk of its chain. A new key
+        starts from the default, so it is stored as function(default).
+
+        Parameter "key" refers to the key being updated.
+        Parameter "function" refers to the callable computing the new value from the current one.
+        Parameter "default" refers to the value passed to the function if the key is new.
+        Parameter "move_to_front" refers to whether the key's node is moved to the front of its chain.
+
+        Returns the key's new value.
+        """
+
+        node = self._upsert_node(key, self._hash_function(key), default, move_to_front)
+        node.value = function(node.value)
+        if self._journal is not None:
+            self._journal.record('put', key, node.value)
+        return node.value
+
+    def _increment_hashed(self, key: str, key_hash: int, delta: int, move_to_front: bool) -> int:
+        """
+        Body of increment for callers that already hold the key's full hash.
+
+        Parameter "key" refers to the key being updated.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "delta" refers to the amount added to the key's value.
+        Parameter "move_to_front" refers to whether the key's node is moved to the front of its chain.
+
+        Returns the key's new value.
+        """
+
+        node = self._upsert_node(key, key_hash, 0, move_to_front)
+        node.value += delta
+        return node.value
+
+    def _upsert_node(self, key: str, key_hash: int, default: object, move_to_front: bool):
+        """
+        Single-traversal engine behind increment, setdefault and update_with. Finds the key's node in one walk
+        of its chain (optionally moving it to the front), or inserts a new node holding the default.
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "default" refers to the value of a newly inserted node.
+        Parameter "move_to_front" refers to whether an existing node is moved to the front of its chain.
+
+        Returns the key's node.
+        """
+
+        # Mid-resize, move a few buckets along and check whether the key is still waiting in the old array
+        old_node = None
+        if self._old_buckets is not None:
+            self._migrate_step()
+            old_list = None if self._old_buckets is None else self._old_buckets[key_hash % self._old_capacity]
+            old_node = None if old_list is None else old_list.find(key)
+
+        # Find the key's target index, and match to it's linked list (allocated on demand)
+        target_index = key_hash % self._capacity
+        target_list = self._buckets[target_index]
+        if target_list is None:
+            target_list = LinkedList()
+            self._buckets[target_index] = target_list
+
+        # A key found in the old array carries its value over into the current one. Otherwise, update in place
+        # if the key is present, or insert it at the front of its chain
+        if old_node is not None:
+            self._remove_old(key, key_hash)
+            target_list.insert(key, old_node.value, key_hash)
+        else:
+            node = target_list.find(key, move_to_front)
+            if node is not None:
+                if move_to_front:                                   # Re-ordering a chain also upsets iteration
+                    self._mod_count += 1
+                return node
+            target_list.insert(key, default, key_hash)
+            self._size += 1
+        node = target_list.find(key)
+        self._mod_count += 1
+
+        # A new node may push its chain past the treeify threshold (the node itself moves over unchanged)
+        if self._treeify_threshold is not None:
+            self._adapt_bucket(self._buckets, target_index)
+        return node
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -260,17 +784,131 @@ class HashMap:
         Returns a dynamic array consisting of key/value tuples.
         """
 
-        # Create the new array to be returned
+        # Create the new array to be returned, then copy every pair into it (see items for a lazy alternative)
         key_val_array = DynamicArray()
-
-        # Rehash all elements in old hash map and place in new map based on re-hashed index
-        for bucket in range(self._capacity):
-            for node in self._buckets[bucket]:
-                key_val_array.append((node.key, node.value))
+        for pair in self.items():
+            key_val_array.append(pair)
 
         # Returns the new array
         return key_val_array
 
+    def __len__(self) -> int:
+        """
+        Return size of map (supports len(map))
+        """
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the map (supports for key in map)
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        Lazily yields every key in the hash map, walking the buckets in place instead of copying them.
+
+        No parameters.
+
+        Returns a generator of keys. Raises RuntimeError if the map is modified during iteration.
+        """
+
+        for node in self._iter_nodes():
+            yield node.key
+
+    def values(self):
+        """
+        Lazily yields every value in the hash map, walking the buckets in place instead of copying them.
+
+        No parameters.
+
+        Returns a generator of values. Raises RuntimeError if the map is modified during iteration.
+        """
+
+        for node in self._iter_nodes():
+            yield node.value
+
+    def items(self):
+        """
+        Lazily yields every key/value pair in the hash map, walking the buckets in place instead of copying them.
+
+        No parameters.
+
+        Returns a generator of key/value tuples. Raises RuntimeError if the map is modified during iteration.
+        """
+
+        for node in self._iter_nodes():
+            yield node.key, node.value
+
+    def _iter_nodes(self):
+        """
+        Generator engine behind the iteration views. Finishes any incremental resize, then walks every chain,
+        checking the modification count each time the consumer resumes. Any insert, removal, clear, resize or
+        chain re-ordering since the walk started raises instead of skipping or repeating nodes; updating a
+        value in place (put on an existing key, increment/update_with without move_to_front) is allowed.
+
+        No parameters.
+
+        Returns a generator of the map's nodes.
+        """
+
+        # Gather every node into one array, then note the modification count the walk relies on
+        self._finish_resize()
+        mod_count = self._mod_count
+        buckets = self._buckets
+        for bucket in range(self._capacity):
+            for node in buckets[bucket] or _EMPTY_BUCKET:
+                yield node
+                if self._mod_count != mod_count:
+                    raise RuntimeError("HashMap modified during iteration")
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map to a binary snapshot file (see snapshot.py) that load can bring back without
+        re-inserting every key. Nodes are stored bucket by bucket behind a bucket index.
+
+        Parameter "path" refers to the destination file.
+
+        No return - creates or replaces the file. Raises ValueError if the hash function is not registered
+        as stable across processes (see snapshot.register_hash_function).
+        """
+
+        if self._capacity_mode == "pow2":
+            raise ValueError("Snapshots need a prime capacity, not pow2 mode")
+        self._finish_resize()
+        buckets = self._buckets
+        records = ((bucket, LIVE, node.key, node.value, node.key_hash)
+                   for bucket in range(self._capacity) for node in buckets[bucket] or _EMPTY_BUCKET)
+        write_snapshot(path, KIND_SC, self._capacity, self._size, self._hash_function, records)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, function: callable = None):
+        """
+        Loads a snapshot written by save.
+
+        Parameter "path" refers to the snapshot file.
+        Parameter "mmap" refers to whether lookups are served straight from the memory-mapped file (a read-only
+        SnapshotView, ready in constant time) instead of rebuilding an in-memory HashMap.
+        Parameter "function" refers to the hash function to use instead of the registered one saved by name.
+
+        Returns a SnapshotView (mmap True) or a HashMap (mmap False).
+        """
+
+        view = SnapshotView(path, function)
+        if view.get_kind() != KIND_SC:
+            view.close()
+            raise ValueError(f"{path!r} is not a separate chaining snapshot")
+        if mmap:
+            return view
+
+        # Rebuild without re-hashing or searching chains: every node is linked straight into its bucket
+        with view:
+            map = cls(view.get_capacity(), view.get_hash_function())
+            for key, value, key_hash in view.entries():
+                map._link_node(SLNode(key, value, None, key_hash))
+            map._size = view.get_size()
+        return map
+
     def get_hash(self, key: str) -> int:
         """
         Returns the hash value of the key input, using this object's defined hash function.
@@ -285,39 +923,40 @@ class HashMap:
 
     def get_list(self, index: int) -> LinkedList:
         """
-        Returns the linked list found at a given index in the hash map.
+        Returns the linked list found at a given index in the hash map (a SortedBucket, which supports the
+        same methods, if the bucket has been treeified).
 
         Parameter  index refers to the index that we want to access the list for.
 
         Returns the linked list at the targeted index.
         """
 
-        # Returns the linked list at the targeted index
+        # Returns the linked list at the targeted index, allocating it first (callers may modify the list, so
+        # the shared _EMPTY_BUCKET must never be handed out)
+        self._finish_resize()
+        if self._buckets[index] is None:
+            self._buckets[index] = LinkedList()
         return self._buckets[index]
 
-    def key_val_mode_helper(self, key: str) -> None:
+    def key_val_mode_helper(self, key: str, key_hash: int = None) -> None:
         """
         Helper function for use when the hash map is storing counting information
         for mode calculations. Increases the value for a node by 1 when called and
         moves it front of its list to reduce list iterations for frequently called keys.
+        Both happen in a single walk of the key's chain (see increment).
 
         Parameter "key" refers to the key for the node to be modified.
+        Parameter "key_hash" refers to the key's full hash, if the caller already computed it.
 
         No return - modifies the value for a node in a bucket.
         """
 
-        # Use the hashed index to get to the target node location
-        key_index = self.get_hash(key)
-        target_list = self._buckets[key_index]
-        target_node = target_list.contains(key)
-
-        # Create or update the key node and its value
-        if target_node:                                             # Updates frequency and moves node to front of line
-            old_value = target_node.value
-            self.remove(key)
-            self.put(key, old_value + 1)
-        else:
-            self.put(key, 1)                                        # Creates node with defaults if it doesn't exist
+        # Create the key node at 1 or bump its frequency, moving it to the front of its chain
+        if key_hash is None:
+            key_hash = self._hash_function(key)
+        value = self._increment_hashed(key, key_hash, 1, True)
+        if self._journal is not None:
+            self._journal.record('put', key, value)
 
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
@@ -332,18 +971,89 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     Returns a tuple of the mode (in array form) and its frequency as an integer.
     """
 
-    # Initialize counting hashmap, the mode array, and the frequency of the most common element tracker
+    # Initialize counting hashmap
     map = HashMap()
+
+    # Hash every element in one batch, then tally counts of each unique element as key/value nodes in a hashmap
+    keys = [da[elem] for elem in range(da.length())]
+    key_hashes = hash_many(map._hash_function, keys)
+    for elem in range(len(keys)):
+        map.key_val_mode_helper(keys[elem], key_hashes[elem])      # Create 1st entry in map, or update freq value
+
+    return _collect_mode(map, da.length())
+
+
+def find_mode_parallel(da: DynamicArray, workers: int = None, chunk_size: int = None) -> (DynamicArray, int):
+    """
+    Parallel counterpart of find_mode for very large inputs. Splits the array into chunks, counts each chunk
+    in its own counting hashmap in a process pool, then merges the partial counts and picks the mode(s) the same
+    way find_mode does. Returns the same modes and frequency as find_mode (tied modes may be listed in a
+    different order). Falls back to find_mode when there is only one worker or one chunk.
+
+    Parameter "da" refers to the dynamic array being analyzed.
+    Parameter "workers" refers to the number of worker processes (defaults to the CPU count).
+    Parameter "chunk_size" refers to the number of elements counted per task (defaults to splitting the array
+    into four chunks per worker).
+
+    Returns a tuple of the mode (in array form) and its frequency as an integer.
+    """
+
+    # Work out the pool size and chunking; small inputs aren't worth the process overhead
+    length = da.length()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-length // (4 * workers)))
+    if workers <= 1 or length <= chunk_size:
+        return find_mode(da)
+
+    # Count each chunk in a separate process
+    keys = as_list(da)
+    chunks = [keys[start:start + chunk_size] for start in range(0, length, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partial_counts = list(executor.map(_count_chunk, chunks))
+
+    # Merge the partial counts into one counting hashmap, sized for the largest partial result
+    map = HashMap(max(len(counts) for counts in partial_counts))
+    for counts in partial_counts:
+        for key, count in counts:
+            map.increment(key, count)
+
+    return _collect_mode(map, length)
+
+
+def _count_chunk(keys: list) -> list:
+    """
+    Process pool task for find_mode_parallel: counts one chunk of elements in its own counting hashmap.
+
+    Parameter "keys" refers to the chunk of elements being counted.
+
+    Returns a list of (element, count) tuples.
+    """
+
+    map = HashMap(len(keys))
+    key_hashes = hash_many(map._hash_function, keys)
+    for index in range(len(keys)):
+        map.key_val_mode_helper(keys[index], key_hashes[index])
+    return as_list(map.get_keys_and_values())
+
+
+def _collect_mode(map: HashMap, length: int) -> (DynamicArray, int):
+    """
+    Picks the mode value(s) and their frequency out of a counting hashmap.
+
+    Parameter "map" refers to the counting hashmap (keys mapped to frequencies).
+    Parameter "length" refers to the number of elements that were counted.
+
+    Returns a tuple of the mode (in array form) and its frequency as an integer.
+    """
+
+    # Initialize the mode array and the frequency of the most common element tracker
     mode_array = DynamicArray()
     mode_freq = None
 
-    # Iterate through initial array and tally counts of each unique element as key/value nodes in a hashmap
-    for elem in range(da.length()):
-        key = da[elem]
-        map.key_val_mode_helper(key)                                # Create 1st entry in map, or update freq value
-
     # Resize hashmap to reduce chances of collisions/improve performance (since memory isn't an issue)
-    map.resize_table(2 * da.length())
+    map.resize_table(2 * length)
 
     # Iterate through counting hashmap, updating mode as needed
     for bucket in range(map.get_capacity()):
@@ -0,0 +1,361 @@
+# Description:  Bounded cache built on the separate-chaining hash map. Entries live in the usual bucket chains as
+#               SLNode subclasses that are also linked into a doubly linked recency ring, so lookups, LRU touches,
+#               CLOCK reference marks and evictions are all O(1). Supports a maximum entry count and/or byte
+#               budget, LRU or CLOCK eviction, optional per-entry TTL, and hit/miss/eviction counters.
+
+
+import sys
+import time
+
+from HashMap.a6_include import DynamicArray, SLNode, as_list
+from HashMap.public_hash_map_sc import HashMap as SCHashMap
+
+
+class _CacheNode(SLNode):
+    """
+    Chain node that is also a member of the cache's recency ring (ordered oldest to newest through "newer").
+    """
+
+    __slots__ = ('newer', 'older', 'expires', 'referenced', 'cost')
+
+    def __init__(self, key: object, value: object, key_hash: int = None) -> None:
+        """Initialize an unlinked node given a key and value (and optionally the key's full hash)."""
+        super().__init__(key, value, None, key_hash)
+        self.newer = self.older = self                              # A lone node is its own ring
+        self.expires = None
+        self.referenced = False
+        self.cost = 0
+
+
+def _entry_size(key: object, value: object) -> int:
+    """Default byte cost of a cache entry: the shallow sizes of its key and value."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class HashMap(SCHashMap):
+    def __init__(self,
+                 max_entries: int = None,
+                 max_bytes: int = None,
+                 policy: str = "lru",
+                 ttl: float = None,
+                 function: callable = hash,
+                 capacity: int = None,
+                 sizeof: callable = _entry_size,
+                 clock: callable = time.monotonic,
+                 rehash_step: int = None) -> None:
+        """
+        Initialize new cache that uses separate chaining for collision resolution
+        and evicts entries to stay within its budgets
+
+        Parameter "max_entries" refers to the most entries kept (None for no limit).
+        Parameter "max_bytes" refers to the most bytes kept, as measured by sizeof when each entry is put
+        (None for no limit).
+        Parameter "policy" refers to the eviction policy: "lru" (evict the least recently used entry) or "clock"
+        (second-chance approximation of LRU where a hit only sets a reference bit).
+        Parameter "ttl" refers to the default time to live of an entry in clock units (None never expires).
+        Parameter "function" refers to the hash function (the builtin hash accepts any hashable key).
+        Parameter "capacity" refers to the initial bucket count (defaults to max_entries, or 11); the table
+        doubles whenever the entries outnumber the buckets.
+        Parameter "sizeof" refers to the function giving an entry's byte cost from its key and value.
+        Parameter "clock" refers to the time source used for TTLs.
+        """
+
+        if policy not in ("lru", "clock"):
+            raise ValueError(f"Unknown eviction policy: {policy!r}")
+        super().__init__(capacity or max_entries or 11, function, rehash_step)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._policy = policy
+        self._ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+
+        # Recency ring (sentinel.newer is the oldest entry, sentinel.older the newest) and the CLOCK hand
+        self._ring = _CacheNode(None, None)
+        self._hand = None
+        self._bytes = 0
+
+        # Counters for tuning the budgets
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _append_newest(self, node: _CacheNode) -> None:
+        """
+        Links a node into the recency ring as its newest member.
+        """
+        newest = self._ring.older
+        newest.newer = node
+        node.older = newest
+        node.newer = self._ring
+        self._ring.older = node
+
+    def _unlink(self, node: _CacheNode) -> None:
+        """
+        Removes a node from the recency ring, moving the CLOCK hand past it if needed.
+        """
+        if self._hand is node:
+            self._hand = node.newer
+        node.older.newer = node.newer
+        node.newer.older = node.older
+        node.newer = node.older = node
+
+    def _touch(self, node: _CacheNode) -> None:
+        """
+        Records a use of a node: LRU moves it to the newest end of the ring, CLOCK sets its reference bit.
+        """
+        if self._policy == "lru":
+            self._unlink(node)
+            self._append_newest(node)
+        else:
+            node.referenced = True
+
+    def _expired(self, node: _CacheNode) -> bool:
+        """
+        Returns True if the node's time to live has run out.
+        """
+        return node.expires is not None and node.expires <= self._clock()
+
+    def _victim(self) -> _CacheNode:
+        """
+        Picks the entry to evict: the oldest entry for LRU; for CLOCK, the first entry without its reference bit
+        set at or after the hand, clearing bits as the hand sweeps past (each sweep clears every bit, so it
+        stops within one lap).
+
+        No parameters.
+
+        Returns the node to evict.
+        """
+
+        ring = self._ring
+        if self._policy == "lru":
+            return ring.newer
+
+        hand = self._hand or ring.newer
+        while True:
+            if hand is ring:                                        # Wrap around past the sentinel
+                hand = ring.newer
+            elif hand.referenced:                                   # Second chance: clear the bit and move on
+                hand.referenced = False
+                hand = hand.newer
+            else:
+                self._hand = hand.newer
+                return hand
+
+    def _enforce_budget(self) -> None:
+        """
+        Evicts entries until the cache is within its entry and byte budgets.
+
+        No parameters.
+
+        No return - modifies the hash map.
+        """
+
+        while self._size > 0 and ((self._max_entries is not None and self._size > self._max_entries) or
+                                  (self._max_bytes is not None and self._bytes > self._max_bytes)):
+            victim = self._victim()
+            self._remove_hashed(victim.key, victim.key_hash)
+            self._evictions += 1
+
+    def put(self, key: object, value: object, ttl: float = None) -> None:
+        """
+        Updates a key/value pair in the cache. Adds the pair if it doesn't exist, evicting entries as needed to
+        stay within the budgets. Counts as a use of the key.
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "value" refers to the value paired with the input key.
+        Parameter "ttl" refers to the entry's time to live (defaults to the cache's ttl).
+
+        No return - modifies the underlying hash table.
+        """
+
+        self._put_hashed(key, self._hash_function(key), value, ttl)
+        if self._journal is not None:
+            self._journal.record('put', key, value)
+
+    def _put_hashed(self, key: object, key_hash: int, value: object, ttl: float = None) -> None:
+        """
+        Body of put for callers that already hold the key's full hash (put_many and the upserts go through
+        here too, so every entry is a ring member).
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "value" refers to the value paired with the input key.
+        Parameter "ttl" refers to the entry's time to live (defaults to the cache's ttl).
+
+        No return - modifies the underlying hash table.
+        """
+
+        if ttl is None:
+            ttl = self._ttl
+
+        # Update an existing entry in place, or link a new node into its chain and the ring
+        node = self._find_node(key, key_hash)
+        if node is not None:
+            self._bytes -= node.cost
+            node.value = value
+            self._touch(node)
+        else:
+            node = _CacheNode(key, value, key_hash)
+            self._link_node(node)
+            self._append_newest(node)
+            self._size += 1
+            self._mod_count += 1
+        node.cost = self._sizeof(key, value) if self._max_bytes is not None else 0
+        node.expires = None if ttl is None else self._clock() + ttl
+        self._bytes += node.cost
+
+        # Keep chains short as the cache grows, then bring it back within budget
+        if self._size > self._capacity:
+            self.resize_table(2 * self._capacity)
+        self._enforce_budget()
+
+    def _remove_hashed(self, key: object, key_hash: int) -> None:
+        """
+        Body of remove for callers that already hold the key's full hash; also unlinks the entry from the ring.
+
+        Parameter "key" is the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        No return - modifies the hash map.
+        """
+
+        node = self._find_node(key, key_hash)
+        if node is not None:
+            self._unlink(node)
+            self._bytes -= node.cost
+            super()._remove_hashed(key, key_hash)
+
+    def _live_node(self, key: object, key_hash: int) -> _CacheNode:
+        """
+        Finds a key's node, dropping it instead if its time to live has run out.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns the live node holding the key, or None.
+        """
+
+        node = self._find_node(key, key_hash)
+        if node is not None and self._expired(node):
+            self._remove_hashed(key, key_hash)
+            self._expirations += 1
+            return None
+        return node
+
+    def get(self, key: object) -> object:
+        """
+        Returns the value associated with a given key, and None if it is not in the cache (or has expired).
+        Counts a hit or a miss, and a hit as a use of the key.
+
+        Parameter "key" refers to the key being searched for.
+        """
+
+        node = self._live_node(key, self._hash_function(key))
+        if node is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._touch(node)
+        return node.value
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Returns True if the cache holds an unexpired entry for a key (without counting it as a use).
+
+        Parameter "key" is the key being searched for.
+        """
+
+        return self._live_node(key, self._hash_function(key)) is not None
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Looks up many keys at once, counting hits and misses like get.
+
+        Parameter "keys" refers to an iterable or DynamicArray of keys.
+
+        Returns a dynamic array holding each key's value (None for missing keys), in order.
+        """
+
+        values = DynamicArray()
+        for key in as_list(keys):
+            values.append(self.get(key))
+        return values
+
+    def _upsert_node(self, key: object, key_hash: int, default: object, move_to_front: bool):
+        """
+        Single-lookup engine behind increment, setdefault and update_with for the cache: an expired or missing
+        key is put with the default (subject to the budgets), an existing one counts as a use.
+
+        Parameter "key" refers to the key being targeted.
+        Parameter "key_hash" refers to the key's full hash.
+        Parameter "default" refers to the value of a newly inserted node.
+        Parameter "move_to_front" is accepted for compatibility; recency is tracked by the ring instead.
+
+        Returns the key's node (a detached node if the budget evicted it straight away).
+        """
+
+        node = self._live_node(key, key_hash)
+        if node is not None:
+            self._touch(node)
+            return node
+        self._put_hashed(key, key_hash, default)
+        return self._find_node(key, key_hash) or _CacheNode(key, default, key_hash)
+
+    def clear(self, shrink_to: int = None) -> None:
+        """
+        Clears the contents of the cache (counters are kept).
+
+        Parameter "shrink_to" refers to the capacity to continue with (defaults to the current capacity).
+        """
+
+        super().clear(shrink_to)
+        self._ring = _CacheNode(None, None)
+        self._hand = None
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        Removes every expired entry (get and contains_key already drop expired entries lazily).
+
+        No parameters.
+
+        Returns the number of entries removed.
+        """
+
+        expired = [node for node in super()._iter_nodes() if self._expired(node)]
+        for node in expired:
+            self._remove_hashed(node.key, node.key_hash)
+        self._expirations += len(expired)
+        return len(expired)
+
+    def _iter_nodes(self):
+        """
+        Generator engine behind the iteration views, skipping expired entries.
+        """
+        for node in super()._iter_nodes():
+            if not self._expired(node):
+                yield node
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters and occupancy.
+
+        No parameters.
+
+        Returns a dictionary with the capacity, entry count, byte total, hit/miss/eviction/expiration counts and
+        the hit ratio.
+        """
+
+        lookups = self._hits + self._misses
+        return {
+            "capacity": self._capacity,
+            "entries": self._size,
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+        }
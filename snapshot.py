@@ -0,0 +1,376 @@
+# Description:  Binary snapshot format for the SC and OA hash maps, written by HashMap.save and read back by
+#               HashMap.load. A loaded snapshot can be served straight from a read-only memory map (SnapshotView),
+#               so get/contains_key only decode the one entry they land on instead of rebuilding the map.
+#
+#               Layout (little-endian):
+#                 header      magic, version, kind (OA/SC), capacity, size, slot count and region offsets
+#                 name        UTF-8 name of the hash function, padded to 8 bytes
+#                 buckets     SC only: capacity + 1 record indices (bucket b holds records [buckets[b], buckets[b+1]))
+#                 slots       one fixed-size slot per OA bucket / SC record: state, key and value lengths, full
+#                             hash and the offset of the key/value bytes in the data region
+#                 data        each slot's encoded key immediately followed by its pickled value
+
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+from HashMap.a6_include import hash_function_1, hash_function_2
+from HashMap.hash_functions import fnv1a_hash
+
+
+_MAGIC = b'HMSNAP\x00\x01'
+_VERSION = 1
+# Header fields: magic, version, kind, name length, capacity, size, slot count, buckets/slots/data offsets
+_HEADER = struct.Struct('<8sBB2xIQQQQQQ')
+_SLOT = struct.Struct('<B3xIIQQ')           # state, key length, value length, full hash, data offset
+_BUCKET = struct.Struct('<Q')
+_MAX_HASH = 1 << 64
+_PICKLE_PROTOCOL = 4                        # Fixed so that snapshots don't depend on the writer's Python version
+
+# Map kinds and slot states as stored on disk
+KIND_OA = 0
+KIND_SC = 1
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# Only functions that hash the same way in every process can be saved; builtin-hash based functions (seeded_hash,
+# multiply_shift_hash) change with PYTHONHASHSEED and are deliberately not registered.
+_HASH_FUNCTIONS = {function.__name__: function for function in (hash_function_1, hash_function_2, fnv1a_hash)}
+
+
+def register_hash_function(function: callable) -> None:
+    """
+    Allows maps using a custom hash function to be saved and loaded. The function is stored by name, so it must
+    be registered under the same name (and hash the same way) in the loading process.
+
+    Parameter "function" refers to a hash function that is stable across processes.
+
+    No return - adds the function to the registry.
+    """
+
+    _HASH_FUNCTIONS[function.__name__] = function
+
+
+def stable_hash_name(function: callable) -> str:
+    """
+    Returns the name a hash function is stored under in files, checking that it is registered.
+
+    Parameter "function" refers to the hash function being stored.
+
+    Returns the function's name. Raises ValueError if it is not registered as stable across processes.
+    """
+
+    name = getattr(function, '__name__', None)
+    if _HASH_FUNCTIONS.get(name) is not function:
+        raise ValueError(f"Hash function {name!r} is not registered as stable across processes")
+    return name
+
+
+def stable_hash_function(name: str) -> callable:
+    """
+    Looks up a registered hash function by the name stored in a file.
+
+    Parameter "name" refers to the stored name.
+
+    Returns the hash function. Raises ValueError if no function is registered under the name.
+    """
+
+    function = _HASH_FUNCTIONS.get(name)
+    if function is None:
+        raise ValueError(f"Hash function {name!r} is not registered")
+    return function
+
+
+def _encode_key(key: object) -> bytes:
+    """
+    Encodes a key into the bytes stored (and compared against) in a snapshot: strings as tagged UTF-8, any
+    other key pickled.
+
+    Parameter "key" refers to the key being encoded.
+
+    Returns the key's bytes.
+    """
+
+    if type(key) is str:
+        return b's' + key.encode('utf-8')
+    return b'p' + pickle.dumps(key, _PICKLE_PROTOCOL)
+
+
+def _decode_key(data) -> object:
+    """
+    Decodes a key encoded by _encode_key.
+
+    Parameter "data" refers to the key's bytes (or a buffer slice of them).
+
+    Returns the key.
+    """
+
+    data = bytes(data)
+    if data[:1] == b's':
+        return data[1:].decode('utf-8')
+    return pickle.loads(data[1:])
+
+
+def write_snapshot(path: str, kind: int, capacity: int, size: int, function: callable, records) -> None:
+    """
+    Writes a snapshot file. The file is written next to its destination and swapped in once complete, so an
+    interrupted save never leaves a truncated snapshot behind.
+
+    Parameter "path" refers to the destination file.
+    Parameter "kind" refers to the map layout (KIND_OA or KIND_SC).
+    Parameter "capacity" refers to the map's bucket count.
+    Parameter "size" refers to the map's live key count.
+    Parameter "function" refers to the map's hash function (must be registered, see register_hash_function).
+    Parameter "records" refers to an iterable of (bucket, state, key, value, full hash) tuples in increasing
+    bucket order: every non-empty OA bucket (live or tombstone), or every SC node.
+
+    No return - creates or replaces the file.
+    """
+
+    name = stable_hash_name(function).encode('utf-8')
+
+    # Work out where each region starts: OA has one slot per bucket, SC one per node plus the bucket index
+    slot_count = capacity if kind == KIND_OA else size
+    buckets_offset = _HEADER.size + -(-len(name) // 8) * 8
+    slots_offset = buckets_offset + (_BUCKET.size * (capacity + 1) if kind == KIND_SC else 0)
+    data_offset = slots_offset + _SLOT.size * slot_count
+
+    slots = bytearray(_SLOT.size * slot_count)                     # Unused OA slots stay zeroed (EMPTY)
+    bucket_counts = array('Q', bytes(_BUCKET.size * (capacity + 1))) if kind == KIND_SC else None
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+
+            # Stream the key/value bytes into the data region, filling in each record's slot as it goes
+            file.seek(data_offset)
+            offset = data_offset
+            record_count = 0
+            for bucket, state, key, value, key_hash in records:
+                if not 0 <= key_hash < _MAX_HASH:
+                    raise ValueError(f"Hash of key {key!r} does not fit in 64 bits")
+                key_bytes = _encode_key(key)
+                value_bytes = pickle.dumps(value, _PICKLE_PROTOCOL)
+                file.write(key_bytes)
+                file.write(value_bytes)
+                if kind == KIND_OA:
+                    slot_index = bucket
+                else:
+                    slot_index = record_count
+                    bucket_counts[bucket + 1] += 1
+                _SLOT.pack_into(slots, _SLOT.size * slot_index, state, len(key_bytes), len(value_bytes), key_hash,
+                                offset)
+                offset += len(key_bytes) + len(value_bytes)
+                record_count += 1
+
+            # Then go back and write the header, function name and tables in front of the data
+            file.seek(0)
+            file.write(_HEADER.pack(_MAGIC, _VERSION, kind, len(name), capacity, size, slot_count, buckets_offset,
+                                    slots_offset, data_offset))
+            file.write(name.ljust(buckets_offset - _HEADER.size, b'\x00'))
+            if kind == KIND_SC:
+                for bucket in range(capacity):                      # Running totals turn counts into starts
+                    bucket_counts[bucket + 1] += bucket_counts[bucket]
+                if sys.byteorder == 'big':
+                    bucket_counts.byteswap()
+                file.write(bucket_counts.tobytes())
+            file.write(slots)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:                                          # Never leave a partial file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+
+class SnapshotView:
+    """
+    Read-only hash map served directly from a memory-mapped snapshot file. Lookups hash the key, walk the same
+    probe sequence (OA) or bucket (SC) as the saved map, and decode only the matching entry; nothing is read
+    up front beyond the header. Supports get, contains_key, get_size, get_capacity and the iteration views.
+    """
+
+    def __init__(self, path: str, function: callable = None) -> None:
+        """
+        Opens and maps a snapshot file.
+
+        Parameter "path" refers to the snapshot file.
+        Parameter "function" refers to the hash function to use instead of the registered one with the stored
+        name (it must hash the same way as the function the snapshot was saved with).
+        """
+
+        self._file = open(path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Read and check the header
+        (magic, version, self._kind, name_length, self._capacity, self._size, self._slot_count,
+         self._buckets_offset, self._slots_offset, self._data_offset) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path!r} is not a version {_VERSION} hash map snapshot")
+
+        # Resolve the hash function the snapshot was saved with
+        name = self._buffer[_HEADER.size:_HEADER.size + name_length].decode('utf-8')
+        if function is None:
+            try:
+                function = stable_hash_function(name)
+            except ValueError:
+                self.close()
+                raise
+        self._hash_function = function
+
+    def __enter__(self) -> "SnapshotView":
+        """Support use as a context manager that closes the mapping on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the mapping on leaving a with block."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the snapshot file.
+        """
+        self._buffer.close()
+        self._file.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_kind(self) -> int:
+        """
+        Return the layout of the saved map (KIND_OA or KIND_SC)
+        """
+        return self._kind
+
+    def get_hash_function(self) -> callable:
+        """
+        Return the hash function lookups use
+        """
+        return self._hash_function
+
+    def _find_slot(self, key: object, key_hash: int) -> int:
+        """
+        Finds the slot holding a key by comparing full hashes first and encoded key bytes only on a hash match.
+
+        Parameter "key" refers to the key being searched for.
+        Parameter "key_hash" refers to the key's full hash.
+
+        Returns the byte offset of the key's live slot, or None if it is not in the snapshot.
+        """
+
+        buffer, slot_size, slots_offset = self._buffer, _SLOT.size, self._slots_offset
+        key_bytes = None
+
+        # OA: follow the key's quadratic probe sequence (og_index + i**2) until an empty slot
+        if self._kind == KIND_OA:
+            og_index = key_hash % self._capacity
+            candidates = ((og_index + quad_factor**2) % self._capacity for quad_factor in range(self._capacity))
+
+        # SC: scan the records of the key's bucket
+        else:
+            bucket = key_hash % self._capacity
+            start, end = struct.unpack_from('<QQ', buffer, self._buckets_offset + _BUCKET.size * bucket)
+            candidates = range(start, end)
+
+        for index in candidates:
+            offset = slots_offset + slot_size * index
+            state, key_length, _, slot_hash, data = _SLOT.unpack_from(buffer, offset)
+            if state == EMPTY:
+                return None
+            if state == LIVE and slot_hash == key_hash:
+                if key_bytes is None:
+                    key_bytes = _encode_key(key)
+                if key_length == len(key_bytes) and buffer[data:data + key_length] == key_bytes:
+                    return offset
+        return None
+
+    def _read_value(self, offset: int) -> object:
+        """
+        Decodes the value of the slot at a byte offset.
+        """
+        _, key_length, value_length, _, data = _SLOT.unpack_from(self._buffer, offset)
+        return pickle.loads(self._buffer[data + key_length:data + key_length + value_length])
+
+    def get(self, key: object) -> object:
+        """
+        Returns the value associated with a given key, and None if it is not in the snapshot.
+
+        Parameter "key" refers to the key being searched for.
+        """
+
+        offset = self._find_slot(key, self._hash_function(key))
+        return None if offset is None else self._read_value(offset)
+
+    def contains_key(self, key: object) -> bool:
+        """
+        Returns True if the snapshot contains a key and False if it does not.
+
+        Parameter "key" is the key being searched for.
+        """
+
+        return self._find_slot(key, self._hash_function(key)) is not None
+
+    def entries(self):
+        """
+        Lazily yields every live entry of the snapshot in slot order, decoding one at a time.
+
+        No parameters.
+
+        Returns a generator of (key, value, full hash) tuples.
+        """
+
+        buffer = self._buffer
+        for index in range(self._slot_count):
+            state, key_length, value_length, key_hash, data = _SLOT.unpack_from(
+                buffer, self._slots_offset + _SLOT.size * index)
+            if state == LIVE:
+                yield (_decode_key(buffer[data:data + key_length]),
+                       pickle.loads(buffer[data + key_length:data + key_length + value_length]), key_hash)
+
+    def __len__(self) -> int:
+        """
+        Return size of map (supports len(view))
+        """
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the snapshot
+        """
+        return self.keys()
+
+    def keys(self):
+        """
+        Lazily yields every key in the snapshot.
+        """
+        for key, _, _ in self.entries():
+            yield key
+
+    def values(self):
+        """
+        Lazily yields every value in the snapshot.
+        """
+        for _, value, _ in self.entries():
+            yield value
+
+    def items(self):
+        """
+        Lazily yields every key/value pair in the snapshot.
+        """
+        for key, value, _ in self.entries():
+            yield key, value
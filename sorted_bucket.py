@@ -0,0 +1,163 @@
+# Description:  Sorted-array bucket for the SC hash map. A chain that grows past the map's treeify threshold (from
+#               colliding anagrams under hash_function_1, skewed or adversarial keys) is converted into one of
+#               these, so that looking a key up in it takes a binary search instead of a walk of the whole
+#               chain. Supports the same methods as LinkedList and holds the same SLNode objects.
+
+
+from bisect import bisect_left
+from itertools import chain
+
+from HashMap.a6_include import LinkedList, SLNode
+
+
+# Key types with a total order that agrees with ==, so a sorted array of them can be binary searched
+# (floats are left out because of NaN, and bool is its own type here)
+_ORDERED_TYPES = (str, int, bytes)
+
+
+class SortedBucket:
+    """
+    Bucket whose keys of one ordered type (str, int or bytes) are kept in a sorted array. Keys of any other
+    type cannot be ordered against them, so they sit in a small unsorted overflow list instead (and are
+    matched by equality against both lists, since e.g. 1.0 and True equal the int 1).
+    Supported methods are: insert, insert_node, remove, contains, find, length, iterator
+    """
+
+    __slots__ = ('_kind', '_keys', '_nodes', '_others')
+
+    def __init__(self, kind: type) -> None:
+        """
+        Initialize an empty bucket sorting keys of the given type.
+        """
+        self._kind = kind
+        self._keys = []                                             # Sorted keys, parallel to _nodes
+        self._nodes = []
+        self._others = []                                           # Nodes whose keys are of another type
+
+    @classmethod
+    def from_list(cls, bucket: LinkedList, min_sorted: int) -> "SortedBucket":
+        """
+        Builds a sorted bucket holding the nodes of a chain, sorting on the most common ordered key type.
+
+        Parameter "bucket" refers to the chain being converted.
+        Parameter "min_sorted" refers to the fewest keys of that type worth sorting.
+
+        Returns the new bucket, or None if too few keys could be sorted (the chain should stay as it is).
+        """
+
+        # Pick the ordered type most of the keys share
+        nodes = list(bucket)
+        counts = {}
+        for node in nodes:
+            if type(node.key) in _ORDERED_TYPES:
+                counts[type(node.key)] = counts.get(type(node.key), 0) + 1
+        if not counts or max(counts.values()) < min_sorted:
+            return None
+        kind = max(counts, key=counts.get)
+
+        # Sort that type's nodes, and keep the rest aside
+        sorted_bucket = cls(kind)
+        for node in nodes:
+            node.next = None
+            if type(node.key) is kind:
+                sorted_bucket._nodes.append(node)
+            else:
+                sorted_bucket._others.append(node)
+        sorted_bucket._nodes.sort(key=lambda node: node.key)
+        sorted_bucket._keys = [node.key for node in sorted_bucket._nodes]
+        return sorted_bucket
+
+    def to_list(self) -> LinkedList:
+        """
+        Returns a chain holding the bucket's nodes, for when the bucket has shrunk back below the threshold.
+        """
+        bucket = LinkedList()
+        for node in self:
+            bucket.insert_node(node)
+        return bucket
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SORTED [' + ' -> '.join(str(node) for node in self) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the bucket's nodes (sorted ones first)."""
+        return chain(self._nodes, self._others)
+
+    def insert(self, key: str, value: object, key_hash: int = None) -> None:
+        """Insert a new node for a key that is not in the bucket."""
+        self.insert_node(SLNode(key, value, None, key_hash))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node (whose key is not in the bucket) in at its sorted position."""
+        node.next = None
+        if type(node.key) is self._kind:
+            index = bisect_left(self._keys, node.key)
+            self._keys.insert(index, node.key)
+            self._nodes.insert(index, node)
+        else:
+            self._others.append(node)
+
+    def _index(self, key: str) -> int:
+        """
+        Returns the index of a key in the sorted array, or -1 if it is not there.
+        """
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return -1
+
+    def _locate(self, key: str) -> tuple:
+        """
+        Finds the node whose key equals a given key. Keys of different types can still be equal (1 == 1.0 ==
+        True), so a key of another type is compared against the sorted nodes one by one, and a key of the sorted
+        type that isn't in the sorted array is also looked for in the overflow list.
+
+        Parameter "key" refers to the key being searched for.
+
+        Returns a (list, index) pair locating the node in the sorted or overflow list, or None if no match.
+        """
+
+        if type(key) is self._kind:
+            index = self._index(key)
+            if index >= 0:
+                return self._nodes, index
+        else:
+            for index in range(len(self._nodes)):
+                if self._nodes[index].key == key:
+                    return self._nodes, index
+        for index in range(len(self._others)):
+            if self._others[index].key == key:
+                return self._others, index
+        return None
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove the node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+
+        location = self._locate(key)
+        if location is None:
+            return False
+        nodes, index = location
+        if nodes is self._nodes:
+            del self._keys[index]
+        del nodes[index]
+        return True
+
+    def contains(self, key: str) -> SLNode:
+        """Return node with matching key, or None if no match"""
+        location = self._locate(key)
+        return None if location is None else location[0][location[1]]
+
+    def find(self, key: str, move_to_front: bool = False) -> SLNode:
+        """
+        Return node with matching key, or None if no match. Nodes have fixed positions in a sorted bucket,
+        so move_to_front is ignored.
+        """
+        return self.contains(key)
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes) + len(self._others)
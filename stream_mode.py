@@ -0,0 +1,251 @@
+# Description:  Streaming counterparts of find_mode for inputs that don't fit in a DynamicArray. Each counter
+#               consumes any iterator/generator one element at a time and reports the top-k elements with their
+#               frequencies and error bounds: an exact counter backed by the counting HashMap, plus Space-Saving
+#               and Count-Min sketch counters that work within a fixed memory budget.
+
+
+import heapq
+import math
+from itertools import count as _sequence
+
+from HashMap.a6_include import DynamicArray
+from HashMap.hash_functions import seeded_hash
+from HashMap.public_hash_map_sc import HashMap
+
+
+class _MinTracker:
+    """
+    Tracks the smallest count among a bounded set of keys using a heap with lazy invalidation: every count
+    change pushes a fresh (count, tiebreak, key) triple, and stale triples are skipped when the minimum is read.
+    The heap is rebuilt from the live counts whenever it grows past a few times the number of keys, so memory
+    stays bounded. The tiebreak keeps keys of different types from ever being compared.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty tracker."""
+        self._heap = []
+        self._sequence = _sequence()
+
+    def push(self, key: object, count: int, counts: HashMap) -> None:
+        """
+        Record a key's new count.
+
+        Parameter "counts" refers to the map holding the current count of every tracked key (used to rebuild).
+        """
+        heapq.heappush(self._heap, (count, next(self._sequence), key))
+        if len(self._heap) > 4 * counts.get_size() + 16:
+            self._heap = [(entry[0], next(self._sequence), key) for key, entry in counts.items()]
+            heapq.heapify(self._heap)
+
+    def pop_min(self, counts: HashMap) -> tuple:
+        """Remove and return the (count, key) pair of the currently smallest tracked key."""
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            entry = counts.get(key)
+            if entry is not None and entry[0] == count:
+                return count, key
+
+    def peek_min(self, counts: HashMap) -> tuple:
+        """Return the (count, key) pair of the currently smallest tracked key without removing it."""
+        while True:
+            count, _, key = self._heap[0]
+            entry = counts.get(key)
+            if entry is not None and entry[0] == count:
+                return count, key
+            heapq.heappop(self._heap)
+
+
+def _top_k(pairs: list, k: int) -> DynamicArray:
+    """
+    Picks the k (key, count, error) tuples with the highest counts.
+
+    Parameter "pairs" refers to an iterable of (key, count, error) tuples.
+    Parameter "k" refers to the number of tuples returned.
+
+    Returns a dynamic array of the top tuples, highest count first.
+    """
+
+    top = DynamicArray()
+    for triple in heapq.nlargest(k, pairs, key=lambda triple: triple[1]):
+        top.append(triple)
+    return top
+
+
+class ExactCounter:
+    """
+    Exact streaming counter: one count per distinct element in a counting HashMap (memory grows with the
+    number of distinct elements). Reported errors are always 0.
+    """
+
+    def __init__(self, function: callable = hash) -> None:
+        """
+        Parameter "function" refers to the counting HashMap's hash function (the builtin hash accepts any
+        hashable element).
+        """
+        self._counts = HashMap(11, function)
+        self._total = 0
+
+    def add(self, key: object, count: int = 1) -> None:
+        """Count an element (count times)."""
+        self._counts.increment(key, count, move_to_front=True)
+        self._total += count
+
+        # SC maps don't grow on put, so double the table to keep chains short as distinct elements arrive
+        if self._counts.get_size() > self._counts.get_capacity():
+            self._counts.resize_table(2 * self._counts.get_capacity())
+
+    def total(self) -> int:
+        """Return the number of elements counted so far."""
+        return self._total
+
+    def top(self, k: int = 1) -> DynamicArray:
+        """Return the k most frequent elements as (key, frequency, error bound) tuples, highest first."""
+        return _top_k(((key, count, 0) for key, count in self._counts.items()), k)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter counter (Metwally et al.) using a fixed number of counters. When a new element
+    arrives and every counter is taken, the element with the smallest count is replaced and the new one
+    inherits that count plus one. Counts never underestimate; each reported error bound is the count the
+    element inherited, which is at most total / counters. Any element more frequent than total / counters is
+    guaranteed to be tracked.
+    """
+
+    def __init__(self, counters: int = 1000, function: callable = hash) -> None:
+        """
+        Parameter "counters" refers to the number of elements tracked at once (the memory budget).
+        Parameter "function" refers to the counter map's hash function.
+        """
+        if counters < 1:
+            raise ValueError("SpaceSaving needs at least one counter")
+        self._capacity = counters
+        self._counts = HashMap(2 * counters, function)              # key -> [count, error]
+        self._min = _MinTracker()
+        self._total = 0
+
+    def add(self, key: object, count: int = 1) -> None:
+        """Count an element (count times)."""
+        self._total += count
+        entry = self._counts.get(key)
+
+        # Tracked element, or a free counter: just count it
+        if entry is None and self._counts.get_size() < self._capacity:
+            entry = [0, 0]
+            self._counts.put(key, entry)
+        if entry is not None:
+            entry[0] += count
+            self._min.push(key, entry[0], self._counts)
+            return
+
+        # Otherwise the new element takes over the smallest counter, inheriting its count as error
+        min_count, min_key = self._min.pop_min(self._counts)
+        self._counts.remove(min_key)
+        self._counts.put(key, [min_count + count, min_count])
+        self._min.push(key, min_count + count, self._counts)
+
+    def total(self) -> int:
+        """Return the number of elements counted so far."""
+        return self._total
+
+    def top(self, k: int = 1) -> DynamicArray:
+        """Return the k most frequent elements as (key, estimated frequency, error bound) tuples, highest first."""
+        return _top_k(((key, entry[0], entry[1]) for key, entry in self._counts.items()), k)
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch heavy-hitter counter (Cormode & Muthukrishnan): depth rows of width counters, each row
+    indexed by its own seeded hash. An element's estimate is the minimum of its counters, which never
+    underestimates and overestimates by at most epsilon * total with probability 1 - delta. The k elements with
+    the highest estimates seen so far are kept as top-k candidates.
+    """
+
+    def __init__(self, k: int = 1, epsilon: float = 0.001, delta: float = 0.01) -> None:
+        """
+        Parameter "k" refers to the number of candidate heavy hitters kept.
+        Parameter "epsilon" refers to the error bound as a fraction of the total count (sets the row width).
+        Parameter "delta" refers to the probability of exceeding the error bound (sets the number of rows).
+        """
+        if k < 1 or not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("CountMinSketch needs k >= 1 and epsilon, delta between 0 and 1")
+        self._k = k
+        self._epsilon = epsilon
+        self._width = math.ceil(math.e / epsilon)
+        self._rows = [[0] * self._width for _ in range(math.ceil(math.log(1 / delta)))]
+        self._hashes = [seeded_hash(row) for row in range(len(self._rows))]
+        self._candidates = HashMap(2 * k, hash)                     # key -> [estimate]
+        self._min = _MinTracker()
+        self._total = 0
+
+    def add(self, key: object, count: int = 1) -> None:
+        """Count an element (count times)."""
+        self._total += count
+
+        # Bump the element's counter in every row; its estimate is the smallest of them
+        estimate = None
+        for row in range(len(self._rows)):
+            index = self._hashes[row](key) % self._width
+            self._rows[row][index] += count
+            if estimate is None or self._rows[row][index] < estimate:
+                estimate = self._rows[row][index]
+
+        # Keep the element as a candidate if it is already one, or if it beats the weakest candidate
+        entry = self._candidates.get(key)
+        if entry is None:
+            if self._candidates.get_size() >= self._k:
+                if estimate <= self._min.peek_min(self._candidates)[0]:
+                    return
+                self._candidates.remove(self._min.pop_min(self._candidates)[1])
+            entry = [0]
+            self._candidates.put(key, entry)
+        entry[0] = estimate
+        self._min.push(key, estimate, self._candidates)
+
+    def total(self) -> int:
+        """Return the number of elements counted so far."""
+        return self._total
+
+    def estimate(self, key: object) -> int:
+        """Return the sketch's (over)estimate of an element's frequency."""
+        return min(self._rows[row][self._hashes[row](key) % self._width] for row in range(len(self._rows)))
+
+    def top(self, k: int = None) -> DynamicArray:
+        """
+        Return the k (at most the constructor's k) highest-estimate elements as (key, estimated frequency, error
+        bound) tuples, highest first. The error bound is epsilon * total, rounded up.
+        """
+        error = math.ceil(self._epsilon * self._total)
+        return _top_k(((key, entry[0], error) for key, entry in self._candidates.items()),
+                      self._k if k is None else k)
+
+
+def find_mode_stream(stream, k: int = 1, method: str = "exact", counters: int = 1000,
+                     epsilon: float = 0.001, delta: float = 0.01) -> DynamicArray:
+    """
+    Streaming counterpart of find_mode: consumes any iterable (including generators) once and returns its
+    k most frequent elements, without ever holding the whole input.
+
+    Parameter "stream" refers to the iterable of elements being analyzed.
+    Parameter "k" refers to the number of top elements returned.
+    Parameter "method" refers to the counter used: "exact" (memory grows with the distinct elements),
+    "space_saving" (a fixed number of counters) or "count_min" (a fixed-size sketch).
+    Parameter "counters" refers to the Space-Saving memory budget (ignored by the other methods).
+    Parameters "epsilon" and "delta" refer to the Count-Min error bound and failure probability.
+
+    Returns a dynamic array of (element, frequency, error bound) tuples, most frequent first. Frequencies are
+    exact for "exact" and never underestimated by the approximate methods.
+    """
+
+    if method == "exact":
+        counter = ExactCounter()
+    elif method == "space_saving":
+        counter = SpaceSaving(max(counters, k))
+    elif method == "count_min":
+        counter = CountMinSketch(k, epsilon, delta)
+    else:
+        raise ValueError(f"Unknown find_mode_stream method: {method!r}")
+
+    for key in stream:
+        counter.add(key)
+    return counter.top(k)
@@ -0,0 +1,60 @@
+# Description:  Tests for batch hashing (hash_functions.hash_many) and the bulk operations built on it.
+
+
+import random
+
+import pytest
+
+from HashMap import hash_functions
+from HashMap.a6_include import DynamicArray, as_list, hash_function_1, hash_function_2
+from HashMap.hash_functions import hash_many
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+from HashMap.public_hash_map_sc import HashMap as SCHashMap, find_mode
+
+
+def _random_key(rng: random.Random) -> str:
+    """Returns a random key mixing ASCII, BMP, non-BMP and lone surrogate code points (or an empty key)."""
+    alphabet = ('a', 'z', 'é', '中', '\U0001f600', '\U00010348', '\ud800', '\udfff')
+    return ''.join(rng.choice(alphabet) for _ in range(rng.choice((0, 0, 1, 2, 5, 12))))
+
+
+@pytest.fixture(params=("vectorized", "iterators"))
+def batch_path(request, monkeypatch):
+    """Runs a test with NumPy (when installed) and again with the C-level iterator fallback."""
+    if request.param == "vectorized" and hash_functions.numpy is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "iterators":
+        monkeypatch.setattr(hash_functions, "numpy", None)
+    return request.param
+
+
+@pytest.mark.parametrize("function", (hash_function_1, hash_function_2))
+def test_hash_many_matches_scalar_functions(batch_path, function):
+    rng = random.Random(10)
+    for _ in range(200):
+        keys = [_random_key(rng) for _ in range(rng.randrange(1, 30))]
+        if rng.random() < 0.5:
+            keys += [''] * rng.randrange(1, 4)                      # Trailing empty keys
+        assert hash_many(function, keys) == [function(key) for key in keys]
+
+
+def test_hash_many_edge_cases(batch_path):
+    assert hash_many(hash_function_1, ['ab', '']) == [195, 0]
+    assert hash_many(hash_function_1, ['', '', 'ab', '', 'c', '']) == [0, 0, 195, 0, 99, 0]
+    assert hash_many(hash_function_2, ['', '']) == [0, 0]
+    assert hash_many(hash_function_2, ['\ud800x']) == [hash_function_2('\ud800x')]
+
+
+@pytest.mark.parametrize("map_class", (OAHashMap, SCHashMap))
+def test_bulk_operations_with_empty_keys(batch_path, map_class):
+    hash_map = map_class(11, hash_function_1)
+    hash_map.put('ab', 1)
+    hash_map.put_many([('ab', 3), ('', 4)])                         # Batch hashes must match put's
+    assert hash_map.get_size() == 2
+    assert hash_map.get('ab') == 3
+    assert as_list(hash_map.get_many(['ab', ''])) == [3, 4]
+
+
+def test_find_mode_with_trailing_empty_key(batch_path):
+    mode, frequency = find_mode(DynamicArray(['ab', 'cd', 'ab', '']))
+    assert (as_list(mode), frequency) == (['ab'], 2)
@@ -0,0 +1,48 @@
+# Description:  Tests for the append-only journal (journal.py) and its replay into the SC and OA hash maps.
+
+
+import pytest
+
+from HashMap.a6_include import hash_function_1
+from HashMap.journal import Journal
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+from HashMap.public_hash_map_sc import HashMap as SCHashMap
+
+
+def _reopen(map_class, path):
+    """Returns a fresh map rebuilt from the journal at path."""
+    with Journal(str(path)) as journal:
+        return map_class(11, hash_function_1, journal=journal)
+
+
+@pytest.mark.parametrize("map_class", (OAHashMap, SCHashMap))
+@pytest.mark.parametrize("rehash_step", (None, 4))
+def test_compaction_during_resize_keeps_every_entry(tmp_path, map_class, rehash_step):
+    # compact_every is crossed by the OA map's growth resizes while the keys go in, and by one of the explicit
+    # resizes at the end for both maps
+    path = tmp_path / "map.journal"
+    with Journal(str(path), sync_every=1, compact_every=4) as journal:
+        hash_map = map_class(11, hash_function_1, rehash_step=rehash_step, journal=journal)
+        for num in range(100):
+            hash_map.put('key' + str(num), num)
+        for factor in (2, 3, 4, 5):                                     # Four in a row cross compact_every
+            hash_map.resize_table(hash_map.get_size() * factor)
+        expected = dict(hash_map.items())
+
+    reopened = _reopen(map_class, path)
+    assert reopened.get_size() == 100
+    assert dict(reopened.items()) == expected
+
+
+@pytest.mark.parametrize("map_class", (OAHashMap, SCHashMap))
+def test_compaction_during_shrink_keeps_every_entry(tmp_path, map_class):
+    path = tmp_path / "map.journal"
+    with Journal(str(path), sync_every=1, compact_every=3) as journal:
+        hash_map = map_class(11, hash_function_1, shrink_load=0.2, journal=journal)
+        for num in range(200):
+            hash_map.put('key' + str(num), num)
+        for num in range(190):
+            hash_map.remove('key' + str(num))
+
+    reopened = _reopen(map_class, path)
+    assert dict(reopened.items()) == {'key' + str(num): num for num in range(190, 200)}
@@ -0,0 +1,86 @@
+# Description:  Tests for the opt-in map metrics (metrics.py).
+
+
+import pytest
+
+from HashMap.a6_include import hash_function_2
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+from HashMap.public_hash_map_sc import HashMap as SCHashMap
+
+
+MAPS = [
+    pytest.param(lambda: SCHashMap(11, hash_function_2), id="sc"),
+    pytest.param(lambda: OAHashMap(11, hash_function_2), id="oa"),
+]
+
+
+@pytest.mark.parametrize("make_map", MAPS)
+def test_lookups_count_hits_and_misses(make_map):
+    hash_map = make_map()
+    for index in range(5):
+        hash_map.put('key%d' % index, index)
+    metrics = hash_map.enable_metrics()
+    hash_map.get('key0')
+    hash_map.get('missing')
+    hash_map.contains_key('key1')
+    hash_map.contains_key('missing')
+    hash_map.get_many(['key2', 'key3', 'missing', 'key4'])
+    report = metrics.report()
+    assert (report["hits"], report["misses"]) == (5, 3)
+    assert report["hit_ratio"] == 5 / 8
+
+
+@pytest.mark.parametrize("make_map", MAPS)
+def test_lookups_are_not_counted_without_metrics(make_map):
+    hash_map = make_map()
+    hash_map.put('key', 1)
+    hash_map.get('key')
+    hash_map.get_many(['key', 'missing'])
+    metrics = hash_map.enable_metrics()
+    assert (metrics.hits, metrics.misses) == (0, 0)
+    hash_map.disable_metrics()
+    hash_map.get('key')
+    assert hash_map.get_metrics() is None
+
+
+def test_oa_load_includes_tombstones():
+    hash_map = OAHashMap(23, hash_function_2, tombstone_ratio=None)
+    for index in range(8):
+        hash_map.put('key%d' % index, index)
+    for index in range(4):
+        hash_map.remove('key%d' % index)
+    report = hash_map.enable_metrics().report()
+    assert report["tombstones"] == 4
+    assert report["size"] == 4
+    assert report["load"] == hash_map.table_load() == 8 / report["capacity"]
+
+
+def test_sc_load_is_size_over_capacity():
+    hash_map = SCHashMap(11, hash_function_2)
+    for index in range(5):
+        hash_map.put('key%d' % index, index)
+    hash_map.remove('key0')
+    report = hash_map.enable_metrics().report()
+    assert report["tombstones"] == 0
+    assert report["load"] == 4 / report["capacity"]
+
+
+@pytest.mark.parametrize("make_map", MAPS)
+def test_resizes_and_reports_reach_hooks(make_map):
+    hash_map = make_map()
+    metrics = hash_map.enable_metrics()
+    events = []
+    metrics.add_hook(lambda event, data: events.append((event, data)))
+    old_capacity = hash_map.get_capacity()
+    hash_map.resize_table(50)
+    resizes = [data for event, data in events if event == "resize"]
+    assert len(resizes) == 1
+    assert resizes[0].old_capacity == old_capacity
+    assert resizes[0].new_capacity == hash_map.get_capacity()
+
+    report = metrics.publish()
+    assert events[-1] == ("report", report)
+    assert report["resizes"] == [resizes[0]._asdict()]
+
+    metrics.reset()
+    assert metrics.report()["resizes"] == []
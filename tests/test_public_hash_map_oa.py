@@ -0,0 +1,105 @@
+# Description:  Tests for the open addressing hash map (public_hash_map_oa.py).
+
+
+from itertools import permutations
+
+import pytest
+
+from HashMap.a6_include import hash_function_1
+from HashMap.public_hash_map_oa import PROBING_STRATEGIES, HashMap
+
+
+def _anagrams(count: int) -> list:
+    """Returns count distinct anagrams of one key (all equal under hash_function_1)."""
+    return [''.join(letters) for letters, _ in zip(permutations('abcdefg'), range(count))]
+
+
+def test_quadratic_probing_on_prime_capacities_rejects_high_max_load():
+    with pytest.raises(ValueError):
+        HashMap(11, hash_function_1, probing="quadratic", max_load=0.9)
+    with pytest.raises(ValueError):
+        HashMap(11, hash_function_1, probing="quadratic", capacity_mode="schedule", max_load=0.75)
+
+
+@pytest.mark.parametrize("probing, capacity_mode, max_load", [
+    ("quadratic", "prime", 0.5),
+    ("quadratic", "pow2", 0.9),
+    ("linear", "prime", 0.9),
+    ("double", "prime", 0.9),
+    ("double", "pow2", 0.9),
+    ("robin_hood", "prime", 0.9),
+])
+@pytest.mark.parametrize("rehash_step", (None, 2))
+def test_colliding_keys_survive_tight_resizes(probing, capacity_mode, max_load, rehash_step):
+    # Every key shares one home bucket, so rehashing into a barely large enough table needs the whole probe
+    # sequence
+    keys = _anagrams(60)
+    hash_map = HashMap(11, hash_function_1, probing=probing, capacity_mode=capacity_mode, max_load=max_load,
+                       rehash_step=rehash_step)
+    for num, key in enumerate(keys):
+        hash_map.put(key, num)
+    hash_map.resize_table(67)
+    for num, key in enumerate(keys):
+        assert hash_map.get(key) == num
+    assert hash_map.get_size() == 60
+
+
+def test_every_strategy_accepts_its_documented_loads():
+    for probing in PROBING_STRATEGIES:
+        HashMap(11, hash_function_1, probing=probing, max_load=0.5)
+        HashMap(11, hash_function_1, probing=probing, capacity_mode="pow2", max_load=0.9)
+
+
+def test_overwriting_during_iteration_is_allowed():
+    hash_map = HashMap(11, hash_function_1)
+    for num in range(6):
+        hash_map.put('key' + str(num), num)
+    for key in hash_map.keys():
+        hash_map.put(key, 0)
+    for key, _ in hash_map.items():
+        hash_map.increment(key)
+    assert sorted(hash_map.items()) == [('key' + str(num), 1) for num in range(6)]
+
+
+@pytest.mark.parametrize("view", ("keys", "values", "items"))
+@pytest.mark.parametrize("change", ("insert", "remove"))
+def test_changing_the_keys_during_iteration_raises(view, change):
+    hash_map = HashMap(11, hash_function_1)
+    for num in range(6):
+        hash_map.put('key' + str(num), num)
+    with pytest.raises(RuntimeError):
+        for _ in getattr(hash_map, view)():
+            if change == "insert":
+                hash_map.put('new', 0)
+            else:
+                hash_map.remove('key3')
+
+
+def test_operations_in_the_middle_of_an_incremental_resize():
+    hash_map = HashMap(97, hash, rehash_step=1)
+    reference = {}
+    for num in range(40):
+        hash_map.put('key' + str(num), num)
+        reference['key' + str(num)] = num
+    hash_map.resize_table(197)
+    assert hash_map._old_buckets is not None
+
+    # Each operation migrates one old bucket, so every check below runs with entries left in the old array
+    hash_map.put('key5', 'overwritten')
+    reference['key5'] = 'overwritten'
+    hash_map.put('new', 'added')
+    reference['new'] = 'added'
+    hash_map.remove('key7')
+    del reference['key7']
+    hash_map.remove('missing')
+    assert hash_map._old_buckets is not None
+    assert hash_map.get_size() == len(reference)
+    for key, value in reference.items():
+        assert hash_map.get(key) == value
+    assert hash_map.contains_key('key7') is False
+    assert hash_map.contains_key('key5') is True
+    assert hash_map._old_buckets is not None
+
+    # Draining the rest leaves the same contents
+    assert dict(hash_map.items()) == reference
+    assert hash_map._old_buckets is None
@@ -0,0 +1,41 @@
+# Description:  Tests for the compact open addressing backend (public_hash_map_oa_compact.py).
+
+
+import gc
+import weakref
+
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+from HashMap.public_hash_map_oa_compact import HashMap
+
+
+class _Value:
+    """Weak-referenceable value for checking what the map keeps alive."""
+
+
+def test_remove_releases_key_and_value():
+    hash_map = HashMap(11, hash, tombstone_ratio=None)
+    key, value = ('removed', 1), _Value()
+    hash_map.put(key, value)
+    hash_map.put('kept', 2)
+    value_ref = weakref.ref(value)
+    del value
+    hash_map.remove(key)
+    gc.collect()
+    assert value_ref() is None
+    assert key not in list(hash_map.keys())
+    assert hash_map.get('kept') == 2
+    assert hash_map.contains_key(key) is False
+    assert (hash_map.get_size(), hash_map.stats()["tombstones"]) == (1, 1)
+
+
+def test_resize_matches_the_hash_entry_map_with_tombstones():
+    # 40 puts grow both maps to the same capacity; 30 removals leave 10 live entries and 30 tombstones
+    maps = (HashMap(11, hash, tombstone_ratio=None), OAHashMap(11, hash, tombstone_ratio=None))
+    for hash_map in maps:
+        for num in range(40):
+            hash_map.put('key' + str(num), num)
+        for num in range(30):
+            hash_map.remove('key' + str(num))
+        hash_map.resize_table(23)
+    assert maps[0].get_capacity() == maps[1].get_capacity() == 23
+    assert sorted(maps[0].items()) == sorted(maps[1].items()) == [('key' + str(num), num) for num in range(30, 40)]
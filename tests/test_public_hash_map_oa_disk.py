@@ -0,0 +1,48 @@
+# Description:  Tests for the disk-backed open addressing hash map (public_hash_map_oa_disk.py).
+
+
+import os
+
+from HashMap.public_hash_map_oa_disk import HashMap
+
+
+def _log_size(hash_map: HashMap) -> int:
+    """Returns the size of the map's current value log in bytes."""
+    return os.path.getsize(hash_map._log_path(hash_map._generation))
+
+
+def test_overwrites_do_not_grow_the_log_without_bound(tmp_path):
+    path = str(tmp_path / "map.db")
+    with HashMap(path) as hash_map:
+        for num in range(20_000):
+            hash_map.put('key', 'value' + str(num))
+        hash_map.flush()
+        assert _log_size(hash_map) < 2 * 65536
+        assert hash_map.get('key') == 'value19999'
+        dead_bytes = hash_map._dead_bytes
+
+    # The dead byte count is rebuilt from the files on reopening
+    with HashMap(path) as hash_map:
+        assert hash_map.get('key') == 'value19999'
+        assert hash_map._dead_bytes == dead_bytes
+
+
+def test_removals_count_as_dead_records(tmp_path):
+    with HashMap(str(tmp_path / "map.db"), tombstone_ratio=None) as hash_map:
+        for num in range(5_000):
+            hash_map.put(str(num), 'x' * 40)
+            hash_map.remove(str(num - 1))
+        hash_map.flush()
+        assert hash_map.get_size() == 1
+        assert _log_size(hash_map) < 2 * 65536
+
+
+def test_resize_below_live_plus_tombstones(tmp_path):
+    with HashMap(str(tmp_path / "map.db"), capacity=101, tombstone_ratio=None) as hash_map:
+        for num in range(40):
+            hash_map.put(str(num), num)
+        for num in range(30):
+            hash_map.remove(str(num))
+        hash_map.resize_table(23)                                   # 10 live entries, 30 tombstones
+        assert hash_map.get_capacity() == 23
+        assert sorted(hash_map.items()) == [(str(num), num) for num in range(30, 40)]
@@ -0,0 +1,90 @@
+# Description:  Tests for the separate chaining hash map (public_hash_map_sc.py).
+
+
+import pytest
+
+from HashMap.a6_include import DynamicArray, hash_function_1
+from HashMap.public_hash_map_sc import HashMap, find_mode, find_mode_parallel
+
+
+def test_get_list_of_an_empty_bucket_is_the_maps_own():
+    first, second = HashMap(11, hash_function_1), HashMap(11, hash_function_1)
+    first.get_list(3).insert('ghost', 1)
+    assert first.get_list(3).contains('ghost') is not None
+    assert second.get('ghost') is None
+    assert list(second.keys()) == []
+    assert second.get_list(3).length() == 0
+
+
+def test_overwriting_during_iteration_is_allowed():
+    hash_map = HashMap(11, hash_function_1)
+    for num in range(6):
+        hash_map.put('key' + str(num), num)
+    for key in hash_map.keys():
+        hash_map.put(key, 0)
+    for key, _ in hash_map.items():
+        hash_map.increment(key)
+    assert sorted(hash_map.items()) == [('key' + str(num), 1) for num in range(6)]
+
+
+@pytest.mark.parametrize("view", ("keys", "values", "items"))
+@pytest.mark.parametrize("change", ("insert", "remove"))
+def test_changing_the_keys_during_iteration_raises(view, change):
+    hash_map = HashMap(11, hash_function_1)
+    for num in range(6):
+        hash_map.put('key' + str(num), num)
+    with pytest.raises(RuntimeError):
+        for _ in getattr(hash_map, view)():
+            if change == "insert":
+                hash_map.put('new', 0)
+            else:
+                hash_map.remove('key3')
+
+
+def test_operations_in_the_middle_of_an_incremental_resize():
+    hash_map = HashMap(101, hash, rehash_step=1)
+    reference = {}
+    for num in range(40):
+        hash_map.put('key' + str(num), num)
+        reference['key' + str(num)] = num
+    hash_map.resize_table(211)
+    assert hash_map._old_buckets is not None
+
+    # Each operation migrates one old bucket, so every check below runs with entries left in the old array
+    hash_map.put('key5', 'overwritten')
+    reference['key5'] = 'overwritten'
+    hash_map.put('new', 'added')
+    reference['new'] = 'added'
+    hash_map.remove('key7')
+    del reference['key7']
+    hash_map.remove('missing')
+    assert hash_map._old_buckets is not None
+    assert hash_map.get_size() == len(reference)
+    for key, value in reference.items():
+        assert hash_map.get(key) == value
+    assert hash_map.contains_key('key7') is False
+    assert hash_map.contains_key('key5') is True
+    assert hash_map._old_buckets is not None
+
+    # Draining the rest leaves the same contents
+    assert dict(hash_map.items()) == reference
+    assert hash_map._old_buckets is None
+
+
+def _sorted_mode(result: tuple) -> tuple:
+    """Returns a find_mode result with its modes as a sorted list (tied modes may come out in any order)."""
+    modes, frequency = result
+    return sorted(modes[index] for index in range(modes.length())), frequency
+
+
+@pytest.mark.parametrize("values, chunk_size", [
+    (['a', 'b', 'a', 'b', 'c'] * 40, 7),                           # Tied modes split across chunks
+    (['x'] * 30 + ['y'] * 29 + ['z'] * 30, 10),
+    ([str(index % 13) for index in range(200)], 16),               # Every key tied
+    ([], 4),                                                       # Empty array
+    (['a', 'b', 'b'], 100),                                        # Smaller than one chunk
+])
+def test_find_mode_parallel_matches_find_mode(values, chunk_size):
+    expected = _sorted_mode(find_mode(DynamicArray(values)))
+    assert _sorted_mode(find_mode_parallel(DynamicArray(values), workers=2, chunk_size=chunk_size)) == expected
+    assert _sorted_mode(find_mode_parallel(DynamicArray(values), workers=2)) == expected
@@ -0,0 +1,83 @@
+# Description:  Tests for the bounded cache on the separate chaining map (public_hash_map_sc_cache.py).
+
+
+from HashMap.public_hash_map_sc_cache import HashMap
+
+
+class _Clock:
+    """Manually advanced time source for TTL tests."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = HashMap(max_entries=3)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key.upper())
+    assert cache.get('a') == 'A'                                    # 'b' is now the least recently used
+    cache.put('d', 'D')
+    assert sorted(cache.keys()) == ['a', 'c', 'd']
+    cache.put('c', 'C2')                                            # An update is a use too, leaving 'a' oldest
+    cache.put('e', 'E')
+    assert sorted(cache.keys()) == ['c', 'd', 'e']
+
+
+def test_clock_gives_referenced_entries_a_second_chance():
+    cache = HashMap(max_entries=3, policy="clock")
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key)
+    cache.get('a')                                                  # Sets a's reference bit
+    cache.put('d', 'd')                                             # The hand clears a's bit and evicts b
+    assert sorted(cache.keys()) == ['a', 'c', 'd']
+    cache.put('e', 'e')                                             # a has used its second chance; c goes next
+    assert sorted(cache.keys()) == ['a', 'd', 'e']
+
+
+def test_ttl_expiry_with_an_injected_clock():
+    clock = _Clock()
+    cache = HashMap(max_entries=2, ttl=10, clock=clock)
+    cache.put('a', 1)
+    cache.put('b', 2, ttl=100)
+    clock.now = 5
+    assert cache.contains_key('a') is True
+    assert cache.stats()["hits"] == 0                               # contains_key is neither a hit nor a use
+    cache.put('c', 3)                                               # So 'a' is still the least recently used
+    assert cache.contains_key('a') is False
+    clock.now = 20
+    assert cache.get('c') is None                                   # Expired after its default ttl of 10
+    assert cache.get('b') == 2
+    assert cache.stats()["expirations"] == 1
+    cache.put('d', 4, ttl=1)
+    clock.now = 30
+    assert cache.purge_expired() == 1
+    assert list(cache.keys()) == ['b']
+
+
+def test_max_bytes_evicts_until_within_budget():
+    cache = HashMap(max_bytes=10, sizeof=lambda key, value: len(value))
+    cache.put('a', 'xxxx')
+    cache.put('b', 'xxxx')
+    cache.put('c', 'xxxx')
+    assert sorted(cache.keys()) == ['b', 'c']
+    cache.put('b', 'xxxxxxxx')                                      # Growing b to 8 bytes pushes c out
+    assert list(cache.keys()) == ['b']
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 2
+
+
+def test_stats_count_hits_misses_and_evictions():
+    cache = HashMap(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.get('a')
+    cache.get('missing')
+    cache.put('c', 3)
+    cache.get('b')                                                  # Evicted by 'c'
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 2, 1, 2)
+    assert stats["hit_ratio"] == 0.5
@@ -0,0 +1,92 @@
+# Description:  Tests for binary snapshots (snapshot.py) written by HashMap.save and read by HashMap.load.
+
+
+from itertools import permutations
+
+import pytest
+
+from HashMap.a6_include import hash_function_1, hash_function_2
+from HashMap.public_hash_map_oa import HashMap as OAHashMap
+from HashMap.public_hash_map_sc import HashMap as SCHashMap
+from HashMap.snapshot import SnapshotView
+from HashMap.sorted_bucket import SortedBucket
+
+
+def _check_loaded(loaded, expected: dict, missing) -> None:
+    """Checks a loaded map or view against the pairs it should hold."""
+    assert loaded.get_size() == len(expected)
+    assert dict(loaded.items()) == expected
+    for key, value in expected.items():
+        assert loaded.get(key) == value
+        assert loaded.contains_key(key) is True
+    for key in missing:
+        assert loaded.get(key) is None
+        assert loaded.contains_key(key) is False
+
+
+@pytest.mark.parametrize("use_mmap", (True, False))
+def test_oa_round_trip_with_tombstones(tmp_path, use_mmap):
+    hash_map = OAHashMap(11, hash_function_2, tombstone_ratio=None)
+    for num in range(60):
+        hash_map.put('key' + str(num), [num, 'value'])
+    removed = ['key' + str(num) for num in range(0, 60, 3)]
+    for key in removed:
+        hash_map.remove(key)
+    assert hash_map.stats()["tombstones"] > 0
+    expected = dict(hash_map.items())
+
+    path = str(tmp_path / "oa.snap")
+    hash_map.save(path)
+    loaded = OAHashMap.load(path, mmap=use_mmap)
+    assert isinstance(loaded, SnapshotView if use_mmap else OAHashMap)
+    assert loaded.get_capacity() == hash_map.get_capacity()
+    _check_loaded(loaded, expected, removed + ['never'])
+    if use_mmap:
+        loaded.close()
+
+
+@pytest.mark.parametrize("use_mmap", (True, False))
+def test_sc_round_trip_with_sorted_buckets(tmp_path, use_mmap):
+    # Anagrams share a bucket under hash_function_1, so those buckets are treeified
+    hash_map = SCHashMap(11, hash_function_1, treeify_threshold=8)
+    for num, letters in enumerate(permutations('abcde')):
+        hash_map.put(''.join(letters), num)
+    assert any(isinstance(hash_map._buckets[index], SortedBucket) for index in range(hash_map.get_capacity()))
+    expected = dict(hash_map.items())
+
+    path = str(tmp_path / "sc.snap")
+    hash_map.save(path)
+    loaded = SCHashMap.load(path, mmap=use_mmap)
+    _check_loaded(loaded, expected, ['edcbf', 'abcd'])
+    if use_mmap:
+        loaded.close()
+
+
+def test_unregistered_hash_function_is_rejected(tmp_path):
+    hash_map = OAHashMap(11, lambda key: len(key))
+    hash_map.put('key', 1)
+    with pytest.raises(ValueError, match="not registered"):
+        hash_map.save(str(tmp_path / "map.snap"))
+
+
+@pytest.mark.parametrize("options", ({"capacity_mode": "pow2"}, {"probing": "linear"}, {"probing": "double"},
+                                     {"probing": "robin_hood"}))
+def test_unsupported_oa_maps_are_rejected(tmp_path, options):
+    hash_map = OAHashMap(11, hash_function_2, **options)
+    hash_map.put('key', 1)
+    with pytest.raises(ValueError):
+        hash_map.save(str(tmp_path / "map.snap"))
+
+
+def test_unsupported_sc_maps_are_rejected(tmp_path):
+    hash_map = SCHashMap(11, hash_function_2, capacity_mode="pow2")
+    hash_map.put('key', 1)
+    with pytest.raises(ValueError):
+        hash_map.save(str(tmp_path / "map.snap"))
+
+
+def test_loading_the_other_kind_is_rejected(tmp_path):
+    path = str(tmp_path / "oa.snap")
+    OAHashMap(11, hash_function_2).save(path)
+    with pytest.raises(ValueError):
+        SCHashMap.load(path)
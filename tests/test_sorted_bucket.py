@@ -0,0 +1,58 @@
+# Description:  Tests for the sorted-array buckets of the SC hash map (sorted_bucket.py).
+
+
+import random
+
+import pytest
+
+from HashMap.public_hash_map_sc import HashMap
+
+
+def _one_bucket(key) -> int:
+    """Hash function sending every key to the same bucket."""
+    return 0
+
+
+@pytest.mark.parametrize("equal_key", (True, 1.0))
+def test_keys_equal_across_types_overwrite_instead_of_duplicating(equal_key):
+    hash_map = HashMap(11, _one_bucket, treeify_threshold=8)
+    for num in range(20):
+        hash_map.put(num, num)
+    hash_map.put(equal_key, 'other')
+    assert hash_map.get_size() == 20
+    assert hash_map.get(1) == 'other'
+    hash_map.put(1, 'int')                                          # The node now holds the key equal_key
+    assert hash_map.get_size() == 20
+    assert hash_map.get(equal_key) == 'int'
+    hash_map.remove(equal_key)
+    assert hash_map.get_size() == 19
+    assert hash_map.contains_key(1) is False
+
+
+def test_sorted_keys_match_earlier_overflow_keys():
+    hash_map = HashMap(11, _one_bucket, treeify_threshold=8)
+    hash_map.put(2.0, 'float')
+    for num in range(20):
+        if num != 2:
+            hash_map.put(num, num)
+    hash_map.put(2, 'int')
+    assert hash_map.get_size() == 20
+    assert hash_map.get(2.0) == 'int'
+
+
+def test_mixed_keys_match_a_dict():
+    rng = random.Random(23)
+    pool = list(range(30)) + [float(num) for num in range(0, 30, 3)] + [True, False] + ['a', 'b', b'a']
+    hash_map = HashMap(11, _one_bucket, treeify_threshold=8)
+    reference = {}
+    for step in range(3000):
+        key = rng.choice(pool)
+        if rng.random() < 0.3:
+            hash_map.remove(key)
+            reference.pop(key, None)
+        else:
+            hash_map.put(key, step)
+            reference[key] = step
+        assert hash_map.get_size() == len(reference)
+    for key in pool:
+        assert hash_map.get(key) == reference.get(key)
@@ -0,0 +1,15 @@
+# Description:  Tests for the streaming counters (stream_mode.py).
+
+
+from HashMap.a6_include import as_list
+from HashMap.stream_mode import ExactCounter
+
+
+def test_exact_counter_grows_with_distinct_elements():
+    counter = ExactCounter()
+    for num in range(40_000):
+        counter.add(num)
+    counter.add(7, 5)
+    assert counter._counts.get_capacity() >= counter._counts.get_size() == 40_000
+    assert counter.total() == 40_005
+    assert as_list(counter.top(1)) == [(7, 6, 0)]